@@ -1,4 +1,4 @@
 """Live Group Engagement Monitor — Device-Side System."""
 
 __version__ = "0.1.0"
-SCHEMA_VERSION = "1.0.0"
+SCHEMA_VERSION = "1.1.0"
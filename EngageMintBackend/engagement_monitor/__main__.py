@@ -17,6 +17,7 @@ logging.basicConfig(
 logging.getLogger("engagement_monitor.main").setLevel(logging.WARNING)
 logging.getLogger("engagement_monitor.config").setLevel(logging.WARNING)
 logging.getLogger("engagement_monitor.emitter").setLevel(logging.WARNING)
+logging.getLogger("engagement_monitor.backends").setLevel(logging.WARNING)
 
 if __name__ == "__main__":
     device_id = os.environ.get("DEVICE_ID", socket.gethostname())
@@ -0,0 +1,330 @@
+"""Benchmark interpreter settings on this device and write the best to config.
+
+Every combination of interpreter thread count, delegate and input path is
+timed against the installed model on a synthetic frame. The combination with
+the lowest p95 latency ("fastest stable") is written to config/inference.json,
+then ticks are paced at candidate intervals and the shortest interval that
+never overruns is written to ``tickIntervalSeconds`` in config/weights.json.
+
+Input paths:
+    lores  — camera delivers model-size frames, fused preprocessing
+    fused  — 640x480 frames, fused preprocessing
+    pil    — 640x480 frames, PIL resize path
+
+Usage:
+    python -m engagement_monitor.autotune
+    python -m engagement_monitor.autotune --threads 1,2,4 --iterations 50 --dry-run
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from engagement_monitor.config import (
+    DEFAULT_INFERENCE_CONFIG_PATH,
+    DEFAULT_WEIGHTS_CONFIG_PATH,
+    validate_inference,
+    validate_weights,
+)
+from engagement_monitor.detector import DELEGATE_NONE, DELEGATE_XNNPACK, Detector
+
+logger = logging.getLogger(__name__)
+
+# input path -> (fastPreprocess, cameraLores)
+INPUT_PATHS = {
+    "lores": (True, True),
+    "fused": (True, False),
+    "pil": (False, False),
+}
+FULL_FRAME_SHAPE = (480, 640)
+DEFAULT_TICK_CANDIDATES = (0.1, 0.2, 0.25, 0.5, 1.0, 2.0)
+# Latency budget per tick: inference must fit with room for scoring and emission.
+DEFAULT_HEADROOM = 1.5
+
+
+@dataclass
+class Trial:
+    """Latency of one (threads, delegate, input path) combination in milliseconds."""
+
+    num_threads: int
+    delegate: str
+    input_path: str
+    mean_ms: float
+    p95_ms: float
+    p99_ms: float
+
+    def inference_config(self) -> dict:
+        """The config/inference.json values selecting this combination."""
+        fast_preprocess, camera_lores = INPUT_PATHS[self.input_path]
+        return {
+            "numThreads": self.num_threads,
+            "delegate": self.delegate,
+            "fastPreprocess": fast_preprocess,
+            "cameraLores": camera_lores,
+        }
+
+
+def _load_detector(
+    detector_factory: Callable[..., Detector], num_threads: int, delegate: str, input_path: str
+) -> tuple[Detector, np.ndarray]:
+    """Build and load a detector for a combination; return it with a test frame."""
+    fast_preprocess, camera_lores = INPUT_PATHS[input_path]
+    detector = detector_factory(
+        fast_preprocess=fast_preprocess, num_threads=num_threads, delegate=delegate
+    )
+    detector.load(source_shape=None)
+    shape = detector.input_size if camera_lores else FULL_FRAME_SHAPE
+    detector.prepare_source(shape)
+    frame = np.random.default_rng(0).integers(0, 256, size=(*shape, 3), dtype=np.uint8)
+    return detector, frame
+
+
+def benchmark_combination(
+    detector_factory: Callable[..., Detector],
+    num_threads: int,
+    delegate: str,
+    input_path: str,
+    iterations: int = 30,
+    warmup: int = 3,
+) -> Trial | None:
+    """Time ``detect`` for one combination.
+
+    Returns:
+        The measured ``Trial``, or None if the combination cannot run here
+        (e.g. the delegate is unsupported by the installed runtime).
+    """
+    try:
+        detector, frame = _load_detector(detector_factory, num_threads, delegate, input_path)
+        for _ in range(warmup):
+            detector.detect(frame)
+        samples = np.empty(max(1, iterations), dtype=np.float64)
+        for i in range(len(samples)):
+            start = time.perf_counter()
+            detector.detect(frame)
+            samples[i] = (time.perf_counter() - start) * 1000
+    except Exception as exc:
+        logger.warning(
+            "Skipping threads=%d delegate=%s input=%s (%s)", num_threads, delegate, input_path, exc
+        )
+        return None
+    return Trial(
+        num_threads=num_threads,
+        delegate=delegate,
+        input_path=input_path,
+        mean_ms=round(float(samples.mean()), 3),
+        p95_ms=round(float(np.percentile(samples, 95)), 3),
+        p99_ms=round(float(np.percentile(samples, 99)), 3),
+    )
+
+
+def pick_best(trials: list[Trial]) -> Trial:
+    """Fastest stable trial: lowest p95, then lowest mean, then fewest threads.
+
+    Raises:
+        ValueError: If ``trials`` is empty.
+    """
+    if not trials:
+        raise ValueError("No combination could be benchmarked")
+    return min(trials, key=lambda t: (t.p95_ms, t.mean_ms, t.num_threads))
+
+
+def pace_ticks(step: Callable[[], object], interval: float, ticks: int) -> int:
+    """Run ``step`` on a fixed ``interval`` schedule and count overruns.
+
+    Returns:
+        Number of ticks whose step did not finish before the next was due.
+    """
+    overruns = 0
+    next_at = time.monotonic()
+    for _ in range(ticks):
+        step()
+        next_at += interval
+        delay = next_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            overruns += 1
+            next_at = time.monotonic()
+    return overruns
+
+
+def choose_tick_interval(
+    step: Callable[[], object],
+    p99_ms: float,
+    candidates: tuple[float, ...] = DEFAULT_TICK_CANDIDATES,
+    ticks: int = 20,
+    headroom: float = DEFAULT_HEADROOM,
+) -> float:
+    """Shortest candidate interval that ``step`` sustains without overruns.
+
+    Candidates below ``headroom`` × p99 latency are skipped without pacing.
+    Falls back to the longest candidate.
+    """
+    ordered = sorted(candidates)
+    for interval in ordered:
+        if interval * 1000 < p99_ms * headroom:
+            continue
+        overruns = pace_ticks(step, interval, ticks)
+        logger.info("Tick interval %.2fs: %d/%d overruns", interval, overruns, ticks)
+        if overruns == 0:
+            return interval
+    return ordered[-1]
+
+
+def write_inference_config(path: str | Path, trial: Trial) -> dict:
+    """Write the trial's settings (and its measurements) to inference.json.
+
+    An ``externalDelegatePath`` and cascade settings already in the file are kept.
+    """
+    path = Path(path)
+    existing: dict = {}
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            existing = json.load(f)
+    config = trial.inference_config()
+    for key in ("externalDelegatePath", "cascadeModelPath", "cascadeEscalationThreshold"):
+        if key in existing:
+            config[key] = existing[key]
+    config["benchmark"] = {"meanMs": trial.mean_ms, "p95Ms": trial.p95_ms, "p99Ms": trial.p99_ms}
+    errors = validate_inference(config)
+    if errors:
+        raise ValueError(f"Refusing to write invalid inference config: {errors}")
+    path.write_text(json.dumps(config, indent=2) + "\n", encoding="utf-8")
+    return config
+
+
+def write_tick_interval(path: str | Path, interval: float) -> dict:
+    """Set ``tickIntervalSeconds`` in weights.json, keeping every other key."""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config["tickIntervalSeconds"] = interval
+    errors = validate_weights(config)
+    if errors:
+        raise ValueError(f"Refusing to write invalid weights config: {errors}")
+    path.write_text(json.dumps(config, indent=2) + "\n", encoding="utf-8")
+    return config
+
+
+def autotune(
+    detector_factory: Callable[..., Detector] = Detector,
+    threads: list[int] | None = None,
+    delegates: list[str] | None = None,
+    input_paths: list[str] | None = None,
+    iterations: int = 30,
+    tick_candidates: tuple[float, ...] = DEFAULT_TICK_CANDIDATES,
+    ticks: int = 20,
+) -> tuple[list[Trial], Trial, float]:
+    """Benchmark every combination and choose the tick interval for the best.
+
+    Returns:
+        (all successful trials, best trial, tick interval in seconds).
+    """
+    threads = threads or list(range(1, (os.cpu_count() or 1) + 1))
+    delegates = delegates or [DELEGATE_XNNPACK, DELEGATE_NONE]
+    input_paths = input_paths or list(INPUT_PATHS)
+
+    trials = []
+    for delegate in delegates:
+        for input_path in input_paths:
+            for num_threads in threads:
+                trial = benchmark_combination(
+                    detector_factory, num_threads, delegate, input_path, iterations
+                )
+                if trial is not None:
+                    logger.info("%s", trial)
+                    trials.append(trial)
+    best = pick_best(trials)
+
+    detector, frame = _load_detector(
+        detector_factory, best.num_threads, best.delegate, best.input_path
+    )
+    interval = choose_tick_interval(
+        lambda: detector.detect(frame), best.p99_ms, tick_candidates, ticks
+    )
+    return trials, best, interval
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark interpreter threads, delegate, input path and tick interval, "
+        "and write the fastest stable configuration to config."
+    )
+    parser.add_argument(
+        "--threads",
+        type=_int_list,
+        default=None,
+        help="Comma-separated thread counts to try (default: 1..cpu_count)",
+    )
+    parser.add_argument(
+        "--delegates",
+        default=f"{DELEGATE_XNNPACK},{DELEGATE_NONE}",
+        help="Comma-separated delegates to try (default: xnnpack,none)",
+    )
+    parser.add_argument(
+        "--input-paths",
+        default=",".join(INPUT_PATHS),
+        help="Comma-separated input paths to try (default: lores,fused,pil)",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=30, help="Timed inferences per combination (default: 30)"
+    )
+    parser.add_argument(
+        "--ticks", type=int, default=20, help="Paced ticks per tick-interval candidate (default: 20)"
+    )
+    parser.add_argument("--model", default=None, help="TFLite model (default: model/model_unquant.tflite)")
+    parser.add_argument("--inference-config", default=str(DEFAULT_INFERENCE_CONFIG_PATH))
+    parser.add_argument("--weights-config", default=str(DEFAULT_WEIGHTS_CONFIG_PATH))
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print the results without writing config files"
+    )
+    args = parser.parse_args(argv)
+
+    def factory(**kwargs) -> Detector:
+        return Detector(model_path=args.model, **kwargs)
+
+    try:
+        trials, best, interval = autotune(
+            factory,
+            threads=args.threads,
+            delegates=[d.strip() for d in args.delegates.split(",") if d.strip()],
+            input_paths=[p.strip() for p in args.input_paths.split(",") if p.strip()],
+            iterations=args.iterations,
+            ticks=args.ticks,
+        )
+    except (ValueError, OSError) as exc:
+        print(f"Autotune failed: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"{'threads':>7} {'delegate':>8} {'input':>6} {'mean ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for trial in sorted(trials, key=lambda t: t.p95_ms):
+        print(
+            f"{trial.num_threads:>7} {trial.delegate:>8} {trial.input_path:>6} "
+            f"{trial.mean_ms:>8.2f} {trial.p95_ms:>8.2f} {trial.p99_ms:>8.2f}"
+        )
+    print(f"\nBest: {asdict(best)}")
+    print(f"Tick interval: {interval}s")
+
+    if args.dry_run:
+        return 0
+    write_inference_config(args.inference_config, best)
+    write_tick_interval(args.weights_config, interval)
+    print(f"Wrote {args.inference_config} and tickIntervalSeconds to {args.weights_config}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(main())
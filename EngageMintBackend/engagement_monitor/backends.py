@@ -0,0 +1,834 @@
+"""Emitter backends — where sessions, ticks and remote commands are stored.
+
+``FirestoreBackend`` is the production sink. ``MemoryBackend`` keeps every
+write in process (tests, benchmarks) and ``NdjsonBackend`` appends each write
+as one JSON line to a local file (offline dev boxes, constrained sites).
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Protocol
+
+from engagement_monitor.device_cache import DEFAULT_TTL_SECONDS, DeviceCache
+
+logger = logging.getLogger(__name__)
+
+# Firestore rejects batches with more than 500 writes.
+MAX_BATCH_WRITES = 500
+
+_DEFAULT_KEY_PATH = Path(__file__).resolve().parents[1] / "config" / "service-account-key.json"
+DEFAULT_NDJSON_PATH = Path(__file__).resolve().parents[1] / "emitter-output.ndjson"
+
+LIVE_DATA_COLLECTION = "liveData"
+LIVE_BUCKETS_COLLECTION = "liveBuckets"
+ROLLUPS_COLLECTION = "rollups"
+
+CommandsCallback = Callable[[list[tuple[str, dict]]], object]
+
+
+class EmitterBackend(Protocol):
+    """Storage operations the emitter needs from a backend."""
+
+    name: str
+
+    def create_session(
+        self, session_id: str, device_id: str, started_at: str, title: str | None = None
+    ) -> None: ...
+
+    def update_session(self, session_id: str, fields: dict) -> None: ...
+
+    def complete_session(
+        self, session_id: str, ended_at: str, summary: dict, timeline: list[dict] | None = None
+    ) -> None: ...
+
+    def emit_tick(self, session_id: str, payload: dict, time_since_start: int) -> str: ...
+
+    def emit_ticks(
+        self, ticks: list[tuple[str, dict, int]], doc_ids: list[str] | None = None
+    ) -> list[str]: ...
+
+    def emit_rollups(self, session_id: str, rollups: list[dict]) -> None: ...
+
+    def fetch_pending_command(self, device_id: str) -> tuple[str, dict] | None: ...
+
+    def fetch_pending_commands(self, device_id: str, limit: int) -> list[tuple[str, dict]]: ...
+
+    def watch_commands(self, device_id: str, on_commands: CommandsCallback): ...
+
+    def mark_command(
+        self, device_id: str, command_id: str, status: str, message: str | None = None
+    ) -> None: ...
+
+    def update_device_live(self, device_id: str, live: dict | None) -> None: ...
+
+    def warm_device(self, device_id: str) -> None: ...
+
+    def live_data_layout(self) -> dict: ...
+
+    def close(self) -> None: ...
+
+
+def tick_layout() -> dict:
+    """Layout descriptor for one liveData document per tick."""
+    return {"type": "ticks", "collection": LIVE_DATA_COLLECTION}
+
+
+def bucket_layout(bucket_seconds: int) -> dict:
+    """Layout descriptor for time-bucketed liveBuckets documents."""
+    return {
+        "type": "buckets",
+        "collection": LIVE_BUCKETS_COLLECTION,
+        "bucketSeconds": int(bucket_seconds),
+    }
+
+
+def bucket_id(time_since_start: int, bucket_seconds: int) -> str:
+    """Document ID of the bucket a tick falls into (zero-padded so IDs sort)."""
+    return f"{int(time_since_start) // int(bucket_seconds):06d}"
+
+
+def _bucket_point(payload: dict, time_since_start: int) -> dict:
+    # The tick timestamp keeps points unique under arrayUnion, which
+    # de-duplicates identical elements; it also makes retries idempotent.
+    point = _live_data(payload, time_since_start)
+    if payload.get("timestamp"):
+        point["timestamp"] = payload["timestamp"]
+    return point
+
+
+def rollup_doc_id(resolution_seconds: int) -> str:
+    """Document ID holding every window at one resolution, e.g. ``"60s"``."""
+    return f"{int(resolution_seconds)}s"
+
+
+def _default_title(session_id: str, device_id: str, started_at: str) -> str:
+    return f"Session {session_id[:8]} ({device_id}) {started_at[:19]}"
+
+
+def _live_data(payload: dict, time_since_start: int) -> dict:
+    point = {
+        "timeSinceStart": int(time_since_start),
+        "engagementScore": int(payload["engagementScore"]),
+    }
+    if payload.get("rolling"):
+        point["rolling"] = payload["rolling"]
+    return point
+
+
+class FirestoreBackend:
+    """Writes to Cloud Firestore through firebase-admin.
+
+    firebase-admin is imported lazily so the other backends work on machines
+    without it installed.
+
+    With ``bucket_seconds`` set, ticks are appended with arrayUnion into one
+    ``sessions/{id}/liveBuckets/{bucketId}`` document per time bucket instead
+    of one liveData document per tick.
+
+    Device documents (for ``ownerUserId``) are served from a ``DeviceCache``
+    so session start does not wait on a read.
+    """
+
+    name = "firestore"
+
+    def __init__(
+        self,
+        db=None,
+        bucket_seconds: int | None = None,
+        device_cache_ttl: float = DEFAULT_TTL_SECONDS,
+        device_listener: bool = True,
+    ):
+        """
+        Args:
+            db: Optional pre-built Firestore client (tests). When omitted the
+                Firebase app is initialized on first use.
+            bucket_seconds: Bucket width for chunked liveData; None or 0
+                writes one document per tick.
+            device_cache_ttl: Seconds a fetched device document is trusted.
+            device_listener: Keep warmed device documents fresh with a
+                snapshot listener.
+        """
+        self._app = None
+        self._db = db
+        self._init_lock = threading.Lock()
+        self._bucket_seconds = int(bucket_seconds) if bucket_seconds else None
+        self._device_cache = DeviceCache(
+            self._fetch_device,
+            ttl=device_cache_ttl,
+            watch=self._watch_device if device_listener else None,
+        )
+        # Devices whose cache listener is closed while they publish live state.
+        self._live_devices: set[str] = set()
+
+    @property
+    def db(self):
+        """The Firestore client, initializing Firebase if needed."""
+        if self._db is None:
+            with self._init_lock:
+                if self._db is None:
+                    self._initialize()
+        return self._db
+
+    def _initialize(self) -> None:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+
+        cred_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+        if not cred_path:
+            # Convenience default for local device runs:
+            # use EngageMintBackend/config/service-account-key.json if present.
+            if _DEFAULT_KEY_PATH.exists():
+                cred_path = str(_DEFAULT_KEY_PATH)
+                os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = cred_path
+                logger.info("Using default Firebase key at %s", cred_path)
+
+        if cred_path:
+            cred = credentials.Certificate(cred_path)
+        else:
+            # Fall back to Application Default Credentials
+            cred = credentials.ApplicationDefault()
+
+        self._app = firebase_admin.initialize_app(cred)
+        self._db = firestore.client()
+        logger.info("Firebase initialized")
+
+    @staticmethod
+    def _server_timestamp():
+        from firebase_admin import firestore
+
+        return firestore.SERVER_TIMESTAMP
+
+    def live_data_layout(self) -> dict:
+        """Describe where this backend stores tick data."""
+        if self._bucket_seconds:
+            return bucket_layout(self._bucket_seconds)
+        return tick_layout()
+
+    def _fetch_device(self, device_id: str) -> dict | None:
+        doc = self.db.collection("devices").document(device_id).get()
+        return (doc.to_dict() or {}) if doc.exists else None
+
+    def _watch_device(self, device_id: str, on_doc: Callable[[dict | None], None]):
+        def _on_snapshot(snapshots, _changes, _read_time):
+            for snapshot in snapshots:
+                on_doc((snapshot.to_dict() or {}) if snapshot.exists else None)
+
+        return self.db.collection("devices").document(device_id).on_snapshot(_on_snapshot)
+
+    def warm_device(self, device_id: str) -> None:
+        """Prefetch devices/{id} (and open its listener) in the background."""
+        self._device_cache.warm(device_id)
+
+    def create_session(
+        self, session_id: str, device_id: str, started_at: str, title: str | None = None
+    ) -> None:
+        """Create sessions/{sessionId} and point the device at it.
+
+        Firebase model (canonical):
+        sessions/{sessionId} => {title, overallScore, comments}
+
+        Both writes are committed in one WriteBatch; the owner is read from
+        the device cache.
+        """
+        db = self.db
+        now = self._server_timestamp()
+        device_doc = self._device_cache.get(device_id)
+        owner_user_id = (device_doc or {}).get("ownerUserId")
+
+        session_doc = {
+            "title": title or _default_title(session_id, device_id, started_at),
+            "overallScore": 0,
+            "comments": [],
+            "userId": owner_user_id,
+            "deviceId": device_id,
+            "startedAt": started_at,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        if self._bucket_seconds:
+            session_doc["liveDataLayout"] = self.live_data_layout()
+        batch = db.batch()
+        batch.set(db.collection("sessions").document(session_id), session_doc)
+        batch.set(
+            db.collection("devices").document(device_id),
+            {
+                "currentSessionId": session_id,
+                "currentSessionUpdatedAt": now,
+            },
+            merge=True,
+        )
+        batch.commit()
+        if owner_user_id is None:
+            logger.warning(
+                "Session created without ownerUserId mapping: sessions/%s (device=%s)",
+                session_id,
+                device_id,
+            )
+        logger.debug("Session created: sessions/%s (device=%s)", session_id, device_id)
+
+    def update_session(self, session_id: str, fields: dict) -> None:
+        """Merge ``fields`` into sessions/{sessionId}."""
+        self.db.collection("sessions").document(session_id).set(fields, merge=True)
+        logger.debug("Session document written: sessions/%s", session_id)
+
+    def complete_session(
+        self, session_id: str, ended_at: str, summary: dict, timeline: list[dict] | None = None
+    ) -> None:
+        """Set overallScore/endedAt and clear the device's current session.
+
+        A downsampled ``timeline`` is stored as ``timelinePreview`` so history
+        views can chart the session from this one document, next to the
+        summary's score ``statistics`` when present.
+        """
+        db = self.db
+        now = self._server_timestamp()
+        fields = {
+            "overallScore": float(summary.get("averageEngagement", 0)),
+            "endedAt": ended_at,
+            "updatedAt": now,
+        }
+        if timeline:
+            fields["timelinePreview"] = timeline
+        if summary.get("statistics"):
+            fields["statistics"] = summary["statistics"]
+        db.collection("sessions").document(session_id).update(fields)
+        device_id = summary.get("deviceId")
+        if device_id:
+            db.collection("devices").document(str(device_id)).set(
+                {
+                    "currentSessionId": None,
+                    "currentSessionUpdatedAt": now,
+                },
+                merge=True,
+            )
+        logger.debug("Session completed: sessions/%s", session_id)
+
+    def emit_tick(self, session_id: str, payload: dict, time_since_start: int) -> str:
+        """Add one sessions/{id}/liveData document and return its ID."""
+        if self._bucket_seconds:
+            return self.emit_ticks([(session_id, payload, time_since_start)])[0]
+        live_data = self.db.collection("sessions").document(session_id).collection("liveData")
+        _, doc_ref = live_data.add(_live_data(payload, time_since_start))
+        return doc_ref.id
+
+    def emit_ticks(
+        self, ticks: list[tuple[str, dict, int]], doc_ids: list[str] | None = None
+    ) -> list[str]:
+        """Write liveData documents with WriteBatch commits of up to 500 writes.
+
+        In bucket mode returns the bucket document ID for each tick and
+        ignores ``doc_ids`` (arrayUnion is already idempotent).
+        """
+        if self._bucket_seconds:
+            return self._emit_bucketed(ticks)
+        db = self.db
+        written_ids: list[str] = []
+        for start in range(0, len(ticks), MAX_BATCH_WRITES):
+            batch = db.batch()
+            for offset, (session_id, payload, time_since_start) in enumerate(
+                ticks[start:start + MAX_BATCH_WRITES]
+            ):
+                live_data = db.collection("sessions").document(session_id).collection("liveData")
+                doc_ref = live_data.document(doc_ids[start + offset]) if doc_ids else live_data.document()
+                batch.set(doc_ref, _live_data(payload, time_since_start))
+                written_ids.append(doc_ref.id)
+            batch.commit()
+        logger.debug("Committed %d tick(s) in batched writes", len(written_ids))
+        return written_ids
+
+    def _emit_bucketed(self, ticks: list[tuple[str, dict, int]]) -> list[str]:
+        from firebase_admin import firestore
+
+        db = self.db
+        bucket_ids: list[str] = []
+        points: dict[tuple[str, str], list[dict]] = {}
+        for session_id, payload, time_since_start in ticks:
+            bid = bucket_id(time_since_start, self._bucket_seconds)
+            bucket_ids.append(bid)
+            points.setdefault((session_id, bid), []).append(_bucket_point(payload, time_since_start))
+
+        # One write per touched bucket, however many ticks it received.
+        groups = list(points.items())
+        for start in range(0, len(groups), MAX_BATCH_WRITES):
+            batch = db.batch()
+            for (session_id, bid), bucket_points in groups[start:start + MAX_BATCH_WRITES]:
+                doc_ref = (
+                    db.collection("sessions")
+                    .document(session_id)
+                    .collection(LIVE_BUCKETS_COLLECTION)
+                    .document(bid)
+                )
+                batch.set(
+                    doc_ref,
+                    {
+                        "bucketStart": int(bid) * self._bucket_seconds,
+                        "bucketSeconds": self._bucket_seconds,
+                        "points": firestore.ArrayUnion(bucket_points),
+                    },
+                    merge=True,
+                )
+            batch.commit()
+        logger.debug("Appended %d tick(s) to %d bucket(s)", len(ticks), len(groups))
+        return bucket_ids
+
+    def emit_rollups(self, session_id: str, rollups: list[dict]) -> None:
+        """Append closed windows to sessions/{id}/rollups/{resolution}s.
+
+        Each resolution is a single document whose ``windows`` array grows by
+        arrayUnion, so a chart at that resolution is one document read.
+        """
+        if not rollups:
+            return
+        from firebase_admin import firestore
+
+        by_resolution: dict[int, list[dict]] = {}
+        for window in rollups:
+            by_resolution.setdefault(int(window["resolutionSeconds"]), []).append(window)
+
+        db = self.db
+        batch = db.batch()
+        for resolution, windows in by_resolution.items():
+            doc_ref = (
+                db.collection("sessions")
+                .document(session_id)
+                .collection(ROLLUPS_COLLECTION)
+                .document(rollup_doc_id(resolution))
+            )
+            batch.set(
+                doc_ref,
+                {"resolutionSeconds": resolution, "windows": firestore.ArrayUnion(windows)},
+                merge=True,
+            )
+        batch.commit()
+        logger.debug("Rollups written: sessions/%s (%d window(s))", session_id, len(rollups))
+
+    def _pending_commands(self, device_id: str):
+        return (
+            self.db.collection("devices")
+            .document(device_id)
+            .collection("commands")
+            .where("status", "==", "pending")
+        )
+
+    def fetch_pending_command(self, device_id: str) -> tuple[str, dict] | None:
+        """Return one pending devices/{id}/commands document, if any."""
+        pending = self.fetch_pending_commands(device_id, 1)
+        return pending[0] if pending else None
+
+    def fetch_pending_commands(self, device_id: str, limit: int) -> list[tuple[str, dict]]:
+        """Return up to ``limit`` pending devices/{id}/commands documents."""
+        docs = self._pending_commands(device_id).limit(int(limit)).stream()
+        return [(doc.id, doc.to_dict() or {}) for doc in docs]
+
+    def watch_commands(self, device_id: str, on_commands: CommandsCallback):
+        """Open a snapshot listener; returns the Firestore Watch handle."""
+
+        def _on_snapshot(docs, _changes, _read_time):
+            on_commands([(doc.id, doc.to_dict() or {}) for doc in docs])
+
+        return self._pending_commands(device_id).on_snapshot(_on_snapshot)
+
+    def mark_command(
+        self, device_id: str, command_id: str, status: str, message: str | None = None
+    ) -> None:
+        """Record the processing outcome on the command document."""
+        update_data = {
+            "status": status,
+            "processedAt": self._server_timestamp(),
+        }
+        if message:
+            update_data["message"] = message
+
+        (
+            self.db.collection("devices")
+            .document(device_id)
+            .collection("commands")
+            .document(command_id)
+            .set(update_data, merge=True)
+        )
+
+    def update_device_live(self, device_id: str, live: dict | None) -> None:
+        """Merge the latest live state into devices/{id}.live (``None`` clears it).
+
+        The device-cache listener would get a snapshot (a billed read) for
+        every one of these writes, so it is closed on the first live write
+        and re-opened once live state is cleared; in between the cached
+        owner is trusted for the cache TTL.
+        """
+        device_id = str(device_id)
+        if live is not None and device_id not in self._live_devices:
+            if self._device_cache.unwatch(device_id):
+                self._live_devices.add(device_id)
+        self.db.collection("devices").document(device_id).set(
+            {"live": live, "liveUpdatedAt": self._server_timestamp()},
+            merge=True,
+        )
+        if live is None and device_id in self._live_devices:
+            self._live_devices.discard(device_id)
+            self._device_cache.warm(device_id)
+
+    def close(self) -> None:
+        """Close device listeners and delete the Firebase app, if this backend created one."""
+        self._device_cache.close()
+        if self._app is not None:
+            import firebase_admin
+
+            firebase_admin.delete_app(self._app)
+            self._app = None
+            self._db = None
+            logger.info("Firebase connection closed")
+
+
+class _LocalWatch:
+    """Listener handle returned by MemoryBackend.watch_commands."""
+
+    def __init__(self, on_unsubscribe: Callable[[], None]):
+        self._on_unsubscribe = on_unsubscribe
+        self.is_active = True
+
+    def unsubscribe(self) -> None:
+        if self.is_active:
+            self.is_active = False
+            self._on_unsubscribe()
+
+
+class MemoryBackend:
+    """Keeps sessions, liveData, devices and commands in dictionaries.
+
+    Mirrors the Firestore document layout closely enough for tests and
+    network-free benchmarks; ``add_command`` plays the dashboard's role.
+    """
+
+    name = "memory"
+
+    def __init__(self, bucket_seconds: int | None = None):
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._bucket_seconds = int(bucket_seconds) if bucket_seconds else None
+        self.sessions: dict[str, dict] = {}
+        self.live_data: dict[str, dict[str, dict]] = {}
+        self.live_buckets: dict[str, dict[str, dict]] = {}
+        self.rollups: dict[str, dict[str, list[dict]]] = {}
+        self.devices: dict[str, dict] = {}
+        self.commands: dict[str, OrderedDict[str, dict]] = {}
+        self._watchers: dict[str, list[CommandsCallback]] = {}
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return f"mem-{self._next_id:08d}"
+
+    def live_data_layout(self) -> dict:
+        if self._bucket_seconds:
+            return bucket_layout(self._bucket_seconds)
+        return tick_layout()
+
+    def create_session(
+        self, session_id: str, device_id: str, started_at: str, title: str | None = None
+    ) -> None:
+        with self._lock:
+            device = self.devices.setdefault(device_id, {})
+            self.sessions[session_id] = {
+                "title": title or _default_title(session_id, device_id, started_at),
+                "overallScore": 0,
+                "comments": [],
+                "userId": device.get("ownerUserId"),
+                "deviceId": device_id,
+                "startedAt": started_at,
+            }
+            if self._bucket_seconds:
+                self.sessions[session_id]["liveDataLayout"] = self.live_data_layout()
+            self.live_data.setdefault(session_id, {})
+            device["currentSessionId"] = session_id
+
+    def update_session(self, session_id: str, fields: dict) -> None:
+        with self._lock:
+            self.sessions.setdefault(session_id, {}).update(fields)
+
+    def complete_session(
+        self, session_id: str, ended_at: str, summary: dict, timeline: list[dict] | None = None
+    ) -> None:
+        with self._lock:
+            session = self.sessions.setdefault(session_id, {})
+            session.update({
+                "overallScore": float(summary.get("averageEngagement", 0)),
+                "endedAt": ended_at,
+            })
+            if timeline:
+                session["timelinePreview"] = [dict(point) for point in timeline]
+            if summary.get("statistics"):
+                session["statistics"] = summary["statistics"]
+            device_id = summary.get("deviceId")
+            if device_id:
+                self.devices.setdefault(str(device_id), {})["currentSessionId"] = None
+
+    def emit_tick(self, session_id: str, payload: dict, time_since_start: int) -> str:
+        return self.emit_ticks([(session_id, payload, time_since_start)])[0]
+
+    def emit_ticks(
+        self, ticks: list[tuple[str, dict, int]], doc_ids: list[str] | None = None
+    ) -> list[str]:
+        written_ids: list[str] = []
+        with self._lock:
+            for i, (session_id, payload, time_since_start) in enumerate(ticks):
+                if self._bucket_seconds:
+                    bid = bucket_id(time_since_start, self._bucket_seconds)
+                    bucket = self.live_buckets.setdefault(session_id, {}).setdefault(bid, {
+                        "bucketStart": int(bid) * self._bucket_seconds,
+                        "bucketSeconds": self._bucket_seconds,
+                        "points": [],
+                    })
+                    point = _bucket_point(payload, time_since_start)
+                    if point not in bucket["points"]:
+                        bucket["points"].append(point)
+                    written_ids.append(bid)
+                    continue
+                doc_id = doc_ids[i] if doc_ids else self._new_id()
+                # Re-writing an existing ID overwrites, like a Firestore set().
+                self.live_data.setdefault(session_id, {})[doc_id] = _live_data(payload, time_since_start)
+                written_ids.append(doc_id)
+        return written_ids
+
+    def emit_rollups(self, session_id: str, rollups: list[dict]) -> None:
+        with self._lock:
+            docs = self.rollups.setdefault(session_id, {})
+            for window in rollups:
+                windows = docs.setdefault(rollup_doc_id(window["resolutionSeconds"]), [])
+                if window not in windows:
+                    windows.append(dict(window))
+
+    def add_command(self, device_id: str, command: dict) -> str:
+        """Queue a pending command for ``device_id`` and notify listeners."""
+        with self._lock:
+            command_id = self._new_id()
+            self.commands.setdefault(device_id, OrderedDict())[command_id] = {
+                "status": "pending",
+                **command,
+            }
+        self._notify(device_id)
+        return command_id
+
+    def _pending(self, device_id: str) -> list[tuple[str, dict]]:
+        with self._lock:
+            return [
+                (cid, dict(doc))
+                for cid, doc in self.commands.get(device_id, {}).items()
+                if doc.get("status") == "pending"
+            ]
+
+    def _notify(self, device_id: str) -> None:
+        pending = self._pending(device_id)
+        for callback in list(self._watchers.get(device_id, [])):
+            callback(pending)
+
+    def fetch_pending_command(self, device_id: str) -> tuple[str, dict] | None:
+        pending = self._pending(device_id)
+        return pending[0] if pending else None
+
+    def fetch_pending_commands(self, device_id: str, limit: int) -> list[tuple[str, dict]]:
+        return self._pending(device_id)[: int(limit)]
+
+    def watch_commands(self, device_id: str, on_commands: CommandsCallback):
+        watchers = self._watchers.setdefault(device_id, [])
+        watchers.append(on_commands)
+        on_commands(self._pending(device_id))
+        return _LocalWatch(lambda: watchers.remove(on_commands))
+
+    def mark_command(
+        self, device_id: str, command_id: str, status: str, message: str | None = None
+    ) -> None:
+        with self._lock:
+            doc = self.commands.setdefault(device_id, OrderedDict()).setdefault(command_id, {})
+            doc["status"] = status
+            if message:
+                doc["message"] = message
+        self._notify(device_id)
+
+    def update_device_live(self, device_id: str, live: dict | None) -> None:
+        with self._lock:
+            self.devices.setdefault(str(device_id), {})["live"] = dict(live) if live else None
+
+    def warm_device(self, device_id: str) -> None:
+        pass
+
+    def close(self) -> None:
+        self._watchers.clear()
+
+
+class NdjsonBackend:
+    """Appends every write as one JSON object per line to a local file.
+
+    Each line carries an ``op`` field (``create_session``, ``update_session``,
+    ``complete_session``, ``tick``, ``rollup``, ``mark_command``,
+    ``device_live``) plus the written fields, so the file can be replayed or
+    loaded into a dataframe later. Remote
+    commands are read from an optional NDJSON file of command objects (each
+    with an ``id``); there is no push listener, so the command subscriber
+    falls back to polling.
+    """
+
+    name = "ndjson"
+
+    def __init__(self, path: str | Path = DEFAULT_NDJSON_PATH, commands_path: str | Path | None = None):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._commands_path = Path(commands_path) if commands_path else None
+        self._lock = threading.Lock()
+        self._file = open(self._path, "a", encoding="utf-8")
+        self._next_id = 0
+        self._command_status: dict[str, str] = {}
+
+    @property
+    def path(self) -> Path:
+        """File the backend appends to."""
+        return self._path
+
+    def live_data_layout(self) -> dict:
+        return tick_layout()
+
+    def _write(self, records: list[dict]) -> None:
+        at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            for record in records:
+                self._file.write(json.dumps({"at": at, **record}, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def create_session(
+        self, session_id: str, device_id: str, started_at: str, title: str | None = None
+    ) -> None:
+        self._write([{
+            "op": "create_session",
+            "sessionId": session_id,
+            "deviceId": device_id,
+            "startedAt": started_at,
+            "title": title or _default_title(session_id, device_id, started_at),
+        }])
+
+    def update_session(self, session_id: str, fields: dict) -> None:
+        self._write([{"op": "update_session", "sessionId": session_id, "fields": fields}])
+
+    def complete_session(
+        self, session_id: str, ended_at: str, summary: dict, timeline: list[dict] | None = None
+    ) -> None:
+        record = {
+            "op": "complete_session",
+            "sessionId": session_id,
+            "endedAt": ended_at,
+            "summary": summary,
+        }
+        if timeline:
+            record["timelinePreview"] = timeline
+        self._write([record])
+
+    def emit_tick(self, session_id: str, payload: dict, time_since_start: int) -> str:
+        return self.emit_ticks([(session_id, payload, time_since_start)])[0]
+
+    def emit_ticks(
+        self, ticks: list[tuple[str, dict, int]], doc_ids: list[str] | None = None
+    ) -> list[str]:
+        records = []
+        written_ids = []
+        with self._lock:
+            for i, (session_id, payload, time_since_start) in enumerate(ticks):
+                if doc_ids:
+                    doc_id = doc_ids[i]
+                else:
+                    self._next_id += 1
+                    doc_id = f"ndjson-{self._next_id:08d}"
+                written_ids.append(doc_id)
+                records.append({
+                    "op": "tick",
+                    "sessionId": session_id,
+                    "docId": doc_id,
+                    **_live_data(payload, time_since_start),
+                })
+        self._write(records)
+        return written_ids
+
+    def emit_rollups(self, session_id: str, rollups: list[dict]) -> None:
+        self._write([{"op": "rollup", "sessionId": session_id, **window} for window in rollups])
+
+    def fetch_pending_command(self, device_id: str) -> tuple[str, dict] | None:
+        pending = self.fetch_pending_commands(device_id, 1)
+        return pending[0] if pending else None
+
+    def fetch_pending_commands(self, device_id: str, limit: int) -> list[tuple[str, dict]]:
+        pending: list[tuple[str, dict]] = []
+        if self._commands_path is None or not self._commands_path.exists():
+            return pending
+        with open(self._commands_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    command = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                command_id = str(command.get("id", ""))
+                if not command_id or self._command_status.get(command_id):
+                    continue
+                if command.get("deviceId", device_id) == device_id:
+                    pending.append((command_id, command))
+                    if len(pending) >= limit:
+                        break
+        return pending
+
+    def watch_commands(self, device_id: str, on_commands: CommandsCallback):
+        raise NotImplementedError("NDJSON backend has no command listener; poll instead")
+
+    def mark_command(
+        self, device_id: str, command_id: str, status: str, message: str | None = None
+    ) -> None:
+        self._command_status[command_id] = status
+        record = {"op": "mark_command", "deviceId": device_id, "commandId": command_id, "status": status}
+        if message:
+            record["message"] = message
+        self._write([record])
+
+    def update_device_live(self, device_id: str, live: dict | None) -> None:
+        self._write([{"op": "device_live", "deviceId": device_id, "live": live}])
+
+    def warm_device(self, device_id: str) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def create_backend(name: str | None = None) -> EmitterBackend:
+    """Build the backend selected by ``name`` or the EMITTER_BACKEND env var.
+
+    Args:
+        name: ``firestore`` (default), ``memory`` or ``ndjson``. The NDJSON
+            backend writes to EMITTER_NDJSON_PATH and reads commands from
+            EMITTER_COMMANDS_PATH when set. LIVE_DATA_BUCKET_SECONDS > 0
+            switches Firestore and memory backends to bucketed liveData.
+            DEVICE_CACHE_TTL_SECONDS and DEVICE_CACHE_LISTEN=0 tune the
+            Firestore device cache.
+
+    Raises:
+        ValueError: If the name is not a known backend.
+    """
+    name = (name or os.environ.get("EMITTER_BACKEND") or "firestore").strip().lower()
+    bucket_seconds = int(os.environ.get("LIVE_DATA_BUCKET_SECONDS", "0") or 0)
+    if name == "firestore":
+        return FirestoreBackend(
+            bucket_seconds=bucket_seconds,
+            device_cache_ttl=float(os.environ.get("DEVICE_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS))),
+            device_listener=os.environ.get("DEVICE_CACHE_LISTEN", "1") == "1",
+        )
+    if name == "memory":
+        return MemoryBackend(bucket_seconds=bucket_seconds)
+    if name == "ndjson":
+        return NdjsonBackend(
+            os.environ.get("EMITTER_NDJSON_PATH") or DEFAULT_NDJSON_PATH,
+            commands_path=os.environ.get("EMITTER_COMMANDS_PATH") or None,
+        )
+    raise ValueError(f"Unknown emitter backend: {name!r} (expected firestore, memory or ndjson)")
@@ -3,12 +3,29 @@
 import importlib
 import logging
 import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_RING_SIZE = 3
+
+# How long capture_frame waits for the first continuous frame.
+_FIRST_FRAME_TIMEOUT = 5.0
+
+
+@dataclass
+class CapturedFrame:
+    """A frame with the time it was captured and its capture sequence number."""
+
+    array: np.ndarray
+    timestamp: datetime
+    sequence: int
+
 
 def _import_picamera2():
     """Import Picamera2, with a fallback for apt-installed system packages.
@@ -41,12 +58,54 @@ class Camera:
     """Wraps picamera2 to provide simple frame capture.
 
     Configured for 640x480 RGB888 preview for low-latency continuous capture.
+
+    With ``continuous=True`` a background thread copies every sensor frame
+    into a small preallocated ring buffer, and ``capture_frame`` /
+    ``capture_latest`` return the freshest frame immediately instead of
+    waiting for the next one.
+
+    With ``lores_size`` set, picamera2's ``lores`` stream is configured at
+    that size and the ISP does the resize; ``capture_frame`` then returns
+    lores frames while ``capture_full_frame`` still reads the main stream.
     """
 
-    def __init__(self, width: int = 640, height: int = 480):
+    def __init__(
+        self,
+        width: int = 640,
+        height: int = 480,
+        continuous: bool = False,
+        ring_size: int = DEFAULT_RING_SIZE,
+        lores_size: tuple[int, int] | None = None,
+        camera_num: int = 0,
+    ):
+        """
+        Args:
+            width: Main stream width.
+            height: Main stream height.
+            continuous: Capture in the background into a ring buffer.
+            ring_size: Frames kept in the ring buffer (at least 3).
+            lores_size: Optional (width, height) of an RGB888 lores stream
+                used for ``capture_frame``, typically the model input size.
+            camera_num: Index of the sensor to open when several are attached.
+        """
+        self._camera_num = int(camera_num)
         self._width = width
         self._height = height
         self._picam2 = None
+        self._continuous = continuous
+        self._lores_size = tuple(int(v) for v in lores_size) if lores_size else None
+        self._stream = "main"
+        # Two slots would let the writer reach the slot being read right away.
+        self._ring_size = max(3, int(ring_size))
+        self._ring: np.ndarray | None = None
+        self._lock = threading.Lock()
+        self._first_frame = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._latest_slot = -1
+        self._latest_timestamp: datetime | None = None
+        self._sequence = 0
+        self._error: BaseException | None = None
 
     def start(self) -> None:
         """Initialize and start the camera."""
@@ -61,17 +120,40 @@ class Camera:
                 "or set PYTHONPATH=/usr/lib/python3/dist-packages."
             ) from exc
 
-        self._picam2 = Picamera2()
-        config = self._picam2.create_preview_configuration(
-            main={"size": (self._width, self._height), "format": "RGB888"}
-        )
-        self._picam2.configure(config)
+        self._picam2 = Picamera2(camera_num=self._camera_num)
+        main_stream = {"size": (self._width, self._height), "format": "RGB888"}
+        self._stream = "main"
+        if self._lores_size is not None:
+            try:
+                self._picam2.configure(self._picam2.create_preview_configuration(
+                    main=main_stream,
+                    lores={"size": self._lores_size, "format": "RGB888"},
+                ))
+                self._stream = "lores"
+            except Exception as exc:
+                # Older ISPs only offer a YUV420 lores stream; resize in software.
+                logger.warning("RGB lores stream unavailable (%s) — using the main stream", exc)
+        if self._stream == "main":
+            self._picam2.configure(self._picam2.create_preview_configuration(main=main_stream))
         self._picam2.start()
-        logger.info("Camera started at %dx%d RGB888", self._width, self._height)
+        if self._stream == "lores":
+            logger.info(
+                "Camera started at %dx%d RGB888 with %dx%d lores stream",
+                self._width,
+                self._height,
+                *self._lores_size,
+            )
+        else:
+            logger.info("Camera started at %dx%d RGB888", self._width, self._height)
+        if self._continuous:
+            self._start_background_capture()
 
     def capture_frame(self) -> np.ndarray:
         """Capture a single frame as a numpy RGB array.
 
+        In continuous mode this returns a copy of the freshest buffered frame
+        without waiting on the sensor.
+
         Returns:
             numpy array of shape (height, width, 3) with dtype uint8, RGB order.
 
@@ -80,11 +162,105 @@ class Camera:
         """
         if self._picam2 is None:
             raise RuntimeError("Camera not started. Call start() first.")
-        frame = self._picam2.capture_array("main")
+        if self._continuous:
+            return self.capture_latest().array
+        frame = self._picam2.capture_array(self._stream)
         return frame
 
+    @property
+    def frame_shape(self) -> tuple[int, int]:
+        """(height, width) of frames returned by ``capture_frame``."""
+        if self._stream == "lores":
+            return self._lores_size[1], self._lores_size[0]
+        return self._height, self._width
+
+    def capture_full_frame(self) -> np.ndarray:
+        """Capture a full-resolution frame from the main stream (e.g. for training data).
+
+        Raises:
+            RuntimeError: If camera has not been started.
+        """
+        if self._picam2 is None:
+            raise RuntimeError("Camera not started. Call start() first.")
+        return self._picam2.capture_array("main")
+
+    def capture_latest(self, out: np.ndarray | None = None) -> CapturedFrame:
+        """Return the freshest frame with its capture timestamp and sequence number.
+
+        Outside continuous mode this captures a new frame on demand.
+
+        Args:
+            out: Optional (height, width, 3) uint8 array to copy the frame
+                into, avoiding an allocation.
+
+        Raises:
+            RuntimeError: If the camera is not started or background capture failed.
+        """
+        if self._picam2 is None:
+            raise RuntimeError("Camera not started. Call start() first.")
+        if not self._continuous:
+            timestamp = datetime.now(timezone.utc)
+            frame = self._picam2.capture_array(self._stream)
+            if out is not None:
+                np.copyto(out, frame)
+                frame = out
+            self._sequence += 1
+            return CapturedFrame(frame, timestamp, self._sequence)
+
+        if not self._first_frame.wait(timeout=_FIRST_FRAME_TIMEOUT) and self._error is None:
+            raise RuntimeError("No frame received from camera")
+        while True:
+            if self._error is not None:
+                raise RuntimeError("Background capture failed") from self._error
+            with self._lock:
+                slot = self._latest_slot
+                sequence = self._sequence
+                timestamp = self._latest_timestamp
+            if out is None:
+                frame = self._ring[slot].copy()
+            else:
+                np.copyto(out, self._ring[slot])
+                frame = out
+            # The writer fills the slot after the latest; ours is only reused
+            # once ring_size - 1 newer frames have been published.
+            with self._lock:
+                if self._sequence - sequence < self._ring_size - 1:
+                    return CapturedFrame(frame, timestamp, sequence)
+
+    def _start_background_capture(self) -> None:
+        self._ring = np.empty((self._ring_size, *self.frame_shape, 3), dtype=np.uint8)
+        self._stop.clear()
+        self._first_frame.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._capture_loop, name="camera-capture", daemon=True)
+        self._thread.start()
+        logger.info("Continuous capture started (%d-frame ring buffer)", self._ring_size)
+
+    def _capture_loop(self) -> None:
+        slot = 0
+        try:
+            while not self._stop.is_set():
+                frame = self._picam2.capture_array(self._stream)
+                timestamp = datetime.now(timezone.utc)
+                np.copyto(self._ring[slot], frame)
+                with self._lock:
+                    self._latest_slot = slot
+                    self._latest_timestamp = timestamp
+                    self._sequence += 1
+                self._first_frame.set()
+                slot = (slot + 1) % self._ring_size
+        except Exception as exc:
+            if not self._stop.is_set():
+                logger.exception("Continuous capture stopped")
+                self._error = exc
+                self._first_frame.set()
+
     def stop(self) -> None:
         """Stop the camera and release resources."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=2)
+            self._thread = None
         if self._picam2 is not None:
             self._picam2.stop()
             self._picam2.close()
@@ -0,0 +1,138 @@
+"""Two-stage model cascade — a cheap model on every frame, the full model on demand.
+
+``CascadeDetector`` runs a small (e.g. quantized) model first. The full
+float model runs only when the cheap model is unsure (top-1 confidence below
+the escalation threshold) or its top-1 label differs from its own top-1 on
+the previous frame. Comparing against the cheap model's previous answer (not
+the label the cascade emitted) means a steady disagreement between the two
+models escalates once, not on every frame. Both models must share one label
+order.
+
+It exposes the same ``detect`` interface as ``Detector``, so the tick loop
+and pipeline use it unchanged.
+"""
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from engagement_monitor.detector import Detector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ESCALATION_THRESHOLD = 0.8
+
+
+class CascadeDetector:
+    """Cheap-then-full two-stage detector with escalation counters."""
+
+    def __init__(
+        self,
+        cheap: Detector,
+        full: Detector,
+        escalation_threshold: float = DEFAULT_ESCALATION_THRESHOLD,
+    ):
+        """
+        Args:
+            cheap: Loaded detector run on every frame.
+            full: Loaded detector run when the cheap result is not trusted.
+            escalation_threshold: Cheap top-1 confidence below which the full
+                model runs.
+
+        Raises:
+            ValueError: If the two models' labels differ.
+        """
+        if cheap.labels != full.labels:
+            raise ValueError(
+                f"Cascade models disagree on labels: {cheap.labels} vs {full.labels}"
+            )
+        self._cheap = cheap
+        self._full = full
+        self._escalation_threshold = float(escalation_threshold)
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def labels(self) -> list[str]:
+        """Shared label order of both models."""
+        return self._full.labels
+
+    @property
+    def input_size(self) -> tuple[int, int]:
+        """Full model input (height, width), used to size the camera lores stream."""
+        return self._full.input_size
+
+    def prepare_source(self, source_shape: tuple[int, int]) -> None:
+        """Precompute preprocessing for camera frames of (height, width) in both stages."""
+        self._cheap.prepare_source(source_shape)
+        self._full.prepare_source(source_shape)
+
+    def reset(self) -> None:
+        """Forget the previous cheap label and zero the counters (e.g. at session start)."""
+        with self._lock:
+            self._previous_cheap_label: str | None = None
+            self.frames = 0
+            self.escalations = 0
+            self._cheap_seconds = 0.0
+            self._full_seconds = 0.0
+
+    def predict(self, frame: np.ndarray) -> np.ndarray:
+        """Probability vector from the cheap model, or the full model when escalated."""
+        start = time.perf_counter()
+        probabilities = self._cheap.predict(frame)
+        cheap_seconds = time.perf_counter() - start
+
+        top = int(np.argmax(probabilities))
+        confidence = float(probabilities[top])
+        cheap_label = self.labels[top] if top < len(self.labels) else None
+        with self._lock:
+            previous_cheap_label, self._previous_cheap_label = self._previous_cheap_label, cheap_label
+        escalate = confidence < self._escalation_threshold or cheap_label != previous_cheap_label
+
+        full_seconds = 0.0
+        if escalate:
+            start = time.perf_counter()
+            probabilities = self._full.predict(frame)
+            full_seconds = time.perf_counter() - start
+
+        with self._lock:
+            self.frames += 1
+            self._cheap_seconds += cheap_seconds
+            if escalate:
+                self.escalations += 1
+                self._full_seconds += full_seconds
+        logger.debug(
+            "cascade cheap=%.1fms conf=%.2f escalated=%s full=%.1fms",
+            cheap_seconds * 1000,
+            confidence,
+            escalate,
+            full_seconds * 1000,
+        )
+        return probabilities
+
+    def detect(
+        self, frame: np.ndarray, confidence_threshold: float = 0.6
+    ) -> list[tuple[str, float]]:
+        """Run the cascade on a frame and return detected behaviors.
+
+        Returns:
+            List of (behavior_label, confidence) tuples above the threshold.
+        """
+        return self._full.detections(self.predict(frame), confidence_threshold)
+
+    def stats(self) -> dict:
+        """Escalation rate and mean per-stage latency since the last ``reset``."""
+        with self._lock:
+            return {
+                "frames": self.frames,
+                "escalations": self.escalations,
+                "escalationRate": round(self.escalations / self.frames, 3) if self.frames else 0.0,
+                "cheapMeanMs": round(self._cheap_seconds * 1000 / self.frames, 2)
+                if self.frames
+                else 0.0,
+                "fullMeanMs": round(self._full_seconds * 1000 / self.escalations, 2)
+                if self.escalations
+                else 0.0,
+            }
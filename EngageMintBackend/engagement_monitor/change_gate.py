@@ -0,0 +1,128 @@
+"""Frame-change gate — skip inference when the scene has not changed.
+
+``FrameChangeGate`` samples a small luma thumbnail (32x24 by default) from
+each frame and compares it with the thumbnail of the last frame that was
+actually inferred. When the mean absolute luma difference is below the
+threshold the previous result can be reused, up to ``max_stale_seconds``
+after the last inference. Comparing against the last *inferred* frame (not
+the previous tick) means slow drift still accumulates into a re-inference.
+
+Sampling uses a precomputed flat index map and preallocated buffers, so a
+check costs one small gather and a few vector ops.
+"""
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from engagement_monitor.preprocess import _nearest_indices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 4.0
+DEFAULT_MAX_STALE_SECONDS = 5.0
+DEFAULT_THUMBNAIL_SIZE = (24, 32)
+
+# ITU-R BT.601 luma weights for R, G, B.
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+class FrameChangeGate:
+    """Decides per frame whether inference must run or the last result still holds."""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_stale_seconds: float = DEFAULT_MAX_STALE_SECONDS,
+        thumbnail_size: tuple[int, int] = DEFAULT_THUMBNAIL_SIZE,
+    ):
+        """
+        Args:
+            threshold: Mean absolute luma difference (0–255) at or above
+                which the scene counts as changed.
+            max_stale_seconds: Longest time a result is reused; ``0`` always
+                infers.
+            thumbnail_size: Sampled (height, width) used for the comparison.
+        """
+        self._threshold = float(threshold)
+        self._max_stale = float(max_stale_seconds)
+        self._thumb_h, self._thumb_w = (int(v) for v in thumbnail_size)
+        self._source_shape: tuple[int, int] | None = None
+        self._index_map: np.ndarray | None = None
+        self._sampled = np.empty((self._thumb_h * self._thumb_w, 3), dtype=np.uint8)
+        self._luma = np.empty(self._thumb_h * self._thumb_w, dtype=np.float32)
+        self._reference = np.empty_like(self._luma)
+        self._difference = np.empty_like(self._luma)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the reference frame and zero the counters (e.g. at session start)."""
+        with self._lock:
+            self._has_reference = False
+            self._inferred_at = 0.0
+            self.hits = 0
+            self.misses = 0
+            self.stale = 0
+            self.last_difference = 0.0
+
+    def _prepare(self, source_shape: tuple[int, int]) -> None:
+        src_h, src_w = (int(v) for v in source_shape[:2])
+        rows = _nearest_indices(src_h, self._thumb_h)
+        cols = _nearest_indices(src_w, self._thumb_w)
+        pixels = (rows[:, None] * src_w + cols[None, :]).reshape(-1)
+        self._index_map = (pixels[:, None] * 3 + np.arange(3)).astype(np.intp)
+        self._source_shape = (src_h, src_w)
+        self._has_reference = False
+
+    def should_infer(self, frame: np.ndarray, now: float | None = None) -> bool:
+        """Whether ``frame`` needs a fresh inference.
+
+        Returns False (a hit) only when a reference exists, the scene is
+        unchanged and the last inference is younger than ``max_stale_seconds``.
+        Returning True makes ``frame`` the new reference.
+
+        Args:
+            frame: (H, W, 3) uint8 RGB frame.
+            now: Monotonic timestamp; defaults to ``time.monotonic()``.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._source_shape != frame.shape[:2]:
+                self._prepare(frame.shape)
+            if not frame.flags.c_contiguous:
+                frame = np.ascontiguousarray(frame)
+            np.take(frame.reshape(-1), self._index_map, out=self._sampled)
+            np.dot(self._sampled, _LUMA, out=self._luma)
+
+            if self._has_reference:
+                np.subtract(self._luma, self._reference, out=self._difference)
+                np.abs(self._difference, out=self._difference)
+                self.last_difference = float(self._difference.mean())
+                if self.last_difference < self._threshold:
+                    if now - self._inferred_at < self._max_stale:
+                        self.hits += 1
+                        return False
+                    self.stale += 1
+                else:
+                    self.misses += 1
+            else:
+                self.misses += 1
+
+            self._reference[...] = self._luma
+            self._has_reference = True
+            self._inferred_at = now
+            return True
+
+    def stats(self) -> dict:
+        """Hit/miss counters and the share of frames whose inference was skipped."""
+        with self._lock:
+            total = self.hits + self.misses + self.stale
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "hitRate": round(self.hits / total, 3) if total else 0.0,
+            }
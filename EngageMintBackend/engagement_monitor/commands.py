@@ -0,0 +1,163 @@
+"""Remote command subscription for devices/{deviceId}/commands.
+
+Pending commands are pushed by a Firestore snapshot listener as soon as they
+are written. If a listener cannot be opened (or keeps dying), the subscriber
+falls back to polling with an adaptive interval and periodically tries to
+re-establish the listener.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from engagement_monitor import emitter
+
+logger = logging.getLogger(__name__)
+
+# How many delivered command IDs to remember for de-duplication.
+_SEEN_LIMIT = 1024
+
+# Pending commands fetched per poll. A delivered command stays pending until
+# it is marked, and a failed mark would otherwise hide every newer command
+# behind it.
+_POLL_BATCH = 10
+
+
+class CommandSubscriber:
+    """Delivers each pending remote command to ``on_command`` exactly once.
+
+    ``on_command(command_id, command_dict)`` is called from a background
+    thread; callers typically just put the pair on a queue.
+    """
+
+    def __init__(
+        self,
+        device_id: str,
+        on_command: Callable[[str, dict], None],
+        *,
+        use_listener: bool = True,
+        poll_min: float = 0.5,
+        poll_max: float = 5.0,
+        health_interval: float = 5.0,
+        listener_retry: float = 60.0,
+    ):
+        """
+        Args:
+            device_id: Device whose command collection is watched.
+            on_command: Callback receiving (command_id, command_dict).
+            use_listener: Try a snapshot listener before polling.
+            poll_min: Polling interval right after a command arrives.
+            poll_max: Upper bound for the idle polling interval and error backoff.
+            health_interval: Seconds between listener liveness checks.
+            listener_retry: Seconds of polling before retrying the listener.
+        """
+        self._device_id = device_id
+        self._on_command = on_command
+        self._use_listener = use_listener
+        self._poll_min = poll_min
+        self._poll_max = max(poll_min, poll_max)
+        self._health_interval = health_interval
+        self._listener_retry = listener_retry
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._seen_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._watch = None
+        self.mode = "stopped"
+
+    def start(self) -> None:
+        """Start the supervisor thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="command-subscriber", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Close the listener and stop polling."""
+        self._stop.set()
+        self._close_watch()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.mode = "stopped"
+
+    def _deliver(self, commands: list[tuple[str, dict]]) -> int:
+        delivered = 0
+        for command_id, command in commands:
+            with self._seen_lock:
+                if command_id in self._seen:
+                    continue
+                self._seen[command_id] = None
+                if len(self._seen) > _SEEN_LIMIT:
+                    self._seen.popitem(last=False)
+            try:
+                self._on_command(command_id, command)
+                delivered += 1
+            except Exception:
+                logger.exception("Command handler failed for %s", command_id)
+        return delivered
+
+    def _open_watch(self) -> bool:
+        try:
+            self._watch = emitter.watch_commands(self._device_id, self._deliver)
+        except Exception as exc:
+            logger.warning("Command listener unavailable (%s) — polling instead", exc)
+            self._watch = None
+            return False
+        self.mode = "listening"
+        logger.info("Listening for commands on devices/%s/commands", self._device_id)
+        return True
+
+    def _close_watch(self) -> None:
+        if self._watch is not None:
+            try:
+                self._watch.unsubscribe()
+            except Exception:
+                logger.debug("Ignoring error while closing command listener", exc_info=True)
+            self._watch = None
+
+    def _listen(self) -> None:
+        """Block while the listener is healthy; return when it dies or on stop."""
+        while not self._stop.wait(timeout=self._health_interval):
+            if not getattr(self._watch, "is_active", True):
+                logger.warning("Command listener disconnected — reconnecting")
+                self._close_watch()
+                return
+
+    def _poll(self, duration: float) -> None:
+        """Poll with an adaptive interval for up to ``duration`` seconds."""
+        self.mode = "polling"
+        interval = self._poll_min
+        remaining = duration
+        while remaining > 0 and not self._stop.is_set():
+            try:
+                pending = emitter.fetch_pending_commands(self._device_id, _POLL_BATCH)
+            except Exception as exc:
+                logger.warning("Command poll failed (%s)", exc)
+                interval = min(self._poll_max, interval * 2)
+            else:
+                if self._deliver(pending):
+                    interval = self._poll_min
+                else:
+                    interval = min(self._poll_max, interval * 1.5)
+            self._stop.wait(timeout=interval)
+            remaining -= interval
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            if self._use_listener and self._open_watch():
+                opened_at = time.monotonic()
+                self._listen()
+                if time.monotonic() - opened_at >= self._listener_retry:
+                    failures = 0
+                failures += 1
+                # A listener that keeps dying gets a short polling spell
+                # before the next reconnect attempt.
+                if failures > 1:
+                    self._poll(min(self._listener_retry, self._poll_max * failures))
+                continue
+            self._poll(self._listener_retry if self._use_listener else float("inf"))
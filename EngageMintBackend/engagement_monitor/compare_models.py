@@ -0,0 +1,211 @@
+"""Compare a float model with its quantized counterpart on the same frames.
+
+Both models are loaded with the repo's ``labels.txt`` and run over the same
+frames: images from a directory (e.g. ``training_data/``) or synthetic
+640x480 frames. The report gives per-frame latency for each model, the
+resident-memory growth from loading each interpreter, model file sizes, and
+how often the two agree on the top-1 label.
+
+Usage:
+    python -m engagement_monitor.compare_models --quantized model/model_quant.tflite
+    python -m engagement_monitor.compare_models --quantized model/model_quant.tflite \\
+        --frames training_data --per-frame --json
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+
+from engagement_monitor.detector import _DEFAULT_LABELS_PATH, _DEFAULT_MODEL_PATH, Detector
+
+logger = logging.getLogger(__name__)
+
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+FULL_FRAME_SHAPE = (480, 640)
+
+
+def _rss_bytes() -> int:
+    """Current resident set size; the peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is in kilobytes on Linux (bytes on macOS); a peak, not a current value.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def load_frames(frames_dir: str | Path | None, count: int = 50) -> list[np.ndarray]:
+    """RGB frames from the images in ``frames_dir``, or ``count`` synthetic frames.
+
+    Raises:
+        ValueError: If there would be no frames to run.
+    """
+    if count < 1:
+        raise ValueError("At least one frame is required")
+    if frames_dir is None:
+        rng = np.random.default_rng(0)
+        return [
+            rng.integers(0, 256, size=(*FULL_FRAME_SHAPE, 3), dtype=np.uint8) for _ in range(count)
+        ]
+    from PIL import Image
+
+    paths = sorted(
+        p for p in Path(frames_dir).rglob("*") if p.suffix.lower() in _IMAGE_SUFFIXES
+    )[:count]
+    if not paths:
+        raise ValueError(f"No images found in {frames_dir}")
+    return [np.array(Image.open(p).convert("RGB")) for p in paths]
+
+
+def load_model(factory: Callable[[], Detector]) -> tuple[Detector, int]:
+    """Build and load a detector; return it with the RSS growth its load caused."""
+    before = _rss_bytes()
+    detector = factory()
+    detector.load(source_shape=None)
+    return detector, max(0, _rss_bytes() - before)
+
+
+def compare(
+    float_detector: Detector,
+    quant_detector: Detector,
+    frames: Iterable[np.ndarray],
+    warmup: int = 2,
+) -> dict:
+    """Run both detectors over ``frames`` and measure latency and agreement.
+
+    Returns:
+        Dict with a ``frames`` list (per-frame latency, top-1 labels and the
+        max absolute probability difference) and a ``summary``.
+
+    Raises:
+        ValueError: If the two models' labels differ.
+    """
+    labels = float_detector.labels
+    if quant_detector.labels != labels:
+        raise ValueError(f"Models disagree on labels: {labels} vs {quant_detector.labels}")
+    frames = list(frames)
+    for frame in frames[:warmup]:
+        float_detector.predict(frame)
+        quant_detector.predict(frame)
+
+    rows = []
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        p_float = float_detector.predict(frame)
+        float_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        p_quant = quant_detector.predict(frame)
+        quant_ms = (time.perf_counter() - start) * 1000
+        float_top = int(np.argmax(p_float))
+        quant_top = int(np.argmax(p_quant))
+        rows.append(
+            {
+                "frame": i,
+                "floatMs": round(float_ms, 3),
+                "quantMs": round(quant_ms, 3),
+                "floatLabel": labels[float_top],
+                "quantLabel": labels[quant_top],
+                "floatConfidence": round(float(p_float[float_top]), 4),
+                "quantConfidence": round(float(p_quant[quant_top]), 4),
+                "agree": float_top == quant_top,
+                "maxAbsDiff": round(float(np.max(np.abs(p_float - p_quant))), 4),
+            }
+        )
+
+    if not rows:
+        return {"frames": [], "summary": {"frames": 0}}
+    float_ms = np.array([r["floatMs"] for r in rows])
+    quant_ms = np.array([r["quantMs"] for r in rows])
+    summary = {
+        "frames": len(rows),
+        "floatMeanMs": round(float(float_ms.mean()), 3),
+        "floatP95Ms": round(float(np.percentile(float_ms, 95)), 3),
+        "quantMeanMs": round(float(quant_ms.mean()), 3),
+        "quantP95Ms": round(float(np.percentile(quant_ms, 95)), 3),
+        "speedup": round(float(float_ms.mean() / quant_ms.mean()), 2) if quant_ms.mean() else None,
+        "labelAgreement": round(sum(r["agree"] for r in rows) / len(rows), 4),
+        "meanMaxAbsDiff": round(float(np.mean([r["maxAbsDiff"] for r in rows])), 4),
+    }
+    return {"frames": rows, "summary": summary}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare latency, memory and label agreement of a float and a quantized model."
+    )
+    parser.add_argument("--float", dest="float_model", default=str(_DEFAULT_MODEL_PATH))
+    parser.add_argument("--quantized", required=True, help="Quantized (uint8/int8/float16) TFLite model")
+    parser.add_argument("--labels", default=str(_DEFAULT_LABELS_PATH))
+    parser.add_argument(
+        "--frames", default=None, help="Directory of images to run (default: synthetic 640x480 frames)"
+    )
+    parser.add_argument("--count", type=int, default=50, help="Max frames to run (default: 50)")
+    parser.add_argument("--threads", type=int, default=0, help="Interpreter threads (default: every core)")
+    parser.add_argument("--per-frame", action="store_true", help="Print one line per frame")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        frames = load_frames(args.frames, args.count)
+        float_detector, float_rss = load_model(
+            lambda: Detector(args.float_model, args.labels, num_threads=args.threads)
+        )
+        quant_detector, quant_rss = load_model(
+            lambda: Detector(args.quantized, args.labels, num_threads=args.threads)
+        )
+        report = compare(float_detector, quant_detector, frames)
+    except (ValueError, OSError) as exc:
+        print(f"Comparison failed: {exc}", file=sys.stderr)
+        return 1
+    report["summary"].update(
+        {
+            "floatModelBytes": Path(args.float_model).stat().st_size,
+            "quantModelBytes": Path(args.quantized).stat().st_size,
+            "floatLoadRssBytes": float_rss,
+            "quantLoadRssBytes": quant_rss,
+        }
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    if args.per_frame:
+        print(
+            f"{'frame':>5} {'float ms':>9} {'quant ms':>9} "
+            f"{'float label':>18} {'quant label':>18} {'max |dp|':>9}"
+        )
+        for row in report["frames"]:
+            print(
+                f"{row['frame']:>5} {row['floatMs']:>9.2f} {row['quantMs']:>9.2f} "
+                f"{row['floatLabel']:>18} {row['quantLabel']:>18} {row['maxAbsDiff']:>9.4f}"
+            )
+        print()
+    s = report["summary"]
+    mb = 1024 * 1024
+    print(f"Frames: {s['frames']}")
+    print(
+        f"  float:     mean {s['floatMeanMs']} ms, p95 {s['floatP95Ms']} ms, "
+        f"model {s['floatModelBytes'] / mb:.1f} MB, load RSS +{s['floatLoadRssBytes'] / mb:.1f} MB"
+    )
+    print(
+        f"  quantized: mean {s['quantMeanMs']} ms, p95 {s['quantP95Ms']} ms, "
+        f"model {s['quantModelBytes'] / mb:.1f} MB, load RSS +{s['quantLoadRssBytes'] / mb:.1f} MB"
+    )
+    print(
+        f"  speedup {s['speedup']}x, top-1 agreement {s['labelAgreement']:.1%}, "
+        f"mean max |dp| {s['meanMaxAbsDiff']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    sys.exit(main())
@@ -1,4 +1,4 @@
-"""Configuration loader and validator for behavior weights."""
+"""Configuration loaders and validators for behavior weights, inference and seat-zone settings."""
 
 import json
 import logging
@@ -36,17 +36,47 @@ BEHAVIOR_KEYS = [
     "looking_away_long",
 ]
 
+# Interpreter/input-path defaults — used when config/inference.json is missing or invalid.
+# numThreads 0 means every core.
+DEFAULT_INFERENCE_CONFIG = {
+    "numThreads": 0,
+    "delegate": "xnnpack",
+    "fastPreprocess": True,
+    "cameraLores": True,
+}
+
+# Seat-zone tiling defaults — used when config/zones.json is missing or invalid.
+# Explicit ``zones`` take precedence over the ``rows`` x ``cols`` grid.
+DEFAULT_ZONES_CONFIG = {
+    "enabled": False,
+    "rows": 2,
+    "cols": 2,
+    "zones": [],
+    "includeFullFrame": False,
+}
+
 _SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schemas" / "weight-config.v1.schema.json"
-_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "weights.json"
+# Default config file locations (EngageMintBackend/config/).
+DEFAULT_WEIGHTS_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "weights.json"
+_INFERENCE_SCHEMA_PATH = (
+    Path(__file__).resolve().parent.parent / "schemas" / "inference-config.v1.schema.json"
+)
+DEFAULT_INFERENCE_CONFIG_PATH = (
+    Path(__file__).resolve().parent.parent / "config" / "inference.json"
+)
+_ZONES_SCHEMA_PATH = (
+    Path(__file__).resolve().parent.parent / "schemas" / "zones-config.v1.schema.json"
+)
+_ZONES_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "zones.json"
 
 # Last known-good config kept in memory so invalid reloads can safely fall back
 # to the previous valid values (rather than always resetting to defaults).
 _LAST_VALID_CONFIG: dict = dict(DEFAULT_CONFIG)
 
 
-def _load_schema() -> dict:
-    """Load the weight-config JSON schema."""
-    with open(_SCHEMA_PATH, "r", encoding="utf-8") as f:
+def _load_schema(schema_path: Path = _SCHEMA_PATH) -> dict:
+    """Load a JSON schema (the weight-config schema by default)."""
+    with open(schema_path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
@@ -60,6 +90,16 @@ def _validate(config: dict, schema: dict) -> list[str]:
     return errors
 
 
+def validate_weights(config: dict) -> list[str]:
+    """Validate a weights config against its schema. Returns list of error messages."""
+    return _validate(config, _load_schema())
+
+
+def validate_inference(config: dict) -> list[str]:
+    """Validate an inference config against its schema. Returns list of error messages."""
+    return _validate(config, _load_schema(_INFERENCE_SCHEMA_PATH))
+
+
 def load_config(config_path: str | Path | None = None) -> dict:
     """Load and validate weights config from JSON file.
 
@@ -71,7 +111,7 @@ def load_config(config_path: str | Path | None = None) -> dict:
     Returns:
         Validated configuration dictionary.
     """
-    path = Path(config_path) if config_path else _CONFIG_PATH
+    path = Path(config_path) if config_path else DEFAULT_WEIGHTS_CONFIG_PATH
     schema = _load_schema()
 
     global _LAST_VALID_CONFIG
@@ -113,7 +153,7 @@ def reload_config(config_path: str | Path | None = None) -> tuple[dict, list[str
     Returns:
         Tuple of (config_dict, error_list). error_list is empty on success.
     """
-    path = Path(config_path) if config_path else _CONFIG_PATH
+    path = Path(config_path) if config_path else DEFAULT_WEIGHTS_CONFIG_PATH
     schema = _load_schema()
 
     global _LAST_VALID_CONFIG
@@ -140,3 +180,101 @@ def reload_config(config_path: str | Path | None = None) -> tuple[dict, list[str
     logger.info("Config reloaded from %s", path)
     _LAST_VALID_CONFIG = dict(config)
     return config, []
+
+
+def load_inference_config(config_path: str | Path | None = None) -> dict:
+    """Load and validate the interpreter/input-path config.
+
+    Missing keys take their defaults; a missing or invalid file yields the
+    defaults.
+
+    Args:
+        config_path: Path to inference.json. Defaults to EngageMintBackend/config/inference.json.
+
+    Returns:
+        Inference configuration with every key of ``DEFAULT_INFERENCE_CONFIG``.
+    """
+    path = Path(config_path) if config_path else DEFAULT_INFERENCE_CONFIG_PATH
+
+    if not path.exists():
+        logger.info("Inference config not found at %s — using defaults", path)
+        return dict(DEFAULT_INFERENCE_CONFIG)
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (json.JSONDecodeError, OSError) as exc:
+        logger.error("Failed to read inference config %s: %s — using defaults", path, exc)
+        return dict(DEFAULT_INFERENCE_CONFIG)
+
+    errors = validate_inference(config)
+    if errors:
+        for err in errors:
+            logger.error("Inference config validation error — %s", err)
+        logger.warning("Invalid inference config rejected — using defaults")
+        return dict(DEFAULT_INFERENCE_CONFIG)
+
+    logger.info("Inference config loaded from %s", path)
+    return {**DEFAULT_INFERENCE_CONFIG, **config}
+
+
+def load_zones_config(config_path: str | Path | None = None) -> dict:
+    """Load and validate the seat-zone tiling config.
+
+    Missing keys take their defaults; a missing or invalid file yields the
+    defaults (tiling disabled).
+
+    Args:
+        config_path: Path to zones.json. Defaults to EngageMintBackend/config/zones.json.
+
+    Returns:
+        Zones configuration with every key of ``DEFAULT_ZONES_CONFIG``.
+    """
+    path = Path(config_path) if config_path else _ZONES_CONFIG_PATH
+
+    if not path.exists():
+        logger.info("Zones config not found at %s — seat-zone tiling disabled", path)
+        return dict(DEFAULT_ZONES_CONFIG)
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (json.JSONDecodeError, OSError) as exc:
+        logger.error("Failed to read zones config %s: %s — using defaults", path, exc)
+        return dict(DEFAULT_ZONES_CONFIG)
+
+    errors = _validate(config, _load_schema(_ZONES_SCHEMA_PATH))
+    if errors:
+        for err in errors:
+            logger.error("Zones config validation error — %s", err)
+        logger.warning("Invalid zones config rejected — using defaults")
+        return dict(DEFAULT_ZONES_CONFIG)
+
+    logger.info("Zones config loaded from %s", path)
+    return {**DEFAULT_ZONES_CONFIG, **config}
+
+
+def zone_rects(zones_config: dict) -> list[tuple[float, float, float, float]]:
+    """Normalized (x, y, width, height) rectangles described by a zones config.
+
+    Explicit ``zones`` are used as given, otherwise the frame is split into a
+    ``rows`` x ``cols`` grid. ``includeFullFrame`` prepends the whole frame.
+    Zones outside the frame are clipped to it.
+    """
+    rects: list[tuple[float, float, float, float]] = []
+    if zones_config.get("includeFullFrame"):
+        rects.append((0.0, 0.0, 1.0, 1.0))
+    if zones_config.get("zones"):
+        for zone in zones_config["zones"]:
+            x = min(max(float(zone["x"]), 0.0), 1.0)
+            y = min(max(float(zone["y"]), 0.0), 1.0)
+            rects.append(
+                (x, y, min(float(zone["width"]), 1.0 - x), min(float(zone["height"]), 1.0 - y))
+            )
+    else:
+        rows = int(zones_config.get("rows", 1))
+        cols = int(zones_config.get("cols", 1))
+        rects.extend(
+            (c / cols, r / rows, 1.0 / cols, 1.0 / rows) for r in range(rows) for c in range(cols)
+        )
+    return [rect for rect in rects if rect[2] > 0 and rect[3] > 0]
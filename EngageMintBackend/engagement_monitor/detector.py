@@ -2,12 +2,21 @@
 
 import json
 import logging
+import os
 import re
 from pathlib import Path
 
 import numpy as np
 from PIL import Image
 
+from engagement_monitor.preprocess import (
+    FramePreprocessor,
+    ZonePreprocessor,
+    _zone_span,
+    dequantize,
+    input_lut,
+)
+
 logger = logging.getLogger(__name__)
 
 _MODEL_DIR = Path(__file__).resolve().parent.parent / "model"
@@ -17,6 +26,12 @@ _TRAINING_CAPTURE_CONFIG_PATH = (
     Path(__file__).resolve().parent.parent / "config" / "training_capture.json"
 )
 
+# Interpreter delegate choices (see config/inference.json).
+DELEGATE_XNNPACK = "xnnpack"
+DELEGATE_NONE = "none"
+DELEGATE_EXTERNAL = "external"
+DELEGATES = (DELEGATE_XNNPACK, DELEGATE_NONE, DELEGATE_EXTERNAL)
+
 _LABEL_ALIASES = {
     "hands_on_head": "hands_on_head",
     "head_down": "head_down",
@@ -31,6 +46,30 @@ _LABEL_ALIASES = {
 }
 
 
+def log_state(probabilities: np.ndarray, labels: list[str], confidence_threshold: float = 0.6) -> None:
+    """Log the top-1 label of a probability vector as ``state=<label> conf=<p>``.
+
+    Logs ``state=none`` when no known label reaches the threshold.
+    """
+    known = probabilities[: len(labels)]
+    if len(known):
+        idx = int(np.argmax(known))
+        conf = float(known[idx])
+        if conf >= confidence_threshold:
+            logger.info("state=%s conf=%.2f", labels[idx], conf)
+            return
+    logger.info("state=none")
+
+
+def log_zone_states(
+    probabilities: np.ndarray, labels: list[str], confidence_threshold: float = 0.6
+) -> None:
+    """Log how many zones of a (zones, N) probability matrix have a detection."""
+    known = probabilities[:, : len(labels)]
+    occupied = int(np.count_nonzero((known >= confidence_threshold).any(axis=1)))
+    logger.info("zones=%d occupied=%d", len(probabilities), occupied)
+
+
 def _canonicalize_label(raw_label: str) -> str:
     """Convert arbitrary label text to a config-compatible behavior key."""
     normalized = re.sub(r"[^a-z0-9]+", "_", raw_label.strip().lower()).strip("_")
@@ -98,20 +137,111 @@ def _apply_frame_preprocessing(
     return np.ascontiguousarray(out)
 
 
+def _preprocess_pil(
+    frame: np.ndarray,
+    output_size: tuple[int, int],
+    *,
+    flip180: bool,
+    swap_red_blue: bool,
+    dtype=np.float32,
+    quantization: tuple[float, int] = (0.0, 0),
+) -> np.ndarray:
+    """Reference preprocessing: transforms, PIL resize, then normalization.
+
+    Returns:
+        A new (1, height, width, 3) array of ``dtype``.
+    """
+    frame = _apply_frame_preprocessing(frame, flip180=flip180, swap_red_blue=swap_red_blue)
+
+    # Resize according to model input shape (skipped when already at model size)
+    img = Image.fromarray(frame)
+    if img.size != (output_size[1], output_size[0]):
+        img = img.resize((output_size[1], output_size[0]))
+    # Preprocess according to input tensor dtype.
+    if dtype == np.float32:
+        # Teachable Machine float models expect [-1, 1].
+        input_data = (np.array(img, dtype=np.float32) / 127.5) - 1.0
+    else:
+        # Quantized models map [-1, 1] through the input (scale, zero_point).
+        input_data = input_lut(dtype, quantization)[np.asarray(img)]
+
+    return np.expand_dims(input_data, axis=0)  # (1, 224, 224, 3)
+
+
+def _quantization(details: dict) -> tuple[float, int]:
+    """(scale, zero_point) of a tensor; (0.0, 0) when it is not quantized."""
+    scale, zero_point = details.get("quantization", (0.0, 0))
+    return float(scale), int(zero_point)
+
+
+def _import_tflite():
+    """Return the interpreter module: tflite_runtime, falling back to tf.lite."""
+    try:
+        from tflite_runtime import interpreter as tflite
+    except ImportError:
+        from tensorflow.lite.python import interpreter as tflite
+    return tflite
+
+
+def _interpreter_options(
+    tflite, num_threads: int, delegate: str, external_delegate_path: str | None
+) -> dict:
+    """Keyword arguments for ``Interpreter`` selecting threads and delegate."""
+    options: dict = {"num_threads": num_threads}
+    if delegate == DELEGATE_NONE:
+        # XNNPACK is applied by default; opting out needs the builtin-only resolver.
+        resolver_type = getattr(tflite, "OpResolverType", None)
+        if resolver_type is None:
+            logger.warning("This TFLite build cannot disable XNNPACK — using the default delegate")
+        else:
+            options["experimental_op_resolver_type"] = resolver_type.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+    elif delegate == DELEGATE_EXTERNAL:
+        if not external_delegate_path:
+            raise ValueError("delegate 'external' requires an external delegate path")
+        options["experimental_delegates"] = [tflite.load_delegate(external_delegate_path)]
+    return options
+
+
 class Detector:
     """TFLite-based behavior detector.
 
     Loads a Teachable Machine TFLite model and classifies frames into
     behavior categories with confidence scores.
+
+    By default frames are preprocessed by a ``FramePreprocessor`` that writes
+    straight into the interpreter's input tensor; ``fast_preprocess=False``
+    selects the original PIL resize path.
+
+    ``num_threads`` (0 = every core) and ``delegate`` (``xnnpack``, ``none``
+    or ``external`` with ``external_delegate_path``) configure the interpreter.
+
+    ``set_zones`` enables seat-zone tiling: ``detect_zones`` crops every zone
+    from a frame and classifies them all with one batched invoke.
     """
 
     def __init__(
         self,
         model_path: str | Path | None = None,
         labels_path: str | Path | None = None,
+        fast_preprocess: bool = True,
+        num_threads: int = 0,
+        delegate: str = DELEGATE_XNNPACK,
+        external_delegate_path: str | None = None,
     ):
+        if delegate not in DELEGATES:
+            raise ValueError(f"Unknown delegate: {delegate!r} (expected one of {', '.join(DELEGATES)})")
         self._model_path = Path(model_path) if model_path else _DEFAULT_MODEL_PATH
         self._labels_path = Path(labels_path) if labels_path else _DEFAULT_LABELS_PATH
+        self._fast_preprocess = fast_preprocess
+        self._num_threads = int(num_threads) if num_threads and num_threads > 0 else (os.cpu_count() or 1)
+        self._delegate = delegate
+        self._external_delegate_path = external_delegate_path
+        self._preprocessor: FramePreprocessor | None = None
+        self._zone_preprocessor: ZonePreprocessor | None = None
+        self._zones: tuple[tuple[float, float, float, float], ...] = ()
+        self._source_shape: tuple[int, int] | None = None
+        self._input_tensor = None
+        self._batch_size = 1
         self._interpreter = None
         self._labels: list[str] = []
         self._input_details = None
@@ -119,45 +249,162 @@ class Detector:
         self._input_height = 224
         self._input_width = 224
         self._input_dtype = np.float32
+        self._input_quantization: tuple[float, int] = (0.0, 0)
+        self._output_quantization: tuple[float, int] = (0.0, 0)
         self._flip180 = False
         self._swap_red_blue = False
 
-    def load(self) -> None:
-        """Load the TFLite model and labels."""
-        # Import tflite_runtime; fall back to tf.lite if needed
-        try:
-            from tflite_runtime.interpreter import Interpreter
-        except ImportError:
-            from tensorflow.lite.python.interpreter import Interpreter
+    @property
+    def input_size(self) -> tuple[int, int]:
+        """Model input (height, width); accurate after ``load()``."""
+        return self._input_height, self._input_width
+
+    @property
+    def labels(self) -> list[str]:
+        """Canonical labels in model output order; populated by ``load()``."""
+        return list(self._labels)
+
+    @property
+    def zone_count(self) -> int:
+        """Number of seat zones classified by ``detect_zones`` (0 when tiling is off)."""
+        return len(self._zones)
+
+    def load(self, source_shape: tuple[int, int] | None = (480, 640)) -> None:
+        """Load the TFLite model and labels.
+
+        Args:
+            source_shape: Expected camera frame (height, width), used to
+                precompute the preprocessing sampling map. ``None`` defers
+                it to ``prepare_source`` or the first frame.
+        """
+        tflite = _import_tflite()
 
         self._labels = _load_labels(self._labels_path)
         logger.info("Loaded %d labels from %s", len(self._labels), self._labels_path)
 
-        self._interpreter = Interpreter(model_path=str(self._model_path))
+        self._interpreter = tflite.Interpreter(
+            model_path=str(self._model_path),
+            **_interpreter_options(
+                tflite, self._num_threads, self._delegate, self._external_delegate_path
+            ),
+        )
         self._interpreter.allocate_tensors()
+        self._source_shape = tuple(source_shape[:2]) if source_shape is not None else None
 
         self._input_details = self._interpreter.get_input_details()
         self._output_details = self._interpreter.get_output_details()
 
+        self._batch_size = 1
         input_shape = self._input_details[0]["shape"]
         self._input_height = int(input_shape[1])
         self._input_width = int(input_shape[2])
         self._input_dtype = self._input_details[0]["dtype"]
+        self._input_quantization = _quantization(self._input_details[0])
+        self._output_quantization = _quantization(self._output_details[0])
         self._flip180, self._swap_red_blue = (
             _load_preprocessing_from_training_capture_config()
         )
         logger.info(
-            "Model loaded from %s — input shape: %s dtype=%s",
+            "Model loaded from %s — input shape: %s dtype=%s quantization=%s threads=%d delegate=%s",
             self._model_path,
             input_shape,
             self._input_dtype,
+            self._input_quantization,
+            self._num_threads,
+            self._delegate,
         )
+        if self._fast_preprocess:
+            self._preprocessor = FramePreprocessor(
+                (self._input_height, self._input_width),
+                flip180=self._flip180,
+                swap_red_blue=self._swap_red_blue,
+                dtype=self._input_dtype,
+                quantization=self._input_quantization,
+                source_shape=source_shape,
+            )
+            self._input_tensor = self._interpreter.tensor(self._input_details[0]["index"])
         logger.info(
-            "Inference preprocessing: flip180=%s swapRedBlue=%s",
+            "Inference preprocessing: flip180=%s swapRedBlue=%s fused=%s",
             self._flip180,
             self._swap_red_blue,
+            self._fast_preprocess,
         )
         logger.info("Label mapping: %s", self._labels)
+        if self._zones:
+            self.set_zones(self._zones)
+
+    def prepare_source(self, source_shape: tuple[int, int]) -> None:
+        """Precompute preprocessing for camera frames of (height, width)."""
+        self._source_shape = tuple(source_shape[:2])
+        if self._preprocessor is not None:
+            self._preprocessor.prepare(source_shape)
+        if self._zone_preprocessor is not None:
+            self._zone_preprocessor.prepare(source_shape)
+
+    def set_zones(self, zones) -> None:
+        """Configure the seat zones classified by ``detect_zones``.
+
+        Args:
+            zones: Normalized (x, y, width, height) rectangles in the
+                as-trained orientation; empty disables tiling.
+
+        Raises:
+            ValueError: If a zone lies outside the frame.
+        """
+        self._zones = tuple(tuple(float(v) for v in zone) for zone in zones)
+        self._zone_preprocessor = None
+        if not self._zones or self._interpreter is None:
+            return
+        if self._fast_preprocess:
+            self._zone_preprocessor = ZonePreprocessor(
+                (self._input_height, self._input_width),
+                self._zones,
+                flip180=self._flip180,
+                swap_red_blue=self._swap_red_blue,
+                dtype=self._input_dtype,
+                quantization=self._input_quantization,
+                source_shape=self._source_shape,
+            )
+        logger.info("Seat-zone tiling: %d zones per frame", len(self._zones))
+
+    def predict(self, frame: np.ndarray) -> np.ndarray:
+        """Run inference on a frame and return the model's probability vector.
+
+        Args:
+            frame: numpy RGB array of any size (resized to the model input
+                unless it already matches, e.g. from the camera lores stream).
+
+        Returns:
+            (num_labels,) softmax output, in ``labels`` order.
+
+        Raises:
+            RuntimeError: If model has not been loaded.
+        """
+        if self._interpreter is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+
+        self._set_batch_size(1)
+        # Apply the same transforms used during training photo capture, resize
+        # to the model input and normalize for the input tensor dtype.
+        if self._preprocessor is not None:
+            input_view = self._input_tensor()
+            self._preprocessor.run(frame, input_view[0])
+            # The interpreter refuses to invoke while views of its buffers exist.
+            del input_view
+        else:
+            input_data = _preprocess_pil(
+                frame,
+                (self._input_height, self._input_width),
+                flip180=self._flip180,
+                swap_red_blue=self._swap_red_blue,
+                dtype=self._input_dtype,
+                quantization=self._input_quantization,
+            )
+            self._interpreter.set_tensor(self._input_details[0]["index"], input_data)
+        self._interpreter.invoke()
+
+        output_data = self._interpreter.get_tensor(self._output_details[0]["index"])
+        return dequantize(output_data[0], self._output_quantization)  # shape: (N,) softmax
 
     def detect(
         self, frame: np.ndarray, confidence_threshold: float = 0.6
@@ -165,60 +412,186 @@ class Detector:
         """Run inference on a frame and return detected behaviors.
 
         Args:
-            frame: numpy RGB array of any size (will be resized to 224x224).
+            frame: numpy RGB array of any size (resized to the model input
+                unless it already matches, e.g. from the camera lores stream).
             confidence_threshold: Minimum confidence to include a detection.
 
         Returns:
             List of (behavior_label, confidence) tuples above the threshold.
 
+        Raises:
+            RuntimeError: If model has not been loaded.
+        """
+        return self.detections(self.predict(frame), confidence_threshold)
+
+    def detections(
+        self, probabilities: np.ndarray, confidence_threshold: float = 0.6
+    ) -> list[tuple[str, float]]:
+        """Threshold a probability vector from ``predict`` into logged detections."""
+        detections = self._thresholded(probabilities, confidence_threshold)
+        log_state(probabilities, self._labels, confidence_threshold)
+        logger.debug(
+            "Inference: %d detections above %.2f threshold",
+            len(detections),
+            confidence_threshold,
+        )
+        return detections
+
+    def detect_batch(
+        self, frames, confidence_threshold: float = 0.6
+    ) -> tuple[np.ndarray, list[list[tuple[str, float]]]]:
+        """Run one inference over a batch of frames.
+
+        The interpreter input is resized to the batch size (kept until the
+        size changes), all frames are preprocessed together and a single
+        ``invoke()`` is made. Whole frames are classified even when seat
+        zones are configured; ``predict_zones`` resizes back to the zone
+        batch on its next call.
+
+        Args:
+            frames: (N, H, W, 3) uint8 RGB array, or a sequence of N frames
+                of the same shape.
+            confidence_threshold: Minimum confidence to include a detection.
+
+        Returns:
+            Tuple of the (N, num_labels) probability matrix (a copy) and, for
+            each frame, its (behavior_label, confidence) detections.
+
         Raises:
             RuntimeError: If model has not been loaded.
         """
         if self._interpreter is None:
             raise RuntimeError("Model not loaded. Call load() first.")
+        frames = np.asarray(frames)
+        if frames.ndim == 3:
+            frames = frames[None]
+        n = frames.shape[0]
+        if n == 0:
+            return np.empty((0, len(self._labels)), dtype=np.float32), []
+
+        self._set_batch_size(n)
+        if self._preprocessor is not None:
+            input_view = self._input_tensor()
+            self._preprocessor.run_batch(frames, input_view)
+            del input_view
+        else:
+            input_data = np.concatenate(
+                [
+                    _preprocess_pil(
+                        frame,
+                        (self._input_height, self._input_width),
+                        flip180=self._flip180,
+                        swap_red_blue=self._swap_red_blue,
+                        dtype=self._input_dtype,
+                        quantization=self._input_quantization,
+                    )
+                    for frame in frames
+                ]
+            )
+            self._interpreter.set_tensor(self._input_details[0]["index"], input_data)
+        self._interpreter.invoke()
 
-        # Apply same transforms used during training photo capture.
-        frame = _apply_frame_preprocessing(
-            frame,
-            flip180=self._flip180,
-            swap_red_blue=self._swap_red_blue,
+        probabilities = dequantize(
+            self._interpreter.get_tensor(self._output_details[0]["index"]),
+            self._output_quantization,
         )
+        detections = [self._thresholded(row, confidence_threshold) for row in probabilities]
+        logger.debug("Batch inference: %d frames", n)
+        return probabilities, detections
 
-        # Resize according to model input shape
-        img = Image.fromarray(frame)
-        img = img.resize((self._input_width, self._input_height))
-        input_data = np.array(img, dtype=np.float32)
+    def predict_zones(self, frame: np.ndarray) -> np.ndarray:
+        """Classify every configured seat zone of ``frame`` with one invoke.
 
-        # Preprocess according to input tensor dtype.
-        if self._input_dtype == np.float32:
-            # Teachable Machine float models expect [-1, 1].
-            input_data = (input_data / 127.5) - 1.0
-        else:
-            input_data = input_data.astype(self._input_dtype)
+        The interpreter input stays at batch ``zone_count`` between calls, and
+        the crops are gathered straight into the input tensor.
 
-        input_data = np.expand_dims(input_data, axis=0)  # (1, 224, 224, 3)
+        Args:
+            frame: numpy RGB array from the camera.
+
+        Returns:
+            (zone_count, num_labels) probability matrix, zones in configuration order.
 
-        self._interpreter.set_tensor(self._input_details[0]["index"], input_data)
+        Raises:
+            RuntimeError: If the model is not loaded or no zones are configured.
+        """
+        if self._interpreter is None:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        if not self._zones:
+            raise RuntimeError("No seat zones configured. Call set_zones() first.")
+
+        self._set_batch_size(len(self._zones))
+        if self._zone_preprocessor is not None:
+            input_view = self._input_tensor()
+            self._zone_preprocessor.run(frame, input_view)
+            del input_view
+        else:
+            corrected = _apply_frame_preprocessing(
+                frame, flip180=self._flip180, swap_red_blue=self._swap_red_blue
+            )
+            crops = []
+            for x, y, w, h in self._zones:
+                top, height = _zone_span(y, h, corrected.shape[0])
+                left, width = _zone_span(x, w, corrected.shape[1])
+                crops.append(
+                    _preprocess_pil(
+                        corrected[top : top + height, left : left + width],
+                        (self._input_height, self._input_width),
+                        flip180=False,
+                        swap_red_blue=False,
+                        dtype=self._input_dtype,
+                        quantization=self._input_quantization,
+                    )
+                )
+            self._interpreter.set_tensor(self._input_details[0]["index"], np.concatenate(crops))
         self._interpreter.invoke()
 
-        output_data = self._interpreter.get_tensor(self._output_details[0]["index"])
-        probabilities = output_data[0]  # shape: (N,) softmax
+        return dequantize(
+            self._interpreter.get_tensor(self._output_details[0]["index"]),
+            self._output_quantization,
+        )
+
+    def detect_zones(
+        self, frame: np.ndarray, confidence_threshold: float = 0.6
+    ) -> list[list[tuple[str, float]]]:
+        """Classify every configured seat zone of ``frame`` and threshold each.
+
+        Args:
+            frame: numpy RGB array from the camera.
+            confidence_threshold: Minimum confidence to include a detection.
+
+        Returns:
+            For each zone, in configuration order, its (behavior_label, confidence)
+            detections above the threshold.
 
+        Raises:
+            RuntimeError: If the model is not loaded or no zones are configured.
+        """
+        probabilities = self.predict_zones(frame)
+        detections = [self._thresholded(row, confidence_threshold) for row in probabilities]
+        log_zone_states(probabilities, self._labels, confidence_threshold)
+        return detections
+
+    def _thresholded(
+        self, probabilities: np.ndarray, confidence_threshold: float
+    ) -> list[tuple[str, float]]:
+        """(label, confidence) for every known label at or above the threshold."""
         detections = []
         for idx, confidence in enumerate(probabilities):
             conf = float(confidence)
             if conf >= confidence_threshold and idx < len(self._labels):
                 detections.append((self._labels[idx], conf))
+        return detections
 
-        if detections:
-            label, conf = max(detections, key=lambda d: d[1])
-            logger.info("state=%s conf=%.2f", label, conf)
-        else:
-            logger.info("state=none")
-
-        logger.debug(
-            "Inference: %d detections above %.2f threshold",
-            len(detections),
-            confidence_threshold,
+    def _set_batch_size(self, n: int) -> None:
+        """Resize the interpreter input to batch ``n`` if it is not already."""
+        if n == self._batch_size:
+            return
+        index = self._input_details[0]["index"]
+        self._interpreter.resize_tensor_input(
+            index, [n, self._input_height, self._input_width, 3]
         )
-        return detections
+        self._interpreter.allocate_tensors()
+        if self._preprocessor is not None:
+            self._input_tensor = self._interpreter.tensor(index)
+        self._batch_size = n
+        logger.debug("Interpreter input resized to batch %d", n)
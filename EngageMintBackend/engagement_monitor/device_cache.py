@@ -0,0 +1,131 @@
+"""TTL cache of devices/{deviceId} documents.
+
+Session start needs the device's ``ownerUserId``. Fetching the device
+document inline costs a full round trip before anything is written, so the
+document is fetched in the background at startup, kept fresh by an optional
+snapshot listener, and otherwise re-read once its TTL expires.
+
+The device itself writes to its document while a session runs (the ``live``
+field), and a listener is billed a read for every one of those snapshots, so
+the owner of the cache closes the listener for the session with
+``unwatch()`` and re-opens it afterwards with ``warm()``.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300.0
+
+
+class DeviceCache:
+    """Thread-safe cache of device documents keyed by device ID.
+
+    Entries pushed by an active listener never expire; fetched entries are
+    trusted for ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], dict | None],
+        ttl: float = DEFAULT_TTL_SECONDS,
+        watch: Callable[[str, Callable[[dict | None], None]], object] | None = None,
+    ):
+        """
+        Args:
+            fetch: Callable(device_id) returning the device document as a
+                dict, or None if it does not exist.
+            ttl: Seconds a fetched document is considered fresh.
+            watch: Optional callable(device_id, on_doc) opening a listener
+                that calls ``on_doc`` with every new version of the document.
+                Must return a handle with ``unsubscribe()`` and ``is_active``.
+        """
+        self._fetch = fetch
+        self._ttl = float(ttl)
+        self._watch = watch
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[dict | None, float]] = {}
+        self._watches: dict[str, object] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, device_id: str) -> dict | None:
+        """Return the device document, fetching it if missing or stale."""
+        device_id = str(device_id)
+        with self._lock:
+            entry = self._entries.get(device_id)
+            if entry is not None and (self._is_watched(device_id) or time.monotonic() < entry[1]):
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        return self._refresh(device_id)
+
+    def put(self, device_id: str, doc: dict | None) -> None:
+        """Store a fresh copy of the device document."""
+        with self._lock:
+            self._entries[str(device_id)] = (doc, time.monotonic() + self._ttl)
+
+    def warm(self, device_id: str) -> threading.Thread:
+        """Fetch the document and open the listener in a background thread."""
+        thread = threading.Thread(
+            target=self._warm, args=(str(device_id),), name="device-cache-warm", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def unwatch(self, device_id: str) -> bool:
+        """Close the device's listener; its entry then expires by the TTL again.
+
+        Returns:
+            True if a listener was open.
+        """
+        with self._lock:
+            handle = self._watches.pop(str(device_id), None)
+            entry = self._entries.get(str(device_id))
+            if entry is not None:
+                # Pushed by the listener just now at the latest: fresh for one more TTL.
+                self._entries[str(device_id)] = (entry[0], time.monotonic() + self._ttl)
+        if handle is None:
+            return False
+        try:
+            handle.unsubscribe()
+        except Exception:
+            logger.debug("Ignoring error while closing device listener", exc_info=True)
+        return True
+
+    def close(self) -> None:
+        """Close every open listener."""
+        with self._lock:
+            watches, self._watches = self._watches, {}
+        for handle in watches.values():
+            try:
+                handle.unsubscribe()
+            except Exception:
+                logger.debug("Ignoring error while closing device listener", exc_info=True)
+
+    def _is_watched(self, device_id: str) -> bool:
+        handle = self._watches.get(device_id)
+        return handle is not None and getattr(handle, "is_active", True)
+
+    def _refresh(self, device_id: str) -> dict | None:
+        doc = self._fetch(device_id)
+        self.put(device_id, doc)
+        return doc
+
+    def _warm(self, device_id: str) -> None:
+        try:
+            self._refresh(device_id)
+        except Exception as exc:
+            logger.warning("Could not prefetch devices/%s (%s)", device_id, exc)
+        if self._watch is None or device_id in self._watches:
+            return
+        try:
+            handle = self._watch(device_id, lambda doc: self.put(device_id, doc))
+        except Exception as exc:
+            logger.warning("Device listener unavailable for devices/%s (%s)", device_id, exc)
+            return
+        with self._lock:
+            self._watches[device_id] = handle
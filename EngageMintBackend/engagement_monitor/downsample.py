@@ -0,0 +1,116 @@
+"""Shape-preserving timeline downsampling (Largest-Triangle-Three-Buckets)."""
+
+import numpy as np
+
+# Points kept in a session's stored timeline preview.
+DEFAULT_TIMELINE_POINTS = 200
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """Select ``n_out`` indices that preserve the visual shape of (x, y).
+
+    The first and last points are always kept. The interior is split into
+    ``n_out - 2`` equal buckets and, from each, the point forming the largest
+    triangle with the previously selected point and the next bucket's mean is
+    chosen. Triangle areas within a bucket are computed with NumPy.
+
+    Args:
+        x: Monotonically non-decreasing x values (e.g. seconds since start).
+        y: Values to downsample, same length as ``x``.
+        n_out: Number of points to keep.
+
+    Returns:
+        Sorted int array of selected indices into ``x``/``y``.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.linspace(0, n - 1, max(0, n_out)).astype(np.int64)
+
+    # Bucket boundaries over the interior points [1, n - 1).
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    csum_x = np.concatenate(([0.0], np.cumsum(x)))
+    csum_y = np.concatenate(([0.0], np.cumsum(y)))
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket).
+        if i + 2 < len(edges):
+            nstart, nstop = edges[i + 1], edges[i + 2]
+            avg_x = (csum_x[nstop] - csum_x[nstart]) / (nstop - nstart)
+            avg_y = (csum_y[nstop] - csum_y[nstart]) / (nstop - nstart)
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        bx = x[start:stop]
+        by = y[start:stop]
+        # Twice the triangle area; the constant factor does not change argmax.
+        area = np.abs((x[prev] - avg_x) * (by - y[prev]) - (x[prev] - bx) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def downsample_timeline(
+    times: list[float], scores: list[int], n_out: int = DEFAULT_TIMELINE_POINTS
+) -> list[dict]:
+    """Downsample a session timeline to at most ``n_out`` liveData-shaped points.
+
+    Args:
+        times: Seconds since session start for each tick.
+        scores: Engagement score for each tick.
+        n_out: Maximum number of points to return; ``0`` disables the preview.
+
+    Returns:
+        List of ``{"timeSinceStart", "engagementScore"}`` dicts in time order.
+    """
+    if n_out <= 0 or len(scores) == 0:
+        return []
+    indices = lttb(times, scores, n_out)
+    return [
+        {"timeSinceStart": int(times[i]), "engagementScore": int(scores[i])}
+        for i in indices
+    ]
+
+
+class StreamingTimeline:
+    """Bounded timeline buffer for the end-of-session LTTB preview.
+
+    Ticks are appended to preallocated arrays of ``capacity`` points. When
+    the buffer fills, LTTB compacts it to half, so memory stays
+    O(``n_out``) for sessions of any length while peaks survive into the
+    final preview.
+    """
+
+    def __init__(self, n_out: int = DEFAULT_TIMELINE_POINTS, capacity: int | None = None):
+        self._n_out = max(0, int(n_out))
+        capacity = capacity if capacity is not None else 8 * self._n_out
+        self._capacity = max(capacity, 2 * self._n_out, 4) if self._n_out else 0
+        self._times = np.empty(self._capacity, dtype=np.float64)
+        self._scores = np.empty(self._capacity, dtype=np.int16)
+        self._size = 0
+
+    def add(self, time_since_start: float, score: int) -> None:
+        """Append one tick, compacting the buffer first if it is full."""
+        if not self._capacity:
+            return
+        if self._size == self._capacity:
+            keep = lttb(self._times, self._scores, self._capacity // 2)
+            self._size = len(keep)
+            self._times[: self._size] = self._times[keep]
+            self._scores[: self._size] = self._scores[keep]
+        self._times[self._size] = time_since_start
+        self._scores[self._size] = score
+        self._size += 1
+
+    def preview(self) -> list[dict]:
+        """Downsample the buffered ticks to at most ``n_out`` points."""
+        return downsample_timeline(
+            self._times[: self._size], self._scores[: self._size], self._n_out
+        )
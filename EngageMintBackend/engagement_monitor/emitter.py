@@ -1,54 +1,50 @@
-"""Firestore payload emission — writes ticks, sessions, and summaries."""
+"""Payload emission facade — routes sessions, ticks and commands to a backend.
+
+The backend (Firestore by default, see ``engagement_monitor.backends``) is
+chosen with the EMITTER_BACKEND env var or ``set_backend``. Optional
+background delivery — an in-memory tick writer or a durable spool — sits in
+front of it.
+"""
 
 import logging
-import os
+import secrets
+import string
 from pathlib import Path
-from datetime import datetime, timezone
 
-import firebase_admin
-from firebase_admin import credentials, firestore
+from engagement_monitor import spool as spool_mod
+from engagement_monitor.backends import MAX_BATCH_WRITES, EmitterBackend, create_backend
+from engagement_monitor.live_state import DEFAULT_MIN_INTERVAL, LivePublisher
+from engagement_monitor.spool import Spool, SpoolDrainer
+from engagement_monitor.tick_writer import DEFAULT_QUEUE_SIZE, TickWriter
 
 logger = logging.getLogger(__name__)
 
-_app = None
-_db = None
-
+_backend: EmitterBackend | None = None
+_tick_writer: TickWriter | None = None
+_spool: Spool | None = None
+_drainer: SpoolDrainer | None = None
+_live: LivePublisher | None = None
 
-def _ensure_initialized():
-    """Initialize Firebase app and Firestore client if not already done."""
-    global _app, _db
-    if _db is not None:
-        return
+_DOC_ID_ALPHABET = string.ascii_letters + string.digits
 
-    cred_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-    if not cred_path:
-        # Convenience default for local device runs:
-        # use EngageMintBackend/config/service-account-key.json if present.
-        default_key = Path(__file__).resolve().parents[1] / "config" / "service-account-key.json"
-        if default_key.exists():
-            cred_path = str(default_key)
-            os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = cred_path
-            logger.info("Using default Firebase key at %s", cred_path)
-
-    if cred_path:
-        cred = credentials.Certificate(cred_path)
-    else:
-        # Fall back to Application Default Credentials
-        cred = credentials.ApplicationDefault()
 
-    _app = firebase_admin.initialize_app(cred)
-    _db = firestore.client()
-    logger.info("Firebase initialized")
+def get_backend() -> EmitterBackend:
+    """Return the active backend, creating it from EMITTER_BACKEND if needed."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+        logger.info("Emitter backend: %s", _backend.name)
+    return _backend
 
 
-def get_db():
-    """Return the Firestore client, initializing if needed."""
-    _ensure_initialized()
-    return _db
+def set_backend(backend: EmitterBackend | None) -> None:
+    """Replace the active backend (``None`` re-reads EMITTER_BACKEND on next use)."""
+    global _backend
+    _backend = backend
 
 
 def create_session(session_id: str, device_id: str, started_at: str, title: str | None = None) -> None:
-    """Create a session document in Firestore on session start.
+    """Create a session document on session start.
 
     Firebase model (canonical):
     sessions/{sessionId} => {title, overallScore, comments}
@@ -59,69 +55,27 @@ def create_session(session_id: str, device_id: str, started_at: str, title: str
         started_at: ISO 8601 UTC timestamp string (used for default title text only).
         title: Optional session title override.
     """
-    db = get_db()
-    owner_user_id = None
-    device_doc = db.collection("devices").document(device_id).get()
-    if device_doc.exists:
-        owner_user_id = (device_doc.to_dict() or {}).get("ownerUserId")
-
-    db.collection("sessions").document(session_id).set({
-        "title": title or f"Session {session_id[:8]} ({device_id}) {started_at[:19]}",
-        "overallScore": 0,
-        "comments": [],
-        "userId": owner_user_id,
-        "deviceId": device_id,
-        "startedAt": started_at,
-        "createdAt": firestore.SERVER_TIMESTAMP,
-        "updatedAt": firestore.SERVER_TIMESTAMP,
-    })
-    db.collection("devices").document(device_id).set(
-        {
-            "currentSessionId": session_id,
-            "currentSessionUpdatedAt": firestore.SERVER_TIMESTAMP,
-        },
-        merge=True,
-    )
-    if owner_user_id is None:
-        logger.warning(
-            "Session created without ownerUserId mapping: sessions/%s (device=%s)",
-            session_id,
-            device_id,
-        )
-    logger.debug("Session created: sessions/%s (device=%s)", session_id, device_id)
+    get_backend().create_session(session_id, device_id, started_at, title=title)
 
 
-def complete_session(session_id: str, ended_at: str, summary: dict) -> None:
+def complete_session(
+    session_id: str, ended_at: str, summary: dict, timeline: list[dict] | None = None
+) -> None:
     """Update a session document on session end.
 
     Sets overallScore from summary.averageEngagement.
 
     Args:
         session_id: Session UUID.
-        ended_at: ISO 8601 UTC timestamp string (unused, kept for compatibility).
+        ended_at: ISO 8601 UTC timestamp string.
         summary: Dict conforming to session-summary.v1 schema.
+        timeline: Optional downsampled timeline stored as timelinePreview.
     """
-    _ = ended_at
-    db = get_db()
-    db.collection("sessions").document(session_id).update({
-        "overallScore": float(summary.get("averageEngagement", 0)),
-        "endedAt": ended_at,
-        "updatedAt": firestore.SERVER_TIMESTAMP,
-    })
-    device_id = summary.get("deviceId")
-    if device_id:
-        db.collection("devices").document(str(device_id)).set(
-            {
-                "currentSessionId": None,
-                "currentSessionUpdatedAt": firestore.SERVER_TIMESTAMP,
-            },
-            merge=True,
-        )
-    logger.debug("Session completed: sessions/%s", session_id)
+    get_backend().complete_session(session_id, ended_at, summary, timeline=timeline)
 
 
 def emit_tick(session_id: str, payload: dict, time_since_start: int) -> str:
-    """Write a metric tick document to Firestore.
+    """Write a metric tick document.
 
     Args:
         session_id: Active session UUID.
@@ -131,27 +85,295 @@ def emit_tick(session_id: str, payload: dict, time_since_start: int) -> str:
     Returns:
         The auto-generated document ID.
     """
-    db = get_db()
-    live_data = {
-        "timeSinceStart": int(time_since_start),
-        "engagementScore": int(payload["engagementScore"]),
-    }
-    doc_ref = db.collection("sessions").document(session_id).collection("liveData").add(live_data)
-    doc_id = doc_ref[1].id
-    # logger.info("Tick emitted: sessions/%s/liveData/%s", session_id, doc_id)
-    return doc_id
+    return get_backend().emit_tick(session_id, payload, time_since_start)
+
+
+def timeline_ref(session_id: str) -> str:
+    """Collection path holding a session's tick data under the active layout."""
+    collection = get_backend().live_data_layout()["collection"]
+    return f"sessions/{session_id}/{collection}"
+
+
+def new_doc_id() -> str:
+    """Generate a 20-character Firestore-style document ID on the client."""
+    return "".join(secrets.choice(_DOC_ID_ALPHABET) for _ in range(20))
+
+
+def emit_ticks(
+    ticks: list[tuple[str, dict, int]],
+    doc_ids: list[str] | None = None,
+) -> list[str]:
+    """Write many metric ticks with batched commits instead of one RPC per tick.
+
+    On Firestore, document IDs are generated client-side, so the resulting
+    ``sessions/{id}/liveData/{docId}`` layout is identical to ``emit_tick``.
+    Lists longer than the Firestore batch limit are committed in chunks.
+
+    Args:
+        ticks: List of (session_id, payload, time_since_start) tuples.
+        doc_ids: Optional pre-assigned document IDs (one per tick). Passing
+            the same IDs again makes a retried write idempotent.
+
+    Returns:
+        The document IDs, in input order.
+    """
+    return get_backend().emit_ticks(ticks, doc_ids=doc_ids)
+
+
+def start_tick_writer(
+    max_queue: int = DEFAULT_QUEUE_SIZE,
+    batch_size: int = 1,
+    flush_interval: float = 0.0,
+) -> TickWriter:
+    """Enable asynchronous tick emission through a bounded background queue.
+
+    Once started, ``submit_tick`` returns immediately and ticks are written by
+    a worker thread. With ``batch_size > 1`` the worker commits up to that many
+    ticks per WriteBatch, flushing early once ``flush_interval`` seconds have
+    passed since the first tick of the batch. Calling this again returns the
+    running writer.
+
+    Args:
+        max_queue: Maximum number of ticks buffered in memory.
+        batch_size: Maximum ticks per batched commit (1 disables batching).
+        flush_interval: Maximum seconds a tick waits for its batch to fill.
+
+    Returns:
+        The active TickWriter.
+    """
+    global _tick_writer
+    if _tick_writer is None:
+        # Resolve emit functions at call time so tests can monkeypatch them.
+        _tick_writer = TickWriter(
+            lambda session_id, payload, tss: emit_tick(session_id, payload, tss),
+            max_queue=max_queue,
+            write_batch=lambda ticks: emit_ticks(ticks),
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+        )
+        _tick_writer.start()
+    return _tick_writer
+
+
+def start_spool(
+    path: str | Path = spool_mod.DEFAULT_SPOOL_PATH,
+    max_events: int = spool_mod.DEFAULT_MAX_EVENTS,
+    batch_size: int = 100,
+) -> Spool:
+    """Enable store-and-forward emission through a durable local spool.
+
+    Session start, ticks and session end are appended to an SQLite spool and
+    replayed to Firestore in order by a background drainer, so network
+    outages delay writes instead of raising in the session loop. Events left
+    over from a previous run are replayed first. Takes precedence over the
+    in-memory tick writer.
+
+    Args:
+        path: Spool database location.
+        max_events: Pending-event cap; the oldest ticks are dropped beyond it.
+        batch_size: Maximum consecutive ticks per batched commit.
+
+    Returns:
+        The active Spool.
+    """
+    global _spool, _drainer
+    if _spool is None:
+        _spool = Spool(path, max_events=max_events)
+        _drainer = SpoolDrainer(
+            _spool,
+            _deliver_spooled,
+            batch_size=min(batch_size, MAX_BATCH_WRITES),
+        )
+        _drainer.start()
+    return _spool
+
+
+def warm_device(device_id: str) -> None:
+    """Prefetch the device document in the background so session start is one write.
+
+    On Firestore this also opens a listener that keeps the cached document
+    fresh; other backends ignore it.
+    """
+    get_backend().warm_device(device_id)
+
+
+def update_device_live(device_id: str, live: dict | None) -> None:
+    """Write the device's current live state (``None`` clears it).
+
+    Stored as the ``live`` field of devices/{deviceId} so the dashboard can
+    read the latest score with a single document fetch.
+    """
+    get_backend().update_device_live(device_id, live)
+
+
+def start_live_publisher(min_interval: float = DEFAULT_MIN_INTERVAL) -> LivePublisher:
+    """Keep devices/{deviceId}.live up to date from submitted ticks.
+
+    Writes are made by a background thread, at most once per
+    ``min_interval`` seconds per burst, and only the newest state is written.
+    The state is cleared when the session ends. Calling this again returns
+    the running publisher.
+
+    Args:
+        min_interval: Minimum seconds between live-state writes.
+
+    Returns:
+        The active LivePublisher.
+    """
+    global _live
+    if _live is None:
+        _live = LivePublisher(
+            lambda device_id, live: update_device_live(device_id, live),
+            min_interval=min_interval,
+        )
+        _live.start()
+    return _live
+
+
+def _deliver_spooled(kind: str, bodies: list[dict]) -> None:
+    """Replay spooled events to the backend. Raises on failure so they are retried."""
+    if kind == spool_mod.TICK:
+        emit_ticks(
+            [(b["sessionId"], b["payload"], b["timeSinceStart"]) for b in bodies],
+            doc_ids=[b["docId"] for b in bodies],
+        )
+    elif kind == spool_mod.SESSION_START:
+        body = bodies[0]
+        create_session(body["sessionId"], body["deviceId"], body["startedAt"], title=body.get("title"))
+    elif kind == spool_mod.ROLLUPS:
+        body = bodies[0]
+        emit_rollups(body["sessionId"], body["rollups"])
+    elif kind == spool_mod.SESSION_END:
+        body = bodies[0]
+        complete_session(body["sessionId"], body["endedAt"], body["summary"], timeline=body.get("timeline"))
+    else:
+        logger.error("Discarding spooled event of unknown kind %r", kind)
+
+
+def submit_session_start(
+    session_id: str,
+    device_id: str,
+    started_at: str,
+    title: str | None = None,
+) -> None:
+    """Create a session via the spool if enabled, otherwise synchronously.
+
+    Args: see ``create_session``.
+    """
+    if _spool is not None:
+        _spool.append(spool_mod.SESSION_START, {
+            "sessionId": session_id,
+            "deviceId": device_id,
+            "startedAt": started_at,
+            "title": title,
+        })
+        _drainer.notify()
+    else:
+        create_session(session_id, device_id, started_at, title=title)
+
+
+def submit_tick(session_id: str, payload: dict, time_since_start: int) -> None:
+    """Emit a tick via the spool or background writer, or synchronously if neither runs.
+
+    Args:
+        session_id: Active session UUID.
+        payload: Dict conforming to metric-tick.v1 schema.
+        time_since_start: Seconds elapsed since session start.
+    """
+    if _live is not None:
+        _live.update(session_id, payload, time_since_start)
+    if _spool is not None:
+        _spool.append(spool_mod.TICK, {
+            "sessionId": session_id,
+            "payload": payload,
+            "timeSinceStart": int(time_since_start),
+            "docId": new_doc_id(),
+        })
+        _drainer.notify()
+    elif _tick_writer is not None:
+        _tick_writer.put(session_id, payload, time_since_start)
+    else:
+        emit_tick(session_id, payload, time_since_start)
+
+
+def emit_rollups(session_id: str, rollups: list[dict]) -> None:
+    """Write closed timeline rollup windows for a session.
+
+    Args:
+        session_id: Session UUID.
+        rollups: Rollup points from ``RollupAccumulator``.
+    """
+    get_backend().emit_rollups(session_id, rollups)
+
+
+def submit_rollups(session_id: str, rollups: list[dict]) -> None:
+    """Emit rollups via the spool or background writer, or synchronously.
+
+    Args: see ``emit_rollups``.
+    """
+    if not rollups:
+        return
+    if _spool is not None:
+        _spool.append(spool_mod.ROLLUPS, {"sessionId": session_id, "rollups": rollups})
+        _drainer.notify()
+    elif _tick_writer is not None:
+        _tick_writer.submit(lambda sid, windows: emit_rollups(sid, windows), session_id, rollups)
+    else:
+        emit_rollups(session_id, rollups)
+
+
+def submit_session_end(
+    session_id: str, ended_at: str, summary: dict, timeline: list[dict] | None = None
+) -> None:
+    """Complete a session after all of its ticks, via the spool if enabled.
+
+    Without a spool, queued ticks are flushed first so the timeline is
+    complete before the session document is closed.
+
+    Args: see ``complete_session``.
+    """
+    if _live is not None and summary.get("deviceId"):
+        _live.clear(summary["deviceId"])
+    if _spool is not None:
+        _spool.append(spool_mod.SESSION_END, {
+            "sessionId": session_id,
+            "endedAt": ended_at,
+            "summary": summary,
+            "timeline": timeline,
+        })
+        _drainer.notify()
+        return
+    if not flush_ticks(timeout=10):
+        logger.warning("Timed out flushing ticks for session %s", session_id)
+    complete_session(session_id, ended_at, summary, timeline=timeline)
+
+
+def flush_ticks(timeout: float | None = None) -> bool:
+    """Wait for spooled or queued events to be written. Returns False on timeout."""
+    if _drainer is not None:
+        return _drainer.flush(timeout)
+    if _tick_writer is None:
+        return True
+    return _tick_writer.flush(timeout)
+
+
+def emit_stats() -> dict | None:
+    """Return queue depth and drop counters, or None in synchronous mode."""
+    if _spool is not None:
+        return _spool.stats()
+    if _tick_writer is None:
+        return None
+    return _tick_writer.stats()
 
 
 def emit_session(session_id: str, session_data: dict) -> None:
-    """Write or update a session document in Firestore.
+    """Write or update a session document.
 
     Args:
         session_id: Session UUID.
-        session_data: Session metadata dict.
+        session_data: Session metadata dict, merged into the document.
     """
-    db = get_db()
-    db.collection("sessions").document(session_id).set(session_data, merge=True)
-    logger.debug("Session document written: sessions/%s", session_id)
+    get_backend().update_session(session_id, session_data)
 
 
 def emit_summary(session_id: str, summary: dict) -> None:
@@ -161,11 +383,9 @@ def emit_summary(session_id: str, summary: dict) -> None:
         session_id: Session UUID.
         summary: Dict conforming to session-summary.v1 schema.
     """
-    db = get_db()
-    db.collection("sessions").document(session_id).update({
+    get_backend().update_session(session_id, {
         "overallScore": float(summary.get("averageEngagement", 0)),
     })
-    logger.debug("Session summary written: sessions/%s", session_id)
 
 
 def fetch_pending_command(device_id: str) -> tuple[str, dict] | None:
@@ -177,45 +397,54 @@ def fetch_pending_command(device_id: str) -> tuple[str, dict] | None:
     Returns:
         Tuple of (command_id, command_dict) or None if no pending command.
     """
-    db = get_db()
-    cmd_ref = (
-        db.collection("devices")
-        .document(device_id)
-        .collection("commands")
-        .where("status", "==", "pending")
-        .limit(1)
-    )
-    docs = list(cmd_ref.stream())
-    if not docs:
-        return None
-    doc = docs[0]
-    return doc.id, (doc.to_dict() or {})
+    return get_backend().fetch_pending_command(device_id)
+
+
+def fetch_pending_commands(device_id: str, limit: int) -> list[tuple[str, dict]]:
+    """Fetch up to ``limit`` pending remote commands for a device, oldest first.
+
+    Returns:
+        List of (command_id, command_dict) tuples.
+    """
+    return get_backend().fetch_pending_commands(device_id, limit)
+
+
+def watch_commands(device_id: str, on_commands):
+    """Open a push listener on a device's pending remote commands.
+
+    ``on_commands`` receives a list of (command_id, command_dict) for every
+    currently pending command each time the result set changes. It runs on
+    the backend's listener thread.
+
+    Returns:
+        A handle with ``unsubscribe()`` and an ``is_active`` property.
+
+    Raises:
+        NotImplementedError: If the backend cannot push commands.
+    """
+    return get_backend().watch_commands(device_id, on_commands)
 
 
 def mark_command(device_id: str, command_id: str, status: str, message: str | None = None) -> None:
     """Mark a remote command as processed/rejected/error."""
-    db = get_db()
-    update_data = {
-        "status": status,
-        "processedAt": firestore.SERVER_TIMESTAMP,
-    }
-    if message:
-        update_data["message"] = message
-
-    (
-        db.collection("devices")
-        .document(device_id)
-        .collection("commands")
-        .document(command_id)
-        .set(update_data, merge=True)
-    )
+    get_backend().mark_command(device_id, command_id, status, message)
 
 
 def close():
-    """Clean up Firebase resources."""
-    global _app, _db
-    if _app is not None:
-        firebase_admin.delete_app(_app)
-        _app = None
-        _db = None
-        logger.info("Firebase connection closed")
+    """Flush queued events and release backend resources."""
+    global _backend, _tick_writer, _spool, _drainer, _live
+    if _live is not None:
+        _live.close()
+        _live = None
+    if _drainer is not None:
+        _drainer.stop()
+        _drainer = None
+    if _spool is not None:
+        _spool.close()
+        _spool = None
+    if _tick_writer is not None:
+        _tick_writer.close()
+        _tick_writer = None
+    if _backend is not None:
+        _backend.close()
+        _backend = None
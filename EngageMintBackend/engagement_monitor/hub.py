@@ -0,0 +1,711 @@
+"""Hub mode — several cameras and their sessions in one process.
+
+Instead of one process per camera (each loading its own interpreter and
+Firebase client), a hub runs one session loop per camera in its own thread:
+
+- ``SharedDetector`` holds the single loaded model. TFLite interpreters are
+  not thread-safe, so invokes from the camera threads are serialized on one
+  lock; each camera gets a ``CameraDetector`` view that records how long its
+  calls waited for the model and how long they ran.
+- ``Hub`` is the keyed registry of per-camera state (camera, SessionManager,
+  change gate, recorder, stop event, session thread) by device ID.
+- Every session goes through the process-wide ``emitter``, so all cameras
+  share one backend connection, tick writer (or spool) and live publisher.
+
+Usage:
+    HUB_DEVICES=room-a:0,room-b:1 python -m engagement_monitor.hub
+    python -m engagement_monitor.hub --bench --cameras 1,2,4 --seconds 5 --interval 0.5
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from engagement_monitor import emitter
+from engagement_monitor.camera import Camera
+from engagement_monitor.change_gate import FrameChangeGate
+from engagement_monitor.commands import CommandSubscriber
+from engagement_monitor.config import (
+    load_config,
+    load_inference_config,
+    load_zones_config,
+    reload_config,
+    zone_rects,
+)
+from engagement_monitor.detector import Detector
+from engagement_monitor.main import (
+    _camera_lores,
+    _change_gate,
+    _interpreter_options,
+    _pipeline_config,
+    _recorder,
+    _session_manager,
+    _start_emission,
+    run_session,
+)
+from engagement_monitor.recording import ProbabilityRecorder
+from engagement_monitor.session import SessionManager
+
+logger = logging.getLogger(__name__)
+
+# Recent calls per camera kept for the p95 latency.
+DEFAULT_LATENCY_WINDOW = 256
+DEFAULT_STATS_INTERVAL = 60.0
+FULL_FRAME_SHAPE = (480, 640)
+
+
+@dataclass
+class _CameraStats:
+    frames: int = 0
+    wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+    recent_ms: deque = field(default_factory=lambda: deque(maxlen=DEFAULT_LATENCY_WINDOW))
+
+
+class SharedDetector:
+    """One loaded ``Detector`` serving every camera of a hub."""
+
+    def __init__(self, detector: Detector):
+        """
+        Args:
+            detector: Loaded detector (seat zones, if any, apply to every camera).
+        """
+        self._detector = detector
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._cameras: dict[str, _CameraStats] = {}
+        self.reset_stats()
+
+    @property
+    def labels(self) -> list[str]:
+        """Canonical labels in model output order."""
+        return self._detector.labels
+
+    @property
+    def input_size(self) -> tuple[int, int]:
+        """Model input (height, width), used to size each camera's lores stream."""
+        return self._detector.input_size
+
+    def prepare_source(self, source_shape: tuple[int, int]) -> None:
+        """Precompute preprocessing for camera frames of (height, width).
+
+        Cameras should share one frame shape; the preprocessor is rebuilt
+        whenever consecutive frames differ.
+        """
+        with self._lock:
+            self._detector.prepare_source(source_shape)
+
+    def for_camera(self, device_id: str) -> "CameraDetector":
+        """Detector view whose calls are accounted to ``device_id``."""
+        with self._stats_lock:
+            self._cameras.setdefault(device_id, _CameraStats())
+        return CameraDetector(self, device_id)
+
+    def reset_stats(self) -> None:
+        """Zero the throughput and latency counters."""
+        with self._stats_lock:
+            self._cameras = {device_id: _CameraStats() for device_id in self._cameras}
+            self._started = time.monotonic()
+            self._busy_seconds = 0.0
+
+    def stats(self) -> dict:
+        """Model throughput and per-camera latency since the last ``reset_stats``.
+
+        ``meanMs``/``p95Ms`` are per call including the wait for the model
+        lock (``waitMeanMs``); ``modelBusy`` is the fraction of wall time the
+        interpreter was running.
+        """
+        with self._stats_lock:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            frames = sum(c.frames for c in self._cameras.values())
+            per_camera = {}
+            for device_id, c in self._cameras.items():
+                per_camera[device_id] = {
+                    "frames": c.frames,
+                    "fps": round(c.frames / elapsed, 2),
+                    "meanMs": round((c.wait_seconds + c.run_seconds) * 1000 / c.frames, 2)
+                    if c.frames
+                    else 0.0,
+                    "p95Ms": round(float(np.percentile(c.recent_ms, 95)), 2) if c.recent_ms else 0.0,
+                    "waitMeanMs": round(c.wait_seconds * 1000 / c.frames, 2) if c.frames else 0.0,
+                }
+            return {
+                "cameras": len(self._cameras),
+                "inferences": frames,
+                "inferencesPerSecond": round(frames / elapsed, 2),
+                "modelBusy": round(min(1.0, self._busy_seconds / elapsed), 3),
+                "perCamera": per_camera,
+            }
+
+    def _call(self, device_id: str, fn, *args):
+        queued = time.perf_counter()
+        with self._lock:
+            started = time.perf_counter()
+            result = fn(*args)
+            finished = time.perf_counter()
+        with self._stats_lock:
+            c = self._cameras.setdefault(device_id, _CameraStats())
+            c.frames += 1
+            c.wait_seconds += started - queued
+            c.run_seconds += finished - started
+            c.recent_ms.append((finished - queued) * 1000)
+            self._busy_seconds += finished - started
+        return result
+
+
+class CameraDetector:
+    """Per-camera view of a ``SharedDetector`` with the ``Detector`` call interface."""
+
+    def __init__(self, shared: SharedDetector, device_id: str):
+        self._shared = shared
+        self._device_id = device_id
+
+    @property
+    def labels(self) -> list[str]:
+        return self._shared.labels
+
+    @property
+    def input_size(self) -> tuple[int, int]:
+        return self._shared.input_size
+
+    def prepare_source(self, source_shape: tuple[int, int]) -> None:
+        self._shared.prepare_source(source_shape)
+
+    def predict(self, frame: np.ndarray) -> np.ndarray:
+        """(num_labels,) probability vector for ``frame``."""
+        return self._shared._call(self._device_id, self._shared._detector.predict, frame)
+
+    def predict_zones(self, frame: np.ndarray) -> np.ndarray:
+        """(zone_count, num_labels) probability matrix for ``frame``."""
+        return self._shared._call(self._device_id, self._shared._detector.predict_zones, frame)
+
+    def detect(self, frame: np.ndarray, confidence_threshold: float = 0.6) -> list[tuple[str, float]]:
+        """(behavior_label, confidence) detections above the threshold."""
+        return self._shared._detector.detections(self.predict(frame), confidence_threshold)
+
+    def detect_zones(
+        self, frame: np.ndarray, confidence_threshold: float = 0.6
+    ) -> list[list[tuple[str, float]]]:
+        """Per-zone (behavior_label, confidence) detections above the threshold."""
+        return self._shared._call(
+            self._device_id, self._shared._detector.detect_zones, frame, confidence_threshold
+        )
+
+
+@dataclass
+class HubCamera:
+    """Per-camera state held in the hub registry."""
+
+    device_id: str
+    camera: Camera
+    detector: CameraDetector
+    session_mgr: SessionManager
+    change_gate: FrameChangeGate | None = None
+    recorder: ProbabilityRecorder | None = None
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether this camera's session loop is running."""
+        return self.thread is not None and self.thread.is_alive()
+
+
+class Hub:
+    """Registry of cameras keyed by device ID, each running its own sessions.
+
+    All cameras share the ``SharedDetector`` and the process-wide emitter.
+    """
+
+    def __init__(self, detector: SharedDetector, session_options: dict | None = None):
+        """
+        Args:
+            detector: Model shared by every camera.
+            session_options: Extra ``run_session`` keyword arguments used for
+                every session (pipeline, zones, compiled_scoring, ...).
+        """
+        self._detector = detector
+        self._session_options = dict(session_options or {})
+        self._cameras: dict[str, HubCamera] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self._cameras
+
+    def __len__(self) -> int:
+        return len(self._cameras)
+
+    @property
+    def device_ids(self) -> list[str]:
+        """Registered device IDs in registration order."""
+        return list(self._cameras)
+
+    def get(self, device_id: str) -> HubCamera:
+        """Registry entry of ``device_id``.
+
+        Raises:
+            KeyError: If the device is not registered.
+        """
+        return self._cameras[device_id]
+
+    def add_camera(
+        self,
+        device_id: str,
+        camera: Camera,
+        *,
+        session_mgr: SessionManager | None = None,
+        change_gate: FrameChangeGate | None = None,
+        recorder: ProbabilityRecorder | None = None,
+    ) -> HubCamera:
+        """Register a started camera under ``device_id``.
+
+        Raises:
+            ValueError: If ``device_id`` is already registered.
+        """
+        with self._lock:
+            if device_id in self._cameras:
+                raise ValueError(f"Device {device_id} is already registered with the hub")
+            entry = HubCamera(
+                device_id=device_id,
+                camera=camera,
+                detector=self._detector.for_camera(device_id),
+                session_mgr=session_mgr or SessionManager(),
+                change_gate=change_gate,
+                recorder=recorder,
+            )
+            self._cameras[device_id] = entry
+        return entry
+
+    def start_session(self, device_id: str, config: dict, session_name: str | None = None) -> str:
+        """Start a session on one camera in its own thread.
+
+        Returns:
+            The new session ID.
+
+        Raises:
+            KeyError: If the device is not registered.
+            RuntimeError: If the device already has an active session.
+        """
+        entry = self._cameras[device_id]
+        with self._lock:
+            if entry.is_running:
+                raise RuntimeError(f"Device {device_id} already has an active session")
+            session = entry.session_mgr.start_session(device_id, session_name=session_name)
+            entry.stop_event.clear()
+            entry.thread = threading.Thread(
+                target=run_session,
+                args=(
+                    entry.session_mgr,
+                    device_id,
+                    config,
+                    entry.camera,
+                    entry.detector,
+                    entry.stop_event,
+                ),
+                kwargs={
+                    **self._session_options,
+                    "change_gate": entry.change_gate,
+                    "recorder": entry.recorder,
+                },
+                name=f"session-{device_id}",
+                daemon=True,
+            )
+            entry.thread.start()
+        return session.session_id
+
+    def end_session(self, device_id: str, timeout: float | None = 10.0) -> bool:
+        """Stop one camera's session and wait for its summary to be submitted.
+
+        Returns:
+            False if the device had no active session, or if its loop is
+            still running after ``timeout`` (it has been told to stop and
+            stays registered as running until it exits).
+
+        Raises:
+            KeyError: If the device is not registered.
+        """
+        entry = self._cameras[device_id]
+        if not entry.is_running:
+            return False
+        entry.stop_event.set()
+        entry.thread.join(timeout=timeout)
+        if entry.thread.is_alive():
+            logger.warning("Session loop for %s did not stop within %ss", device_id, timeout)
+            return False
+        entry.thread = None
+        return True
+
+    def end_all(self, timeout: float | None = 10.0) -> list[str]:
+        """Stop every active session; returns the device IDs that were running."""
+        running = [d for d, entry in self._cameras.items() if entry.is_running]
+        for device_id in running:
+            self._cameras[device_id].stop_event.set()
+        for device_id in running:
+            self.end_session(device_id, timeout=timeout)
+        return running
+
+    def active_sessions(self) -> dict[str, str]:
+        """Device ID -> session ID of every running session."""
+        return {
+            device_id: entry.session_mgr.active_session.session_id
+            for device_id, entry in self._cameras.items()
+            if entry.is_running and entry.session_mgr.active_session is not None
+        }
+
+    def stats(self) -> dict:
+        """Shared-model throughput and per-camera latency, with the active-session count."""
+        return {"activeSessions": len(self.active_sessions()), **self._detector.stats()}
+
+
+def format_stats(stats: dict) -> str:
+    """One-line throughput summary followed by one line per camera."""
+    lines = [
+        f"[HUB] {stats.get('activeSessions', 0)} active / {stats['cameras']} camera(s): "
+        f"{stats['inferencesPerSecond']} inferences/s, model busy {stats['modelBusy']:.0%}"
+    ]
+    for device_id, c in stats["perCamera"].items():
+        lines.append(
+            f"  {device_id}: {c['fps']} fps, mean {c['meanMs']} ms, p95 {c['p95Ms']} ms "
+            f"(waiting {c['waitMeanMs']} ms)"
+        )
+    return "\n".join(lines)
+
+
+def benchmark(
+    detector: Detector,
+    camera_counts=(1, 2, 4),
+    seconds: float = 5.0,
+    interval: float = 0.0,
+    frame_shape: tuple[int, int] = FULL_FRAME_SHAPE,
+) -> list[dict]:
+    """Measure shared-model throughput and per-camera latency as cameras are added.
+
+    For each count, that many threads call ``predict`` on synthetic frames
+    through one ``SharedDetector`` for ``seconds``, each waiting ``interval``
+    seconds between calls (0 saturates the model).
+
+    Returns:
+        One row per camera count with throughput and the worst per-camera latency.
+    """
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(*frame_shape, 3), dtype=np.uint8)
+    detector.prepare_source(frame_shape)
+    detector.predict(frame)  # warm-up
+
+    rows = []
+    for count in camera_counts:
+        shared = SharedDetector(detector)
+        stop = threading.Event()
+
+        def _camera(view: CameraDetector) -> None:
+            while not stop.is_set():
+                view.predict(frame)
+                if interval:
+                    stop.wait(interval)
+
+        threads = [
+            threading.Thread(target=_camera, args=(shared.for_camera(f"camera-{i}"),), daemon=True)
+            for i in range(count)
+        ]
+        shared.reset_stats()
+        for thread in threads:
+            thread.start()
+        stop.wait(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        stats = shared.stats()
+        cameras = stats["perCamera"].values()
+        rows.append(
+            {
+                "cameras": count,
+                "inferencesPerSecond": stats["inferencesPerSecond"],
+                "perCameraFps": round(stats["inferencesPerSecond"] / count, 2),
+                "modelBusy": stats["modelBusy"],
+                "meanMs": round(float(np.mean([c["meanMs"] for c in cameras])), 2),
+                "worstP95Ms": max(c["p95Ms"] for c in cameras),
+                "waitMeanMs": round(float(np.mean([c["waitMeanMs"] for c in cameras])), 2),
+            }
+        )
+    return rows
+
+
+def parse_devices(value: str) -> dict[str, int]:
+    """Parse ``"room-a:0,room-b:1"`` into device ID -> camera index.
+
+    A device without ``:index`` uses its position in the list.
+
+    Raises:
+        ValueError: If the list is empty or a device ID or camera index repeats.
+    """
+    devices: dict[str, int] = {}
+    for position, part in enumerate(p.strip() for p in value.split(",") if p.strip()):
+        device_id, _, index = part.partition(":")
+        camera_num = int(index) if index else position
+        if device_id in devices:
+            raise ValueError(f"Device {device_id} is listed twice")
+        if camera_num in devices.values():
+            raise ValueError(f"Camera {camera_num} is assigned to more than one device")
+        devices[device_id] = camera_num
+    if not devices:
+        raise ValueError("No hub devices configured")
+    return devices
+
+
+def run_hub(devices: dict[str, int]) -> None:
+    """Run one session loop per camera, sharing the model and the emitter.
+
+    Commands: ``s [deviceId]`` starts one (or every idle) camera's session,
+    ``e [deviceId]`` ends one (or every) session, ``stats`` prints
+    throughput, ``q`` quits. Remote commands are read from each device's
+    ``devices/{deviceId}/commands``.
+    """
+    config = load_config()
+    for device_id in devices:
+        emitter.warm_device(device_id)
+
+    inference = load_inference_config()
+    fast_preprocess = os.environ.get("FAST_PREPROCESS", "1" if inference["fastPreprocess"] else "0") == "1"
+    detector = Detector(**_interpreter_options(inference, fast_preprocess))
+    detector.load(source_shape=None)
+
+    zones_config = load_zones_config()
+    zones_enabled = os.environ.get("SEAT_ZONES", "1" if zones_config["enabled"] else "0") == "1"
+    camera_lores = _camera_lores(inference, zones_enabled)
+    if zones_enabled:
+        detector.set_zones(zone_rects(zones_config))
+    if os.environ.get("CASCADE_MODEL", inference.get("cascadeModelPath")):
+        # The cascade tracks the cheap model's previous label, which cannot be shared across cameras.
+        logger.warning("Cascade mode is not supported in hub mode — running the full model only")
+
+    compiled_scoring = os.environ.get("COMPILED_SCORING", "1") == "1"
+    shared = SharedDetector(detector)
+    hub = Hub(
+        shared,
+        session_options={
+            "pipeline": _pipeline_config(),
+            "zones": zones_enabled,
+            "compiled_scoring": compiled_scoring,
+            "show_indicator": False,
+        },
+    )
+    input_height, input_width = detector.input_size
+    for device_id, camera_num in devices.items():
+        camera = Camera(
+            continuous=os.environ.get("CAMERA_CONTINUOUS", "1") == "1",
+            lores_size=(input_width, input_height) if camera_lores else None,
+            camera_num=camera_num,
+        )
+        camera.start()
+        shared.prepare_source(camera.frame_shape)
+        hub.add_camera(
+            device_id,
+            camera,
+            session_mgr=_session_manager(),
+            change_gate=_change_gate(),
+            recorder=_recorder(compiled_scoring),
+        )
+    _start_emission()
+
+    stats_interval = float(os.environ.get("HUB_STATS_INTERVAL", str(DEFAULT_STATS_INTERVAL)))
+    enable_remote_commands = os.environ.get("ENABLE_REMOTE_COMMANDS", "1") == "1"
+    enable_stdin_commands = os.environ.get("ENABLE_STDIN_COMMANDS", "1") == "1"
+
+    print("=" * 60)
+    print("  Live Group Engagement Monitor — hub")
+    print("=" * 60)
+    for device_id, camera_num in devices.items():
+        print(f"  Device: {device_id} (camera {camera_num})")
+    if enable_stdin_commands:
+        print("  Commands: 's [device]' = start, 'e [device]' = end, 'stats', 'q' = quit")
+    print("=" * 60)
+
+    shutdown_event = threading.Event()
+    # Holds stdin commands (str) and remote commands ((device_id, command_id, command_dict)).
+    cmd_queue: queue.Queue[str | tuple[str, str, dict]] = queue.Queue()
+
+    def _start(device_ids: list[str], session_name: str | None = None) -> None:
+        nonlocal config
+        config, errors = reload_config()
+        if errors:
+            print(f"[WARN] Config errors (using defaults): {errors[0]}")
+        if not hub.active_sessions():
+            # Report throughput for the sessions about to run, not idle time.
+            shared.reset_stats()
+        for device_id in device_ids:
+            try:
+                session_id = hub.start_session(device_id, config, session_name=session_name)
+                print(f"[SESSION STARTED] {device_id}: {session_id}")
+            except RuntimeError as exc:
+                print(f"[WARN] {exc}")
+
+    def _targets(argument: str | None) -> list[str]:
+        if argument is None:
+            return hub.device_ids
+        if argument not in hub:
+            print(f"[WARN] Unknown device: {argument}")
+            return []
+        return [argument]
+
+    def _stdin_reader() -> None:
+        while not shutdown_event.is_set():
+            try:
+                cmd = input("\n> ").strip()
+            except EOFError:
+                cmd = "q"
+            cmd_queue.put(cmd)
+            if cmd.lower() == "q":
+                return
+
+    def _mark_command(device_id: str, cmd_id: str, status: str, message: str | None = None) -> None:
+        try:
+            emitter.mark_command(device_id, cmd_id, status, message)
+        except Exception as exc:
+            logger.warning("Could not mark command %s as %s: %s", cmd_id, status, exc)
+
+    def _handle_remote_command(device_id: str, cmd_id: str, cmd_doc: dict) -> None:
+        cmd_type = str(cmd_doc.get("type", "")).strip().lower()
+        if cmd_type in {"start", "start_session"}:
+            session_name = cmd_doc.get("sessionName")
+            _start([device_id], session_name if isinstance(session_name, str) else None)
+            _mark_command(device_id, cmd_id, "processed")
+        elif cmd_type in {"end", "stop", "end_session"}:
+            hub.end_session(device_id)
+            _mark_command(device_id, cmd_id, "processed")
+        elif cmd_type in {"shutdown", "quit"}:
+            # One room cannot shut the hub down for the others.
+            _mark_command(device_id, cmd_id, "rejected", "Shutdown is not available in hub mode")
+        else:
+            _mark_command(device_id, cmd_id, "rejected", f"Unknown command type: {cmd_type}")
+
+    def _signal_handler(signum, frame):
+        logger.info("Received %s — initiating graceful shutdown", signal.Signals(signum).name)
+        shutdown_event.set()
+
+    signal.signal(signal.SIGINT, _signal_handler)
+    signal.signal(signal.SIGTERM, _signal_handler)
+
+    if enable_stdin_commands:
+        threading.Thread(target=_stdin_reader, daemon=True).start()
+
+    subscribers: list[CommandSubscriber] = []
+    if enable_remote_commands:
+        for device_id in devices:
+            subscriber = CommandSubscriber(
+                device_id,
+                lambda cmd_id, cmd_doc, device_id=device_id: cmd_queue.put((device_id, cmd_id, cmd_doc)),
+                use_listener=os.environ.get("REMOTE_COMMANDS_MODE", "listen") != "poll",
+                poll_max=float(os.environ.get("COMMAND_POLL_MAX_SECONDS", "5")),
+            )
+            subscriber.start()
+            subscribers.append(subscriber)
+
+    next_stats = time.monotonic() + stats_interval
+    try:
+        while not shutdown_event.is_set():
+            if stats_interval > 0 and time.monotonic() >= next_stats:
+                next_stats = time.monotonic() + stats_interval
+                if hub.active_sessions():
+                    stats = hub.stats()
+                    logger.info("Hub stats: %s", stats)
+                    print(format_stats(stats))
+            try:
+                cmd = cmd_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            if isinstance(cmd, tuple):
+                _handle_remote_command(*cmd)
+                continue
+            action, _, argument = cmd.partition(" ")
+            action = action.lower()
+            argument = argument.strip() or None
+            if action == "s":
+                _start([d for d in _targets(argument) if argument or not hub.get(d).is_running])
+            elif action == "e":
+                for device_id in _targets(argument):
+                    hub.end_session(device_id)
+            elif action == "stats":
+                print(format_stats(hub.stats()))
+            elif action == "q":
+                print("[INFO] Shutting down...")
+                break
+            else:
+                print("  Commands: 's [device]', 'e [device]', 'stats', 'q'")
+    finally:
+        if hub.end_all():
+            print(format_stats(hub.stats()))
+        for subscriber in subscribers:
+            subscriber.stop()
+        for device_id in hub.device_ids:
+            hub.get(device_id).camera.stop()
+        emitter.close()
+        logger.info("Hub shutdown complete")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run several cameras and sessions in one process sharing one model and emitter."
+    )
+    parser.add_argument(
+        "--devices",
+        default=os.environ.get("HUB_DEVICES"),
+        help="Comma-separated deviceId[:cameraIndex] list (default: HUB_DEVICES)",
+    )
+    parser.add_argument(
+        "--bench", action="store_true", help="Benchmark the shared model instead of running sessions"
+    )
+    parser.add_argument("--cameras", default="1,2,4", help="Camera counts to benchmark (default: 1,2,4)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Seconds per camera count (default: 5)")
+    parser.add_argument(
+        "--interval", type=float, default=0.0, help="Seconds between a camera's frames (default: 0, saturate)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the benchmark as JSON")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        inference = load_inference_config()
+        detector = Detector(**_interpreter_options(inference, inference["fastPreprocess"]))
+        detector.load(source_shape=None)
+        rows = benchmark(
+            detector,
+            [int(c) for c in args.cameras.split(",") if c.strip()],
+            seconds=args.seconds,
+            interval=args.interval,
+        )
+        if args.json:
+            print(json.dumps(rows, indent=2))
+            return 0
+        print(f"{'cameras':>7} {'infer/s':>8} {'fps/cam':>8} {'busy':>6} {'mean ms':>8} {'p95 ms':>8} {'wait ms':>8}")
+        for r in rows:
+            print(
+                f"{r['cameras']:>7} {r['inferencesPerSecond']:>8.1f} {r['perCameraFps']:>8.1f} "
+                f"{r['modelBusy']:>6.0%} {r['meanMs']:>8.2f} {r['worstP95Ms']:>8.2f} {r['waitMeanMs']:>8.2f}"
+            )
+        return 0
+
+    try:
+        devices = parse_devices(args.devices or "")
+    except ValueError as exc:
+        print(f"Hub failed: {exc} (set HUB_DEVICES or --devices)", file=sys.stderr)
+        return 1
+    run_hub(devices)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO),
+        format="%(message)s",
+    )
+    sys.exit(main())
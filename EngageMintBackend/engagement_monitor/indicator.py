@@ -4,6 +4,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Band lower bounds shared with the session statistics (red is everything below yellow).
+GREEN_THRESHOLD = 70
+YELLOW_THRESHOLD = 40
+
 
 def show(score: int) -> None:
     """Display a single-line ANSI color-coded engagement bar.
@@ -18,9 +22,9 @@ def show(score: int) -> None:
     Args:
         score: Engagement score in [0, 100].
     """
-    if score >= 70:
+    if score >= GREEN_THRESHOLD:
         color = "\033[92m"  # bright green
-    elif score >= 40:
+    elif score >= YELLOW_THRESHOLD:
         color = "\033[93m"  # bright yellow
     else:
         color = "\033[91m"  # bright red
@@ -30,5 +34,14 @@ def show(score: int) -> None:
     empty = 20 - filled
     bar = "█" * filled + "░" * empty
 
-    logger.debug("Indicator: score=%d, color=%s", score, "green" if score >= 70 else "yellow" if score >= 40 else "red")
+    logger.debug("Indicator: score=%d, color=%s", score, band(score))
     print(f"\r{color}Engagement: [{bar}] {score:3d}/100{reset}", end="", flush=True)
+
+
+def band(score: int) -> str:
+    """Indicator band of a score: ``green``, ``yellow`` or ``red``."""
+    if score >= GREEN_THRESHOLD:
+        return "green"
+    if score >= YELLOW_THRESHOLD:
+        return "yellow"
+    return "red"
@@ -0,0 +1,140 @@
+"""Rate-limited "current live state" publisher for devices/{deviceId}.live.
+
+The dashboard polls for the device's latest score. Instead of querying the
+newest tick from a growing liveData subcollection, the device keeps a single
+``live`` field up to date. Updates are coalesced per device so at most one
+write per ``min_interval`` is made and only the newest state is written.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_WINDOW_SECONDS = 3
+
+
+class LivePublisher:
+    """Coalescing background writer for per-device live state."""
+
+    def __init__(
+        self,
+        write: Callable[[str, dict | None], object],
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        window_seconds: int = DEFAULT_WINDOW_SECONDS,
+    ):
+        """
+        Args:
+            write: Callable(device_id, live_state) performing the blocking
+                write; ``None`` clears the state.
+            min_interval: Minimum seconds between writes.
+            window_seconds: Width of the rolling-average window in seconds
+                of session time.
+        """
+        self._write = write
+        self._min_interval = max(0.0, float(min_interval))
+        self._window_seconds = max(1, int(window_seconds))
+        self._cond = threading.Condition()
+        self._pending: dict[str, dict | None] = {}
+        self._urgent = False
+        self._windows: dict[str, deque] = {}
+        self._stop = False
+        self._thread: threading.Thread | None = None
+        self._last_write = 0.0
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the publisher thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="live-publisher", daemon=True)
+        self._thread.start()
+
+    def update(self, session_id: str, payload: dict, time_since_start: int) -> None:
+        """Fold a tick into the device's live state and schedule a write.
+
+        Args:
+            session_id: Active session UUID.
+            payload: metric-tick.v1 payload (deviceId, timestamp, engagementScore).
+            time_since_start: Seconds elapsed since session start.
+        """
+        device_id = str(payload["deviceId"])
+        score = int(payload["engagementScore"])
+        tss = int(time_since_start)
+        with self._cond:
+            window = self._windows.setdefault(device_id, deque())
+            window.append((tss, score))
+            while window and tss - window[0][0] >= self._window_seconds:
+                window.popleft()
+            state = {
+                "sessionId": session_id,
+                "engagementScore": score,
+                "timestamp": payload.get("timestamp"),
+                "timeSinceStart": tss,
+                "rollingAverage": round(sum(s for _, s in window) / len(window), 2),
+            }
+            if payload.get("rolling"):
+                state["rolling"] = payload["rolling"]
+            if self._pending.get(device_id) is not None:
+                self.coalesced += 1
+            self._pending[device_id] = state
+            self._cond.notify()
+
+    def clear(self, device_id: str) -> None:
+        """Clear the device's live state, bypassing the rate limit."""
+        with self._cond:
+            self._windows.pop(str(device_id), None)
+            self._pending[str(device_id)] = None
+            self._urgent = True
+            self._cond.notify()
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Write any pending state and stop the thread."""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        """Return a snapshot of write counters."""
+        return {"written": self.written, "coalesced": self.coalesced, "failed": self.failed}
+
+    def _take(self) -> dict[str, dict | None] | None:
+        with self._cond:
+            while not self._pending and not self._stop:
+                self._cond.wait()
+            while not self._stop and not self._urgent:
+                remaining = self._last_write + self._min_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if not self._pending:
+                return None
+            pending, self._pending = self._pending, {}
+            self._urgent = False
+            return pending
+
+    def _run(self) -> None:
+        while True:
+            pending = self._take()
+            if pending is None:
+                return
+            self._last_write = time.monotonic()
+            for device_id, state in pending.items():
+                try:
+                    self._write(device_id, state)
+                    self.written += 1
+                except Exception as exc:
+                    # The next tick supersedes this state, so it is not retried.
+                    self.failed += 1
+                    logger.warning("Live state write for device %s failed (%s)", device_id, exc)
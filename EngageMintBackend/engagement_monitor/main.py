@@ -7,14 +7,34 @@ import signal
 import sys
 import threading
 import time
-from datetime import datetime, timezone
+from datetime import datetime
 
-from engagement_monitor import emitter, indicator
+import numpy as np
+
+from engagement_monitor import emitter, indicator, spool
 from engagement_monitor.camera import Camera
-from engagement_monitor.config import load_config, reload_config
-from engagement_monitor.detector import Detector
+from engagement_monitor.cascade import DEFAULT_ESCALATION_THRESHOLD, CascadeDetector
+from engagement_monitor.change_gate import (
+    DEFAULT_MAX_STALE_SECONDS,
+    DEFAULT_THRESHOLD,
+    FrameChangeGate,
+)
+from engagement_monitor.commands import CommandSubscriber
+from engagement_monitor.config import (
+    load_config,
+    load_inference_config,
+    load_zones_config,
+    reload_config,
+    zone_rects,
+)
+from engagement_monitor.detector import Detector, log_state, log_zone_states
+from engagement_monitor.downsample import DEFAULT_TIMELINE_POINTS
+from engagement_monitor.pipeline import DROP_OLDEST, PipelineConfig, run_pipeline
+from engagement_monitor.recording import DEFAULT_RECORDINGS_DIR, ProbabilityRecorder
+from engagement_monitor.rolling import DEFAULT_WINDOWS
+from engagement_monitor.rollups import parse_resolutions
 from engagement_monitor.schemas import build_summary_payload, build_tick_payload
-from engagement_monitor.scorer import compute_score
+from engagement_monitor.scorer import ScoringPlan, compute_score
 from engagement_monitor.session import SessionManager
 
 logger = logging.getLogger(__name__)
@@ -25,8 +45,14 @@ def run_session(
     device_id: str,
     config: dict,
     camera: Camera,
-    detector: Detector,
+    detector: Detector | CascadeDetector,
     stop_event: threading.Event,
+    pipeline: PipelineConfig | None = None,
+    zones: bool = False,
+    change_gate: FrameChangeGate | None = None,
+    compiled_scoring: bool = False,
+    recorder: ProbabilityRecorder | None = None,
+    show_indicator: bool = True,
 ) -> dict:
     """Run a single engagement monitoring session with tick loop.
 
@@ -35,14 +61,30 @@ def run_session(
     emits tick payloads to Firestore, and updates the terminal indicator.
 
     The loop runs until ``stop_event`` is set (e.g. by the 'e' command).
+    With ``pipeline`` set, capture and inference run on their own threads
+    (see ``engagement_monitor.pipeline``) instead of strictly in sequence.
+    With ``zones`` set, each frame's seat zones are classified in one batched
+    invoke and the detections of every zone are scored together. With
+    ``change_gate`` set, frames of an unchanged scene reuse the previous
+    inference result instead of invoking the model. With ``compiled_scoring``
+    set, a ``ScoringPlan`` compiled at session start scores the detector's
+    raw probability output instead of ``compute_score`` on detections, and
+    ``recorder`` (if given) keeps every tick's probabilities for re-scoring.
+    Hub mode runs several sessions side by side with ``show_indicator`` off.
 
     Args:
         session_mgr: SessionManager with an active session.
         device_id: Identifier of this device.
         config: Weight configuration dict.
         camera: Initialized Camera instance.
-        detector: Loaded Detector instance.
+        detector: Loaded Detector (or CascadeDetector) instance.
         stop_event: Threading event — set to signal session end.
+        pipeline: Optional staged-pipeline configuration.
+        zones: Score the detector's seat zones instead of the whole frame.
+        change_gate: Optional gate that skips inference on static scenes.
+        compiled_scoring: Score probability vectors with a ``ScoringPlan``.
+        recorder: Optional per-tick probability recorder (compiled scoring only).
+        show_indicator: Redraw the terminal engagement bar on every tick.
 
     Returns:
         The session summary payload dict.
@@ -52,8 +94,8 @@ def run_session(
     tick_interval = config.get("tickIntervalSeconds", 5)
     confidence_threshold = config.get("confidenceThreshold", 0.6)
 
-    # Create session document in Firestore
-    emitter.create_session(
+    # Create session document in Firestore (spooled when offline buffering is on)
+    emitter.submit_session_start(
         session_id,
         device_id,
         session.started_at.isoformat(),
@@ -65,45 +107,104 @@ def run_session(
     print(f"  Device: {device_id} | Tick interval: {tick_interval}s")
     print("  Press 'e' + Enter to end session, 'q' + Enter to quit\n")
 
-    while not stop_event.is_set():
-        tick_start = time.monotonic()
-        tick_timestamp = datetime.now(timezone.utc)
-
-        # 1. Capture frame
-        frame = camera.capture_frame()
-
-        # 2. Detect behaviors
-        detections = detector.detect(frame, confidence_threshold)
+    plan = ScoringPlan.compile(config, detector.labels) if compiled_scoring else None
+    if recorder is not None and plan is not None:
+        recorder.start(
+            session_id, device_id, detector.labels, config, session.started_at.isoformat()
+        )
+    # Detections, or with compiled scoring the raw probabilities.
+    last_result: list[tuple[str, float]] | np.ndarray = []
+    if change_gate is not None:
+        change_gate.reset()
+    if isinstance(detector, CascadeDetector):
+        detector.reset()
+
+    def _detect(frame) -> list[tuple[str, float]] | np.ndarray:
+        nonlocal last_result
+        if change_gate is not None and not change_gate.should_infer(frame):
+            return last_result
+        if plan is not None:
+            # Scoring reads the probabilities directly; log the top-1 state so
+            # the per-tick line matches the threshold path.
+            if zones:
+                last_result = detector.predict_zones(frame)
+                log_zone_states(last_result, detector.labels, confidence_threshold)
+            else:
+                last_result = detector.predict(frame)
+                log_state(last_result, detector.labels, confidence_threshold)
+        elif not zones:
+            last_result = detector.detect(frame, confidence_threshold)
+        else:
+            last_result = [
+                d for zone in detector.detect_zones(frame, confidence_threshold) for d in zone
+            ]
+        return last_result
 
+    def _process(tick_timestamp: datetime, result: list[tuple[str, float]] | np.ndarray) -> None:
         # 3. Compute engagement score
-        score = compute_score(detections, config)
+        score = plan.score(result) if plan is not None else compute_score(result, config)
+
+        # 4. Record tick in session manager (statistics, rollups, rolling windows)
+        time_since_start = int((tick_timestamp - session.started_at).total_seconds())
+        closed_rollups = session_mgr.record_tick(score, time_since_start)
+        if recorder is not None and plan is not None:
+            recorder.add(time_since_start, result, score)
 
-        # 4. Build tick payload
+        # 5. Build tick payload, carrying the rolling metrics that include this tick
         payload = build_tick_payload(
             device_id=device_id,
             session_id=session_id,
             engagement_score=score,
             timestamp=tick_timestamp,
+            rolling=session_mgr.rolling,
         )
 
-        # 5. Emit to Firestore
-        time_since_start = int((tick_timestamp - session.started_at).total_seconds())
-        emitter.emit_tick(session_id, payload, time_since_start)
-
-        # 6. Record tick in session manager
-        session_mgr.record_tick(score)
+        # 6. Emit to Firestore (queued when the background writer is running),
+        #    then flush any rollup windows the tick closed
+        emitter.submit_tick(session_id, payload, time_since_start)
+        emitter.submit_rollups(session_id, closed_rollups)
 
         # 7. Update terminal indicator
-        indicator.show(score)
+        if show_indicator:
+            indicator.show(score)
+
+    if pipeline is not None:
+        # 1-2. Capture and inference run on their own threads
+        run_pipeline(
+            camera.capture_latest,
+            _detect,
+            _process,
+            tick_interval,
+            stop_event,
+            pipeline,
+        )
+    else:
+        last_sequence = None
+        while not stop_event.is_set():
+            tick_start = time.monotonic()
+
+            # 1. Capture frame; the tick is stamped with its capture time.
+            #    A frame already scored (no new one from the camera yet) is skipped.
+            captured = camera.capture_latest()
+            if captured.sequence != last_sequence:
+                last_sequence = captured.sequence
+
+                # 2. Detect behaviors
+                detections = _detect(captured.array)
+
+                # 3-7. Score, emit, record and display
+                _process(captured.timestamp, detections)
 
-        # Wait for remaining tick interval, but check stop_event frequently
-        elapsed = time.monotonic() - tick_start
-        sleep_time = max(0, tick_interval - elapsed)
-        if sleep_time > 0:
-            stop_event.wait(timeout=sleep_time)
+            # Wait for remaining tick interval, but check stop_event frequently
+            elapsed = time.monotonic() - tick_start
+            sleep_time = max(0, tick_interval - elapsed)
+            if sleep_time > 0:
+                stop_event.wait(timeout=sleep_time)
 
     # End session via SessionManager — computes summary stats
     summary = session_mgr.end_session()
+    if recorder is not None:
+        recorder.finish(summary.ended_at.isoformat())
 
     # Build summary payload
     summary_payload = build_summary_payload(
@@ -114,19 +215,138 @@ def run_session(
         duration_seconds=summary.duration_seconds,
         average_engagement=summary.average_engagement,
         tick_count=summary.tick_count,
-        timeline_ref=summary.timeline_ref,
+        timeline_ref=emitter.timeline_ref(summary.session_id),
+        statistics=summary.statistics,
     )
 
-    # Write completion to Firestore
-    emitter.complete_session(session_id, summary.ended_at.isoformat(), summary_payload)
+    # Flush the partial rollup windows, then write completion — ordered
+    # after every tick of this session
+    emitter.submit_rollups(session_id, summary.final_rollups)
+    emitter.submit_session_end(
+        session_id,
+        summary.ended_at.isoformat(),
+        summary_payload,
+        timeline=summary.timeline_preview,
+    )
+
+    emit_stats = emitter.emit_stats()
+    if emit_stats is not None:
+        logger.info("Emit stats: %s", emit_stats)
+        if emit_stats["dropped"]:
+            print(f"[WARN] Emit queue has dropped {emit_stats['dropped']} tick(s) since startup")
+        if emit_stats["queueDepth"]:
+            print(f"[INFO] {emit_stats['queueDepth']} event(s) waiting to upload")
 
     print(f"\n\n[SESSION ENDED] {session_id}")
     print(f"  Duration: {summary.duration_seconds}s | Ticks: {summary.tick_count}")
     print(f"  Average Engagement: {summary.average_engagement:.1f}/100")
+    if isinstance(detector, CascadeDetector):
+        cascade_stats = detector.stats()
+        logger.info("Cascade stats: %s", cascade_stats)
+        print(
+            f"  Full model ran on {cascade_stats['escalations']}/{cascade_stats['frames']} frame(s) "
+            f"({cascade_stats['escalationRate']:.0%}); cheap {cascade_stats['cheapMeanMs']} ms, "
+            f"full {cascade_stats['fullMeanMs']} ms"
+        )
+    if change_gate is not None:
+        gate_stats = change_gate.stats()
+        logger.info("Change gate stats: %s", gate_stats)
+        print(
+            f"  Inference skipped on {gate_stats['hits']} static frame(s) "
+            f"({gate_stats['hitRate']:.0%})"
+        )
 
     return summary_payload
 
 
+def _interpreter_options(inference: dict, fast_preprocess: bool) -> dict:
+    """Detector keyword arguments from config/inference.json with env-var overrides."""
+    return {
+        "fast_preprocess": fast_preprocess,
+        "num_threads": int(os.environ.get("NUM_THREADS", str(inference["numThreads"]))),
+        "delegate": os.environ.get("TFLITE_DELEGATE", inference["delegate"]),
+        "external_delegate_path": os.environ.get(
+            "TFLITE_EXTERNAL_DELEGATE", inference.get("externalDelegatePath")
+        ),
+    }
+
+
+def _change_gate() -> FrameChangeGate | None:
+    """A frame-change gate when CHANGE_GATE=1 (stateful — one per camera)."""
+    if os.environ.get("CHANGE_GATE", "0") != "1":
+        return None
+    return FrameChangeGate(
+        threshold=float(os.environ.get("CHANGE_GATE_THRESHOLD", str(DEFAULT_THRESHOLD))),
+        max_stale_seconds=float(
+            os.environ.get("CHANGE_GATE_MAX_STALE_SECONDS", str(DEFAULT_MAX_STALE_SECONDS))
+        ),
+    )
+
+
+def _recorder(compiled_scoring: bool) -> ProbabilityRecorder | None:
+    """A probability recorder when RECORD_PROBABILITIES=1 (one per concurrent session)."""
+    if not compiled_scoring or os.environ.get("RECORD_PROBABILITIES", "1") != "1":
+        return None
+    return ProbabilityRecorder(os.environ.get("RECORDINGS_DIR") or DEFAULT_RECORDINGS_DIR)
+
+
+def _session_manager() -> SessionManager:
+    """SessionManager with rollup, timeline-preview and rolling-window settings from env."""
+    return SessionManager(
+        rollup_resolutions=parse_resolutions(os.environ.get("ROLLUP_RESOLUTIONS")),
+        timeline_points=int(os.environ.get("TIMELINE_PREVIEW_POINTS", str(DEFAULT_TIMELINE_POINTS))),
+        rolling_windows=parse_resolutions(os.environ.get("ROLLING_WINDOWS"), DEFAULT_WINDOWS),
+    )
+
+
+def _start_emission() -> None:
+    """Start background emission and the live-state publisher as configured by env vars."""
+    # Background tick emission keeps Firestore latency out of the tick budget.
+    # The durable spool additionally survives network outages and restarts.
+    if os.environ.get("EMIT_SPOOL", "0") == "1":
+        emitter.start_spool(
+            path=os.environ.get("EMIT_SPOOL_PATH") or spool.DEFAULT_SPOOL_PATH,
+            max_events=int(os.environ.get("EMIT_SPOOL_MAX_EVENTS", str(spool.DEFAULT_MAX_EVENTS))),
+            batch_size=int(os.environ.get("EMIT_BATCH_SIZE", "10")),
+        )
+    elif os.environ.get("ASYNC_EMIT", "1") == "1":
+        emitter.start_tick_writer(
+            max_queue=int(os.environ.get("EMIT_QUEUE_SIZE", "256")),
+            batch_size=int(os.environ.get("EMIT_BATCH_SIZE", "10")),
+            flush_interval=int(os.environ.get("EMIT_FLUSH_MS", "2000")) / 1000,
+        )
+
+    # devices/{deviceId}.live lets the dashboard read the latest score in one fetch.
+    if os.environ.get("LIVE_STATE", "1") == "1":
+        emitter.start_live_publisher(
+            min_interval=int(os.environ.get("LIVE_STATE_INTERVAL_MS", "1000")) / 1000,
+        )
+
+
+def _camera_lores(inference: dict, zones_enabled: bool) -> bool:
+    """Whether the camera should deliver ISP-scaled lores frames (CAMERA_LORES).
+
+    Seat zones are cropped from the 640x480 main stream instead: cropped out
+    of a frame already scaled to the model input, each zone would be upscaled
+    from a fraction of it.
+    """
+    lores = os.environ.get("CAMERA_LORES", "1" if inference["cameraLores"] else "0") == "1"
+    if lores and zones_enabled:
+        logger.info("Seat zones enabled — cropping them from the main stream instead of lores")
+        return False
+    return lores
+
+
+def _pipeline_config() -> PipelineConfig | None:
+    """Staged-pipeline settings when PIPELINE=1."""
+    if os.environ.get("PIPELINE", "0") != "1":
+        return None
+    return PipelineConfig(
+        queue_size=int(os.environ.get("PIPELINE_QUEUE_SIZE", "1")),
+        backpressure=os.environ.get("PIPELINE_BACKPRESSURE", DROP_OLDEST),
+    )
+
+
 def main(device_id: str) -> None:
     """Main application loop — handles session start/end via keyboard input.
 
@@ -137,18 +357,82 @@ def main(device_id: str) -> None:
     config = load_config()
     logger.info("Config loaded: %s", {k: v for k, v in config.items()})
 
+    # Fetch the device document (owner mapping) while the camera and model load,
+    # so a session start is a single batched write.
+    emitter.warm_device(device_id)
+
+    # Interpreter threads/delegate and input path come from config/inference.json
+    # (written by `python -m engagement_monitor.autotune`); env vars override it.
+    inference = load_inference_config()
+    fast_preprocess = os.environ.get("FAST_PREPROCESS", "1" if inference["fastPreprocess"] else "0") == "1"
+
+    # Seat-zone tiling (config/zones.json): classify N regions per frame in one
+    # batched invoke so small students at the back are not lost in the resize.
+    zones_config = load_zones_config()
+    zones_enabled = os.environ.get("SEAT_ZONES", "1" if zones_config["enabled"] else "0") == "1"
+    camera_lores = _camera_lores(inference, zones_enabled)
+
+    # Load detector first so the camera can deliver frames at the model input size
+    interpreter_options = _interpreter_options(inference, fast_preprocess)
+    detector = Detector(**interpreter_options)
+    detector.load(source_shape=None)
+
     # Initialize camera
-    camera = Camera()
+    # CAMERA_CONTINUOUS=1 keeps the freshest frame buffered so ticks never wait on the sensor.
+    # CAMERA_LORES=1 has the ISP scale a lores stream to the model input size
+    # (unless seat zones need the full-resolution frame).
+    input_height, input_width = detector.input_size
+    camera = Camera(
+        continuous=os.environ.get("CAMERA_CONTINUOUS", "1") == "1",
+        lores_size=(input_width, input_height) if camera_lores else None,
+    )
     camera.start()
+    detector.prepare_source(camera.frame_shape)
+    if zones_enabled:
+        detector.set_zones(zone_rects(zones_config))
+
+    # A cascade model (CASCADE_MODEL or cascadeModelPath) runs on every frame and
+    # escalates to the full model only when uncertain or when the label changes.
+    cascade_model = os.environ.get("CASCADE_MODEL", inference.get("cascadeModelPath"))
+    if cascade_model and zones_enabled:
+        logger.warning("Cascade mode does not support seat zones — running the full model only")
+    elif cascade_model:
+        cheap = Detector(model_path=cascade_model, **interpreter_options)
+        cheap.load(source_shape=camera.frame_shape)
+        detector = CascadeDetector(
+            cheap,
+            detector,
+            escalation_threshold=float(
+                os.environ.get(
+                    "CASCADE_THRESHOLD",
+                    str(inference.get("cascadeEscalationThreshold", DEFAULT_ESCALATION_THRESHOLD)),
+                )
+            ),
+        )
+
+    # CHANGE_GATE=1 reuses the last inference while the scene is static
+    # (mean luma difference below the threshold, at most max-stale seconds).
+    change_gate = _change_gate()
+
+    # COMPILED_SCORING=1 scores the raw softmax with a per-session ScoringPlan
+    # (identical to compute_score in threshold mode; required for expectation mode).
+    compiled_scoring = os.environ.get("COMPILED_SCORING", "1") == "1"
 
-    # Load detector
-    detector = Detector()
-    detector.load()
+    # RECORD_PROBABILITIES=1 keeps each tick's probabilities (float16) per session
+    # for `python -m engagement_monitor.rescore`.
+    recorder = _recorder(compiled_scoring)
 
-    # Session manager — enforces single-session-at-a-time
-    session_mgr = SessionManager()
+    # Session manager — enforces single-session-at-a-time, keeps rollups and rolling windows
+    session_mgr = _session_manager()
 
-    # Remote command polling is enabled by default for frontend-triggered start/end.
+    # Background tick emission (or the durable spool) and the live-state publisher
+    _start_emission()
+
+    # PIPELINE=1 overlaps capture, inference and scoring/emission.
+    pipeline = _pipeline_config()
+
+    # Remote commands are enabled by default for frontend-triggered start/end.
+    # A snapshot listener pushes them; REMOTE_COMMANDS_MODE=poll forces polling.
     enable_remote_commands = os.environ.get("ENABLE_REMOTE_COMMANDS", "1") == "1"
     enable_stdin_commands = os.environ.get("ENABLE_STDIN_COMMANDS", "1") == "1"
 
@@ -165,7 +449,8 @@ def main(device_id: str) -> None:
     session_thread: threading.Thread | None = None
     stop_event = threading.Event()
     shutdown_event = threading.Event()
-    cmd_queue: queue.Queue[str] = queue.Queue()
+    # Holds stdin commands (str) and remote commands ((command_id, command_dict)).
+    cmd_queue: queue.Queue[str | tuple[str, dict]] = queue.Queue()
 
     def _start_session(session_name: str | None = None) -> None:
         nonlocal session_thread, config
@@ -191,6 +476,13 @@ def main(device_id: str) -> None:
         session_thread = threading.Thread(
             target=run_session,
             args=(session_mgr, device_id, config, camera, detector, stop_event),
+            kwargs={
+                "pipeline": pipeline,
+                "zones": zones_enabled,
+                "change_gate": change_gate,
+                "compiled_scoring": compiled_scoring,
+                "recorder": recorder,
+            },
             daemon=True,
         )
         session_thread.start()
@@ -214,6 +506,31 @@ def main(device_id: str) -> None:
             if cmd == "q":
                 return
 
+    def _mark_command(cmd_id: str, status: str, message: str | None = None) -> None:
+        try:
+            emitter.mark_command(device_id, cmd_id, status, message)
+        except Exception as exc:
+            logger.warning("Could not mark command %s as %s: %s", cmd_id, status, exc)
+
+    def _handle_remote_command(cmd_id: str, cmd_doc: dict) -> None:
+        cmd_type = str(cmd_doc.get("type", "")).strip().lower()
+        if cmd_type in {"start", "start_session"}:
+            command_session_name = cmd_doc.get("sessionName")
+            _start_session(
+                session_name=command_session_name
+                if isinstance(command_session_name, str)
+                else None
+            )
+            _mark_command(cmd_id, "processed")
+        elif cmd_type in {"end", "stop", "end_session"}:
+            _end_session()
+            _mark_command(cmd_id, "processed")
+        elif cmd_type in {"shutdown", "quit"}:
+            _mark_command(cmd_id, "processed")
+            cmd_queue.put("q")
+        else:
+            _mark_command(cmd_id, "rejected", f"Unknown command type: {cmd_type}")
+
     def _signal_handler(signum, frame):
         """Handle SIGINT/SIGTERM for graceful shutdown."""
         sig_name = signal.Signals(signum).name
@@ -228,41 +545,27 @@ def main(device_id: str) -> None:
     if enable_stdin_commands:
         threading.Thread(target=_stdin_reader, daemon=True).start()
 
+    command_subscriber: CommandSubscriber | None = None
+    if enable_remote_commands:
+        command_subscriber = CommandSubscriber(
+            device_id,
+            lambda cmd_id, cmd_doc: cmd_queue.put((cmd_id, cmd_doc)),
+            use_listener=os.environ.get("REMOTE_COMMANDS_MODE", "listen") != "poll",
+            poll_max=float(os.environ.get("COMMAND_POLL_MAX_SECONDS", "5")),
+        )
+        command_subscriber.start()
+
     try:
         while not shutdown_event.is_set():
-            if enable_remote_commands:
-                pending = emitter.fetch_pending_command(device_id)
-                if pending is not None:
-                    cmd_id, cmd_doc = pending
-                    cmd_type = str(cmd_doc.get("type", "")).strip().lower()
-                    if cmd_type in {"start", "start_session"}:
-                        command_session_name = cmd_doc.get("sessionName")
-                        _start_session(
-                            session_name=command_session_name
-                            if isinstance(command_session_name, str)
-                            else None
-                        )
-                        emitter.mark_command(device_id, cmd_id, "processed")
-                    elif cmd_type in {"end", "stop", "end_session"}:
-                        _end_session()
-                        emitter.mark_command(device_id, cmd_id, "processed")
-                    elif cmd_type in {"shutdown", "quit"}:
-                        emitter.mark_command(device_id, cmd_id, "processed")
-                        cmd_queue.put("q")
-                    else:
-                        emitter.mark_command(
-                            device_id,
-                            cmd_id,
-                            "rejected",
-                            f"Unknown command type: {cmd_type}",
-                        )
-
             try:
                 cmd = cmd_queue.get(timeout=0.5)
             except queue.Empty:
                 continue
 
-            if cmd == "s":
+            if isinstance(cmd, tuple):
+                _handle_remote_command(*cmd)
+
+            elif cmd == "s":
                 _start_session()
 
             elif cmd == "e":
@@ -291,6 +594,8 @@ def main(device_id: str) -> None:
             logger.info("Cleaning up active session on shutdown")
             stop_event.set()
             session_thread.join(timeout=10)
+        if command_subscriber is not None:
+            command_subscriber.stop()
         camera.stop()
         emitter.close()
         logger.info("Shutdown complete")
@@ -0,0 +1,208 @@
+"""Staged capture → inference → scoring pipeline for the session tick loop.
+
+Capture and inference each run on their own thread and hand work forward
+through small bounded queues, so the camera grabs the next frame while the
+model runs and the model runs while the previous tick is scored and emitted.
+Scoring/emission stays on the caller's thread.
+
+Backpressure decides what happens when a downstream stage is slower:
+``drop_oldest`` replaces the stale item with the fresh one (lowest latency,
+ticks may be skipped), ``block`` makes the upstream stage wait (every
+captured frame is scored, the tick rate follows the slowest stage).
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from engagement_monitor.camera import CapturedFrame
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+_POLL_SECONDS = 0.05
+
+
+@dataclass
+class PipelineConfig:
+    """Pipeline tuning: handoff queue size (1–2 is plenty) and backpressure policy."""
+
+    queue_size: int = 1
+    backpressure: str = DROP_OLDEST
+
+    def __post_init__(self) -> None:
+        if self.backpressure not in (DROP_OLDEST, BLOCK):
+            raise ValueError(
+                f"Unknown backpressure policy: {self.backpressure!r} (expected {DROP_OLDEST} or {BLOCK})"
+            )
+        self.queue_size = max(1, int(self.queue_size))
+
+
+class Handoff:
+    """Bounded queue between two stages with a backpressure policy."""
+
+    def __init__(self, maxsize: int = 1, backpressure: str = DROP_OLDEST):
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(maxsize)))
+        self._backpressure = backpressure
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def put(self, item, stop_event: threading.Event) -> bool:
+        """Hand ``item`` downstream.
+
+        Returns:
+            False if ``block`` backpressure gave up because of ``stop_event``.
+        """
+        if self._backpressure == BLOCK:
+            while True:
+                try:
+                    self._queue.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    if stop_event.is_set():
+                        return False
+        with self._lock:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    return True
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def get(self, timeout: float = _POLL_SECONDS):
+        """Return the next item, or None if nothing arrived within ``timeout``."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def empty(self) -> bool:
+        """Whether nothing is waiting."""
+        return self._queue.empty()
+
+
+def run_pipeline(
+    capture: Callable[[], CapturedFrame],
+    detect: Callable[[object], list[tuple[str, float]]],
+    on_detections: Callable[[datetime, list[tuple[str, float]]], None],
+    tick_interval: float,
+    stop_event: threading.Event,
+    config: PipelineConfig | None = None,
+) -> dict:
+    """Run capture, inference and ``on_detections`` concurrently until stopped.
+
+    Frames are captured on a fixed schedule of ``tick_interval`` seconds (a
+    stage that overruns shifts the schedule instead of bursting to catch up).
+    A frame whose sequence number was already captured (the camera has not
+    produced a new one yet) is not handed on, so no frame is scored twice.
+    Results already inferred when ``stop_event`` is set are still delivered.
+
+    Args:
+        capture: Returns the latest frame with its capture timestamp and
+            sequence number (``Camera.capture_latest``).
+        detect: Returns the detections for a frame.
+        on_detections: Called on the caller's thread with (capture
+            timestamp, detections) for every inferred frame, in order.
+        tick_interval: Target seconds between captures.
+        stop_event: Set to end the pipeline.
+        config: Queue size and backpressure policy.
+
+    Returns:
+        Stage counters: captured, repeated (skipped as already captured),
+        inferred, processed and dropped frames.
+
+    Raises:
+        Exception: The first error raised by the capture or inference stage.
+    """
+    config = config or PipelineConfig()
+    frames = Handoff(config.queue_size, config.backpressure)
+    results = Handoff(config.queue_size, config.backpressure)
+    errors: list[BaseException] = []
+    counts = {"captured": 0, "repeated": 0, "inferred": 0, "processed": 0}
+    # Set when the pipeline is torn down abnormally, so no stage waits forever.
+    abort = threading.Event()
+
+    def _fail(exc: BaseException) -> None:
+        errors.append(exc)
+        abort.set()
+        stop_event.set()
+
+    def _capture_stage() -> None:
+        next_at = time.monotonic()
+        last_sequence = None
+        try:
+            while not stop_event.is_set():
+                captured = capture()
+                if captured.sequence == last_sequence:
+                    counts["repeated"] += 1
+                else:
+                    last_sequence = captured.sequence
+                    counts["captured"] += 1
+                    if not frames.put((captured.timestamp, captured.array), stop_event):
+                        return
+                next_at += tick_interval
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    stop_event.wait(timeout=delay)
+                else:
+                    next_at = time.monotonic()
+        except Exception as exc:
+            logger.exception("Capture stage failed")
+            _fail(exc)
+
+    def _inference_stage() -> None:
+        try:
+            while not stop_event.is_set():
+                item = frames.get()
+                if item is None:
+                    continue
+                timestamp, frame = item
+                detections = detect(frame)
+                counts["inferred"] += 1
+                # Deliver even if the stop arrived mid-inference.
+                results.put((timestamp, detections), abort)
+        except Exception as exc:
+            logger.exception("Inference stage failed")
+            _fail(exc)
+
+    threads = [
+        threading.Thread(target=_capture_stage, name="pipeline-capture", daemon=True),
+        threading.Thread(target=_inference_stage, name="pipeline-inference", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    inference = threads[1]
+    try:
+        while not errors:
+            item = results.get()
+            if item is None:
+                if stop_event.is_set() and not inference.is_alive() and results.empty():
+                    break
+                continue
+            on_detections(*item)
+            counts["processed"] += 1
+    except BaseException:
+        abort.set()
+        stop_event.set()
+        raise
+    finally:
+        for thread in threads:
+            thread.join(timeout=5)
+
+    if errors:
+        raise errors[0]
+
+    stats = {**counts, "dropped": frames.dropped + results.dropped}
+    logger.info("Pipeline stopped: %s", stats)
+    return stats
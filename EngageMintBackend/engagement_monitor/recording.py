@@ -0,0 +1,122 @@
+"""Per-tick probability recordings for offline re-scoring.
+
+``ProbabilityRecorder`` keeps every tick's model output for the active
+session as float16 rows in a preallocated buffer that doubles when full,
+and at session end writes one compressed ``recordings/{sessionId}.npz``:
+
+    probabilities    (rows, labels) float16 — one row per tick, or one per
+                     seat zone when zones are scored together
+    rows_per_tick    (ticks,) int16 — rows belonging to each tick
+    time_since_start (ticks,) int32 — seconds since session start
+    scores           (ticks,) uint8 — the score emitted for the tick
+    labels           (labels,) str — model output order
+    meta             JSON string — session/device ids, start/end, weights
+
+An hour at 0.5 s ticks with 8 labels is about 115 KB before compression.
+``python -m engagement_monitor.rescore`` reads these files.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECORDINGS_DIR = Path(__file__).resolve().parent.parent / "recordings"
+
+_INITIAL_TICKS = 1024
+
+
+class _Growable:
+    """Append-only array with amortized O(1) appends."""
+
+    def __init__(self, row_shape: tuple[int, ...], dtype, capacity: int = _INITIAL_TICKS):
+        self._data = np.empty((capacity, *row_shape), dtype=dtype)
+        self._size = 0
+
+    def extend(self, rows: np.ndarray) -> None:
+        n = len(rows)
+        if self._size + n > len(self._data):
+            capacity = max(2 * len(self._data), self._size + n)
+            grown = np.empty((capacity, *self._data.shape[1:]), dtype=self._data.dtype)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size : self._size + n] = rows
+        self._size += n
+
+    def view(self) -> np.ndarray:
+        return self._data[: self._size]
+
+
+class ProbabilityRecorder:
+    """Buffers one session's probability vectors and writes them at session end."""
+
+    def __init__(self, directory: str | Path = DEFAULT_RECORDINGS_DIR):
+        self._directory = Path(directory)
+        self._meta: dict | None = None
+        self._labels: tuple[str, ...] = ()
+
+    def start(self, session_id: str, device_id: str, labels, weights: dict, started_at: str) -> None:
+        """Begin buffering a session scored with ``weights`` over ``labels``."""
+        self._labels = tuple(labels)
+        self._meta = {
+            "sessionId": session_id,
+            "deviceId": device_id,
+            "startedAt": started_at,
+            "weights": dict(weights),
+        }
+        self._probabilities = _Growable((len(self._labels),), np.float16)
+        self._rows_per_tick = _Growable((), np.int16)
+        self._times = _Growable((), np.int32)
+        self._scores = _Growable((), np.uint8)
+
+    def add(self, time_since_start: int, probabilities: np.ndarray, score: int) -> None:
+        """Record one tick: a (labels,) vector or a (zones, labels) matrix."""
+        if self._meta is None:
+            return
+        rows = np.asarray(probabilities)[..., : len(self._labels)].reshape(-1, len(self._labels))
+        self._probabilities.extend(rows)
+        self._rows_per_tick.extend(np.array([len(rows)]))
+        self._times.extend(np.array([time_since_start]))
+        self._scores.extend(np.array([score]))
+
+    def finish(self, ended_at: str) -> Path | None:
+        """Write the buffered session and stop recording.
+
+        Returns:
+            Path of the written ``.npz``, or None if nothing was recorded.
+        """
+        if self._meta is None:
+            return None
+        meta, self._meta = self._meta, None
+        if not len(self._times.view()):
+            return None
+        meta["endedAt"] = ended_at
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._directory / f"{meta['sessionId']}.npz"
+        np.savez_compressed(
+            path,
+            probabilities=self._probabilities.view(),
+            rows_per_tick=self._rows_per_tick.view(),
+            time_since_start=self._times.view(),
+            scores=self._scores.view(),
+            labels=np.array(self._labels),
+            meta=np.array(json.dumps(meta)),
+        )
+        logger.info("Recorded %d ticks to %s", len(self._times.view()), path)
+        return path
+
+
+def load_recording(path: str | Path) -> dict:
+    """Read a session recording written by ``ProbabilityRecorder``.
+
+    Returns:
+        Dict with the stored arrays, ``labels`` as a list and ``meta`` decoded.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        recording = {key: data[key] for key in data.files}
+    recording["labels"] = [str(label) for label in recording["labels"]]
+    recording["meta"] = json.loads(str(recording["meta"]))
+    return recording
@@ -0,0 +1,273 @@
+"""Re-score recorded sessions under candidate weight configs.
+
+Every recording (see ``engagement_monitor.recording``) is loaded into one
+(rows x labels) probability matrix. Each candidate config becomes one column
+of a (labels x configs) weight matrix and a known-label mask, so all ticks of
+all sessions are scored for every config with a few matrix products per
+distinct confidence threshold. Per-tick sums are folded per tick and per
+session with ``np.add.reduceat``.
+
+The scores follow ``ScoringPlan`` exactly (threshold and expectation modes,
+confidence modifier, rounding and clamping). Deltas are reported against each
+session re-scored with the weights it was recorded under, so the float16
+storage rounding cancels out.
+
+Usage:
+    python -m engagement_monitor.rescore recordings/ --config candidate.json
+    python -m engagement_monitor.rescore recordings/ --config a.json --config b.json --per-session --json
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from engagement_monitor.config import DEFAULT_WEIGHTS_CONFIG_PATH, validate_weights
+from engagement_monitor.recording import DEFAULT_RECORDINGS_DIR, load_recording
+from engagement_monitor.scorer import (
+    MODE_EXPECTATION,
+    MODE_THRESHOLD,
+    confidence_impact_strength,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def score_ticks(
+    probabilities: np.ndarray,
+    rows_per_tick: np.ndarray,
+    labels,
+    configs: list[dict],
+) -> np.ndarray:
+    """Score every tick under every config.
+
+    Args:
+        probabilities: (rows, labels) model outputs; a tick may span several
+            rows (seat zones), see ``rows_per_tick``.
+        rows_per_tick: (ticks,) number of rows of each tick (all >= 1).
+        labels: Model output order of the probability columns.
+        configs: Weight configs, one output column each.
+
+    Returns:
+        (ticks, configs) int scores in [0, 100].
+    """
+    p = np.asarray(probabilities, dtype=np.float64)
+    starts = np.concatenate(([0], np.cumsum(rows_per_tick)[:-1])).astype(np.intp)
+    n_ticks = len(rows_per_tick)
+    weights = np.array(
+        [[int(c[label]) if label in c else 0 for c in configs] for label in labels], dtype=np.float64
+    ).reshape(len(labels), len(configs))
+    known = np.array(
+        [[label in c for c in configs] for label in labels], dtype=np.float64
+    ).reshape(len(labels), len(configs))
+
+    raw = np.zeros((n_ticks, len(configs)))
+    avg_confidence = np.zeros_like(raw)
+    scored = np.zeros_like(raw, dtype=bool)
+
+    def _per_tick(rows: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(rows, starts, axis=0) if n_ticks else rows[:0]
+
+    modes = [c.get("scoringMode", MODE_THRESHOLD) for c in configs]
+    thresholds = np.array([float(c.get("confidenceThreshold", 0.6)) for c in configs])
+    threshold_columns = [i for i, m in enumerate(modes) if m == MODE_THRESHOLD]
+    for threshold in np.unique(thresholds[threshold_columns]):
+        cols = [i for i in threshold_columns if thresholds[i] == threshold]
+        mask = (p >= threshold).astype(np.float64)
+        counts = _per_tick(mask @ known[:, cols])
+        weight_sums = _per_tick(mask @ weights[:, cols])
+        confidence_sums = _per_tick((mask * p) @ known[:, cols])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw[:, cols] = weight_sums / counts
+            avg_confidence[:, cols] = confidence_sums / counts
+        scored[:, cols] = counts > 0
+
+    expectation_columns = [i for i, m in enumerate(modes) if m == MODE_EXPECTATION]
+    if expectation_columns:
+        cols = expectation_columns
+        totals = _per_tick(p @ known[:, cols])
+        weighted = _per_tick(p @ weights[:, cols])
+        squares = _per_tick((p * p) @ known[:, cols])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw[:, cols] = weighted / totals
+            avg_confidence[:, cols] = squares / totals
+        scored[:, cols] = totals > 0
+
+    for i, config in enumerate(configs):
+        strength = confidence_impact_strength(config)
+        if strength is not None:
+            raw[:, i] *= (1.0 - strength) + strength * avg_confidence[:, i]
+
+    scores = np.clip(np.rint(np.where(scored, raw, 0.0)), 0, 100)
+    return scores.astype(np.int16)
+
+
+def load_sessions(paths) -> dict:
+    """Concatenate recordings into one probability matrix.
+
+    Recordings whose label set differs from the first one are skipped;
+    a different label order is reordered to match.
+
+    Returns:
+        Dict with ``probabilities``, ``rows_per_tick``, ``ticks_per_session``,
+        ``scores`` (as recorded), ``labels`` and per-session ``meta``.
+
+    Raises:
+        ValueError: If no recordings were found.
+    """
+    files: list[Path] = []
+    for path in (Path(p) for p in paths):
+        files.extend(sorted(path.glob("*.npz")) if path.is_dir() else [path])
+    labels: list[str] | None = None
+    probabilities, rows_per_tick, ticks_per_session, scores, meta = [], [], [], [], []
+    for file in files:
+        recording = load_recording(file)
+        if labels is None:
+            labels = recording["labels"]
+        if sorted(recording["labels"]) != sorted(labels):
+            logger.warning("Skipping %s — labels %s differ from %s", file, recording["labels"], labels)
+            continue
+        order = [recording["labels"].index(label) for label in labels]
+        probabilities.append(recording["probabilities"][:, order])
+        rows_per_tick.append(recording["rows_per_tick"])
+        ticks_per_session.append(len(recording["rows_per_tick"]))
+        scores.append(recording["scores"])
+        meta.append(recording["meta"])
+    if not meta:
+        raise ValueError(f"No recordings found in {', '.join(str(p) for p in paths)}")
+    return {
+        "probabilities": np.concatenate(probabilities),
+        "rows_per_tick": np.concatenate(rows_per_tick),
+        "ticks_per_session": np.array(ticks_per_session),
+        "scores": np.concatenate(scores),
+        "labels": labels,
+        "meta": meta,
+    }
+
+
+def rescore(sessions: dict, candidates: dict[str, dict]) -> dict:
+    """Score every session under each candidate and under its recorded weights.
+
+    Args:
+        sessions: Output of ``load_sessions``.
+        candidates: Candidate name -> weight config.
+
+    Returns:
+        Dict with a ``configs`` summary per candidate (mean average engagement
+        and deltas against the recorded weights), per-session averages and
+        the share of ticks whose recorded score is reproduced.
+    """
+    recorded_keys = [json.dumps(m["weights"], sort_keys=True) for m in sessions["meta"]]
+    baselines = sorted(set(recorded_keys))
+    configs = list(candidates.values()) + [json.loads(key) for key in baselines]
+
+    start = time.perf_counter()
+    tick_scores = score_ticks(
+        sessions["probabilities"], sessions["rows_per_tick"], sessions["labels"], configs
+    )
+    session_starts = np.concatenate(([0], np.cumsum(sessions["ticks_per_session"])[:-1]))
+    averages = np.add.reduceat(tick_scores.astype(np.float64), session_starts, axis=0)
+    averages /= sessions["ticks_per_session"][:, None]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    baseline_column = np.array([len(candidates) + baselines.index(k) for k in recorded_keys])
+    session_index = np.arange(len(recorded_keys))
+    baseline = averages[session_index, baseline_column]
+    baseline_ticks = tick_scores[
+        np.arange(len(tick_scores)), np.repeat(baseline_column, sessions["ticks_per_session"])
+    ]
+
+    summary = {}
+    for i, name in enumerate(candidates):
+        delta = averages[:, i] - baseline
+        summary[name] = {
+            "meanAverageEngagement": round(float(averages[:, i].mean()), 2),
+            "meanDelta": round(float(delta.mean()), 2),
+            "meanAbsDelta": round(float(np.abs(delta).mean()), 2),
+            "minDelta": round(float(delta.min()), 2),
+            "maxDelta": round(float(delta.max()), 2),
+        }
+    return {
+        "sessions": len(recorded_keys),
+        "ticks": int(len(tick_scores)),
+        "elapsedMs": round(elapsed_ms, 2),
+        "recordedScoresReproduced": round(
+            float(np.mean(baseline_ticks == sessions["scores"])), 4
+        ),
+        "configs": summary,
+        "perSession": [
+            {
+                "sessionId": m["sessionId"],
+                "recordedAverage": round(float(baseline[j]), 2),
+                **{name: round(float(averages[j, i]), 2) for i, name in enumerate(candidates)},
+            }
+            for j, m in enumerate(sessions["meta"])
+        ],
+    }
+
+
+def _load_weights(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    errors = validate_weights(config)
+    if errors:
+        raise ValueError(f"{path}: {errors[0]}")
+    return config
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Re-score recorded sessions under candidate weight configs and report "
+        "average-engagement deltas."
+    )
+    parser.add_argument(
+        "recordings",
+        nargs="*",
+        default=[str(DEFAULT_RECORDINGS_DIR)],
+        help="Recording .npz files or directories (default: recordings/)",
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        default=None,
+        help="Candidate weights.json (repeatable; default: config/weights.json)",
+    )
+    parser.add_argument("--per-session", action="store_true", help="Print one line per session")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        candidates = {Path(c).stem: _load_weights(c) for c in args.config or [str(DEFAULT_WEIGHTS_CONFIG_PATH)]}
+        report = rescore(load_sessions(args.recordings), candidates)
+    except (ValueError, OSError) as exc:
+        print(f"Rescore failed: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(
+        f"{report['sessions']} sessions, {report['ticks']} ticks scored in {report['elapsedMs']} ms "
+        f"({report['recordedScoresReproduced']:.1%} of recorded tick scores reproduced)"
+    )
+    print(f"{'config':>20} {'mean avg':>9} {'mean Δ':>8} {'mean |Δ|':>9} {'min Δ':>7} {'max Δ':>7}")
+    for name, s in report["configs"].items():
+        print(
+            f"{name:>20} {s['meanAverageEngagement']:>9.2f} {s['meanDelta']:>8.2f} "
+            f"{s['meanAbsDelta']:>9.2f} {s['minDelta']:>7.2f} {s['maxDelta']:>7.2f}"
+        )
+    if args.per_session:
+        print()
+        for row in report["perSession"]:
+            values = " ".join(f"{name}={row[name]:.2f}" for name in report["configs"])
+            print(f"{row['sessionId']}  recorded={row['recordedAverage']:.2f}  {values}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    sys.exit(main())
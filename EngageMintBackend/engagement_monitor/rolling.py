@@ -0,0 +1,111 @@
+"""Rolling-window tick metrics (SMA, EMA and trend slope), O(1) per tick.
+
+Each ``RollingWindow`` keeps the ticks of its last ``seconds`` of session
+time in a deque together with running sums of t, y, t² and t·y, so the
+simple moving average and the least-squares slope are updated as ticks enter
+and leave the window instead of being recomputed. The EMA is time-aware
+(``alpha = 1 - exp(-dt / seconds)``), so irregular tick spacing (pipeline
+jitter, change-gate reuse) does not skew it.
+"""
+
+import math
+from collections import deque
+
+# Window widths in seconds: 30 s and 5 min.
+DEFAULT_WINDOWS: tuple[int, ...] = (30, 300)
+
+
+class RollingWindow:
+    """SMA, EMA and trend slope over the last ``seconds`` of ticks."""
+
+    def __init__(self, seconds: int):
+        self.seconds = int(seconds)
+        self._ticks: deque[tuple[float, int]] = deque()
+        self._origin: float | None = None
+        self._sum_t = 0.0
+        self._sum_y = 0.0
+        self._sum_tt = 0.0
+        self._sum_ty = 0.0
+        self._ema: float | None = None
+        self._last_time: float | None = None
+
+    def add(self, time_since_start: float, score: int) -> None:
+        """Fold one tick in and evict ticks older than the window."""
+        if self._origin is None:
+            # Times are kept relative to the first tick so the squared sums
+            # stay small for all-day sessions.
+            self._origin = float(time_since_start)
+        t = float(time_since_start) - self._origin
+        y = float(score)
+        self._ticks.append((t, score))
+        self._sum_t += t
+        self._sum_y += y
+        self._sum_tt += t * t
+        self._sum_ty += t * y
+        while t - self._ticks[0][0] >= self.seconds:
+            old_t, old_y = self._ticks.popleft()
+            self._sum_t -= old_t
+            self._sum_y -= old_y
+            self._sum_tt -= old_t * old_t
+            self._sum_ty -= old_t * old_y
+
+        if self._ema is None:
+            self._ema = y
+        else:
+            alpha = 1.0 - math.exp(-max(0.0, t - self._last_time) / self.seconds)
+            self._ema += alpha * (y - self._ema)
+        self._last_time = t
+
+    @property
+    def count(self) -> int:
+        """Ticks currently inside the window."""
+        return len(self._ticks)
+
+    @property
+    def sma(self) -> float:
+        """Mean score of the ticks in the window; 0.0 before the first tick."""
+        return self._sum_y / len(self._ticks) if self._ticks else 0.0
+
+    @property
+    def ema(self) -> float:
+        """Exponential moving average with time constant ``seconds``."""
+        return self._ema if self._ema is not None else 0.0
+
+    @property
+    def slope(self) -> float:
+        """Least-squares trend of the window in score points per minute."""
+        n = len(self._ticks)
+        denominator = n * self._sum_tt - self._sum_t * self._sum_t
+        if n < 2 or denominator <= 1e-9:
+            return 0.0
+        return 60.0 * (n * self._sum_ty - self._sum_t * self._sum_y) / denominator
+
+    def to_dict(self) -> dict:
+        """Serialize as one entry of a tick's ``rolling`` field."""
+        return {
+            "sma": round(self.sma, 2),
+            "ema": round(self.ema, 2),
+            "slopePerMinute": round(self.slope, 2),
+            "count": self.count,
+        }
+
+
+class RollingMetrics:
+    """One ``RollingWindow`` per configured width, keyed like ``"30s"``."""
+
+    def __init__(self, windows: tuple[int, ...] | list[int] = DEFAULT_WINDOWS):
+        self._windows = [RollingWindow(w) for w in sorted({int(w) for w in windows if int(w) > 0})]
+
+    @property
+    def windows(self) -> tuple[int, ...]:
+        """Configured window widths in seconds."""
+        return tuple(w.seconds for w in self._windows)
+
+    def add(self, time_since_start: float, score: int) -> None:
+        """Fold one tick into every window."""
+        for window in self._windows:
+            window.add(time_since_start, score)
+
+    def to_dict(self) -> dict:
+        """Current metrics per window; empty when no windows are configured."""
+        return {f"{w.seconds}s": w.to_dict() for w in self._windows}
@@ -0,0 +1,94 @@
+"""Incremental multi-resolution timeline rollups (min/max/mean/count)."""
+
+from dataclasses import dataclass
+
+# Window widths in seconds: 10 s, 1 min, 5 min.
+DEFAULT_RESOLUTIONS: tuple[int, ...] = (10, 60, 300)
+
+
+@dataclass
+class RollupWindow:
+    """Running aggregate for one window at one resolution."""
+
+    resolution_seconds: int
+    index: int
+    count: int = 0
+    total: int = 0
+    minimum: int = 100
+    maximum: int = 0
+
+    def add(self, score: int) -> None:
+        """Fold one tick score into the window."""
+        self.count += 1
+        self.total += score
+        self.minimum = min(self.minimum, score)
+        self.maximum = max(self.maximum, score)
+
+    def to_dict(self) -> dict:
+        """Serialize as a rollup point."""
+        return {
+            "resolutionSeconds": self.resolution_seconds,
+            "windowStart": self.index * self.resolution_seconds,
+            "count": self.count,
+            "mean": round(self.total / self.count, 2),
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+
+
+class RollupAccumulator:
+    """Maintains one open window per resolution, O(resolutions) per tick.
+
+    A window is emitted as soon as a tick lands in a later window (or on
+    ``close``); windows with no ticks are never emitted.
+    """
+
+    def __init__(self, resolutions: tuple[int, ...] | list[int] = DEFAULT_RESOLUTIONS):
+        self._resolutions = tuple(sorted({int(r) for r in resolutions if int(r) > 0}))
+        self._open: dict[int, RollupWindow] = {}
+
+    @property
+    def resolutions(self) -> tuple[int, ...]:
+        """Configured window widths in seconds."""
+        return self._resolutions
+
+    def add(self, time_since_start: float, score: int) -> list[dict]:
+        """Record a tick and return any windows it closed.
+
+        Args:
+            time_since_start: Seconds since session start for this tick.
+            score: Engagement score for this tick.
+
+        Returns:
+            Closed rollup points (possibly empty), finest resolution first.
+        """
+        closed: list[dict] = []
+        for resolution in self._resolutions:
+            index = int(max(0.0, time_since_start) // resolution)
+            window = self._open.get(resolution)
+            if window is not None and window.index != index:
+                closed.append(window.to_dict())
+                window = None
+            if window is None:
+                window = RollupWindow(resolution_seconds=resolution, index=index)
+                self._open[resolution] = window
+            window.add(score)
+        return closed
+
+    def close(self) -> list[dict]:
+        """Emit every still-open (partial) window and reset."""
+        closed = [self._open[r].to_dict() for r in self._resolutions if r in self._open]
+        self._open = {}
+        return closed
+
+
+def parse_resolutions(
+    value: str | None, default: tuple[int, ...] = DEFAULT_RESOLUTIONS
+) -> tuple[int, ...]:
+    """Parse a comma-separated list of window widths (e.g. ``"10,60,300"``).
+
+    ``None`` yields ``default``; an empty string disables the windows.
+    """
+    if value is None:
+        return default
+    return tuple(int(part) for part in value.split(",") if part.strip())
@@ -10,6 +10,7 @@ def build_tick_payload(
     session_id: str,
     engagement_score: int,
     timestamp: datetime | None = None,
+    rolling: dict | None = None,
 ) -> dict:
     """Construct a metric-tick payload conforming to metric-tick.v1 schema.
 
@@ -18,18 +19,23 @@ def build_tick_payload(
         session_id: Active session UUID.
         engagement_score: Clamped [0, 100] engagement score.
         timestamp: UTC timestamp. Defaults to now.
+        rolling: Optional rolling-window metrics (``SessionManager.rolling``),
+            added as the v1.1 ``rolling`` field.
 
     Returns:
         Dict conforming to metric-tick.v1.schema.json.
     """
     ts = timestamp or datetime.now(timezone.utc)
-    return {
+    payload = {
         "schemaVersion": SCHEMA_VERSION,
         "deviceId": device_id,
         "sessionId": session_id,
         "timestamp": ts.isoformat(),
         "engagementScore": engagement_score,
     }
+    if rolling:
+        payload["rolling"] = rolling
+    return payload
 
 
 def build_summary_payload(
@@ -41,6 +47,7 @@ def build_summary_payload(
     average_engagement: float,
     tick_count: int,
     timeline_ref: str,
+    statistics: dict | None = None,
 ) -> dict:
     """Construct a session-summary payload conforming to session-summary.v1 schema.
 
@@ -53,11 +60,12 @@ def build_summary_payload(
         average_engagement: Mean engagement score across all ticks.
         tick_count: Number of ticks emitted during session.
         timeline_ref: Firestore collection path to tick data.
+        statistics: Optional score distribution (``SessionStats.to_dict()``).
 
     Returns:
         Dict conforming to session-summary.v1.schema.json.
     """
-    return {
+    payload = {
         "schemaVersion": SCHEMA_VERSION,
         "deviceId": device_id,
         "sessionId": session_id,
@@ -68,3 +76,6 @@ def build_summary_payload(
         "tickCount": tick_count,
         "timelineRef": timeline_ref,
     }
+    if statistics:
+        payload["statistics"] = statistics
+    return payload
@@ -1,9 +1,23 @@
-"""Engagement scoring — converts behavior detections into a weighted score."""
+"""Engagement scoring — converts behavior detections into a weighted score.
+
+``compute_score`` scores a list of thresholded ``(label, confidence)``
+detections. ``ScoringPlan`` is the same computation compiled once per
+session against the detector's label order, scoring the raw probability
+vector (or a zones x labels matrix) with a few NumPy operations.
+"""
 
 import logging
+from dataclasses import dataclass
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Scoring modes (``scoringMode`` in config/weights.json).
+MODE_THRESHOLD = "threshold"
+MODE_EXPECTATION = "expectation"
+SCORING_MODES = (MODE_THRESHOLD, MODE_EXPECTATION)
+
 
 def compute_score(detections: list[tuple[str, float]], weights: dict) -> int:
     """Compute a group engagement score from model detections.
@@ -40,10 +54,8 @@ def compute_score(detections: list[tuple[str, float]], weights: dict) -> int:
 
     raw_score = sum(label_weights) / len(label_weights)
 
-    use_confidence = bool(weights.get("useConfidenceInScoring", False))
-    if use_confidence and confidences:
-        strength = float(weights.get("confidenceImpactStrength", 0.35))
-        strength = max(0.0, min(1.0, strength))
+    strength = confidence_impact_strength(weights)
+    if strength is not None and confidences:
         avg_confidence = sum(confidences) / len(confidences)
         confidence_modifier = (1.0 - strength) + (strength * avg_confidence)
         raw_score *= confidence_modifier
@@ -63,3 +75,86 @@ def compute_score(detections: list[tuple[str, float]], weights: dict) -> int:
         len(label_weights),
     )
     return engagement_score
+
+
+def confidence_impact_strength(weights: dict) -> float | None:
+    """Confidence impact strength in [0, 1], or None when confidence scoring is off."""
+    if not bool(weights.get("useConfidenceInScoring", False)):
+        return None
+    return max(0.0, min(1.0, float(weights.get("confidenceImpactStrength", 0.35))))
+
+
+@dataclass(frozen=True)
+class ScoringPlan:
+    """Weights, label mask and modifier parameters compiled for one label order.
+
+    In ``threshold`` mode (the default) the score is identical to
+    ``compute_score`` on the detector's thresholded detections. In
+    ``expectation`` mode every known label contributes its weight in
+    proportion to its probability, with no threshold.
+    """
+
+    labels: tuple[str, ...]
+    weights: np.ndarray
+    known: np.ndarray
+    threshold: float
+    strength: float | None
+    mode: str = MODE_THRESHOLD
+
+    @classmethod
+    def compile(cls, weights: dict, labels) -> "ScoringPlan":
+        """Build the plan for ``labels`` (model output order) from a weight config.
+
+        Labels without a configured weight are reported once here and never
+        contribute to the score.
+
+        Raises:
+            ValueError: If ``scoringMode`` is unknown.
+        """
+        labels = tuple(labels)
+        mode = weights.get("scoringMode", MODE_THRESHOLD)
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {mode!r} (expected one of {', '.join(SCORING_MODES)})")
+        known = np.array([label in weights for label in labels], dtype=bool)
+        for label in (label for label, ok in zip(labels, known) if not ok):
+            logger.warning("Unknown behavior label '%s' — it will not be scored", label)
+        return cls(
+            labels=labels,
+            weights=np.array(
+                [int(weights[label]) if ok else 0 for label, ok in zip(labels, known)],
+                dtype=np.float64,
+            ),
+            known=known,
+            threshold=float(weights.get("confidenceThreshold", 0.6)),
+            strength=confidence_impact_strength(weights),
+            mode=mode,
+        )
+
+    def score(self, probabilities) -> int:
+        """Score a (labels,) probability vector or a (zones, labels) matrix.
+
+        Returns:
+            engagement_score: int in [0, 100]
+        """
+        p = np.asarray(probabilities, dtype=np.float64)[..., : len(self.labels)]
+        if self.mode == MODE_EXPECTATION:
+            total = float(np.sum(p, where=self.known))
+            if total <= 0:
+                return 0
+            raw_score = float(np.sum(p * self.weights)) / total
+            avg_confidence = float(np.sum(p * p, where=self.known)) / total
+        else:
+            mask = (p >= self.threshold) & self.known
+            count = int(np.count_nonzero(mask))
+            if count == 0:
+                logger.debug("No known detections — score = 0")
+                return 0
+            raw_score = float(np.sum(np.broadcast_to(self.weights, p.shape), where=mask)) / count
+            avg_confidence = float(np.sum(p, where=mask)) / count
+
+        if self.strength is not None:
+            raw_score *= (1.0 - self.strength) + (self.strength * avg_confidence)
+
+        engagement_score = max(0, min(100, round(raw_score)))
+        logger.debug("Score: %d (raw=%.2f, mode=%s)", engagement_score, raw_score, self.mode)
+        return engagement_score
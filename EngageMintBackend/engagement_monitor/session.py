@@ -5,6 +5,11 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+from engagement_monitor.downsample import DEFAULT_TIMELINE_POINTS, StreamingTimeline
+from engagement_monitor.rolling import DEFAULT_WINDOWS, RollingMetrics
+from engagement_monitor.rollups import DEFAULT_RESOLUTIONS, RollupAccumulator
+from engagement_monitor.session_stats import SessionStats
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,19 +36,37 @@ class SessionSummary:
     average_engagement: float
     tick_count: int
     timeline_ref: str
+    final_rollups: list[dict] = field(default_factory=list)
+    timeline_preview: list[dict] = field(default_factory=list)
+    statistics: dict = field(default_factory=dict)
 
 
 class SessionManager:
     """Manages session lifecycle with state enforcement.
 
     Ensures only one session is active at a time and provides clean
-    start/end transitions with summary computation.
+    start/end transitions with summary computation. Also maintains
+    incremental timeline rollups at ``rollup_resolutions`` (seconds) and,
+    at session end, an LTTB-downsampled preview of ``timeline_points`` ticks.
+    Scores are folded into ``SessionStats`` as they arrive, so memory does
+    not grow with session length, and into rolling SMA/EMA/trend windows of
+    ``rolling_windows`` seconds that are read back per tick via ``rolling``.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        rollup_resolutions: tuple[int, ...] = DEFAULT_RESOLUTIONS,
+        timeline_points: int = DEFAULT_TIMELINE_POINTS,
+        rolling_windows: tuple[int, ...] = DEFAULT_WINDOWS,
+    ):
         self._active_session: Session | None = None
-        self._scores: list[int] = []
-        self._tick_count: int = 0
+        self._timeline_points = int(timeline_points)
+        self._stats = SessionStats()
+        self._timeline = StreamingTimeline(self._timeline_points)
+        self._rollup_resolutions = tuple(rollup_resolutions)
+        self._rollups = RollupAccumulator(self._rollup_resolutions)
+        self._rolling_windows = tuple(rolling_windows)
+        self._rolling = RollingMetrics(self._rolling_windows)
 
     @property
     def is_active(self) -> bool:
@@ -55,6 +78,11 @@ class SessionManager:
         """The currently active session, or None."""
         return self._active_session
 
+    @property
+    def rolling(self) -> dict:
+        """Rolling-window metrics as of the last recorded tick, keyed like ``"30s"``."""
+        return self._rolling.to_dict()
+
     def start_session(self, device_id: str, session_name: str | None = None) -> Session:
         """Start a new monitoring session.
 
@@ -83,27 +111,39 @@ class SessionManager:
             started_at=started_at,
             session_name=session_name,
         )
-        self._scores = []
-        self._tick_count = 0
+        self._stats = SessionStats()
+        self._timeline = StreamingTimeline(self._timeline_points)
+        self._rollups = RollupAccumulator(self._rollup_resolutions)
+        self._rolling = RollingMetrics(self._rolling_windows)
 
         logger.info(
             "Session started: %s on device %s", session_id, device_id
         )
         return self._active_session
 
-    def record_tick(self, score: int) -> None:
+    def record_tick(self, score: int, time_since_start: float | None = None) -> list[dict]:
         """Record a tick's engagement score for summary computation.
 
         Args:
             score: Engagement score for this tick.
+            time_since_start: Seconds since session start; defaults to now.
+
+        Returns:
+            Timeline rollup windows closed by this tick (usually empty).
 
         Raises:
             RuntimeError: If no session is active.
         """
         if self._active_session is None:
             raise RuntimeError("Cannot record tick — no active session.")
-        self._scores.append(score)
-        self._tick_count += 1
+        if time_since_start is None:
+            time_since_start = (
+                datetime.now(timezone.utc) - self._active_session.started_at
+            ).total_seconds()
+        self._stats.add(score, time_since_start)
+        self._timeline.add(time_since_start, score)
+        self._rolling.add(time_since_start, score)
+        return self._rollups.add(time_since_start, score)
 
     def end_session(self) -> SessionSummary:
         """End the active session and compute its summary.
@@ -120,10 +160,8 @@ class SessionManager:
         session = self._active_session
         ended_at = datetime.now(timezone.utc)
         duration_seconds = max(1, int((ended_at - session.started_at).total_seconds()))
-        average_engagement = (
-            sum(self._scores) / len(self._scores) if self._scores else 0.0
-        )
-        tick_count = self._tick_count if self._tick_count > 0 else max(1, len(self._scores))
+        average_engagement = self._stats.mean
+        tick_count = max(1, self._stats.count)
 
         summary = SessionSummary(
             session_id=session.session_id,
@@ -134,6 +172,9 @@ class SessionManager:
             average_engagement=average_engagement,
             tick_count=tick_count,
             timeline_ref=f"sessions/{session.session_id}/liveData",
+            final_rollups=self._rollups.close(),
+            timeline_preview=self._timeline.preview(),
+            statistics=self._stats.to_dict(),
         )
 
         logger.info(
@@ -145,7 +186,7 @@ class SessionManager:
         )
 
         self._active_session = None
-        self._scores = []
-        self._tick_count = 0
+        self._stats = SessionStats()
+        self._timeline = StreamingTimeline(self._timeline_points)
 
         return summary
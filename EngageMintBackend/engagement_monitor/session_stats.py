@@ -0,0 +1,94 @@
+"""Constant-memory streaming statistics over a session's tick scores.
+
+``SessionStats`` folds each 0–100 score in O(1): an exact integer total for
+the mean, Welford's running mean/M2 for the variance, min/max, a 101-bin
+histogram (so percentiles are exact for integer scores) and tick/second
+counters per indicator band. Memory does not grow with session length.
+"""
+
+import math
+
+from engagement_monitor.indicator import band
+
+BANDS = ("red", "yellow", "green")
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class SessionStats:
+    """Running aggregates of one session's scores."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum: int | None = None
+        self.maximum: int | None = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._histogram = [0] * 101
+        self._band_ticks = dict.fromkeys(BANDS, 0)
+        self._band_seconds = dict.fromkeys(BANDS, 0.0)
+        self._last_time: float | None = None
+
+    def add(self, score: int, time_since_start: float | None = None) -> None:
+        """Fold one tick score into the statistics.
+
+        Args:
+            score: Engagement score in [0, 100].
+            time_since_start: Tick time; the interval since the previous
+                tick is credited to this tick's band.
+        """
+        score = int(score)
+        self.count += 1
+        self.total += score
+        self.minimum = score if self.minimum is None else min(self.minimum, score)
+        self.maximum = score if self.maximum is None else max(self.maximum, score)
+        delta = score - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (score - self._mean)
+        self._histogram[min(100, max(0, score))] += 1
+
+        score_band = band(score)
+        self._band_ticks[score_band] += 1
+        if time_since_start is not None:
+            if self._last_time is not None:
+                self._band_seconds[score_band] += max(0.0, time_since_start - self._last_time)
+            self._last_time = time_since_start
+
+    @property
+    def mean(self) -> float:
+        """Arithmetic mean of the scores (exact: integer total / count); 0.0 if empty."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the scores; 0.0 with fewer than two ticks."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    def percentile(self, q: float) -> int | None:
+        """Nearest-rank ``q``-th percentile (exact for integer scores); None if empty."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for score, n in enumerate(self._histogram):
+            seen += n
+            if seen >= rank:
+                return score
+        return self.maximum
+
+    def to_dict(self, percentiles: tuple[int, ...] = DEFAULT_PERCENTILES) -> dict:
+        """Serialize as the session summary's ``statistics`` object."""
+        return {
+            "min": self.minimum if self.minimum is not None else 0,
+            "max": self.maximum if self.maximum is not None else 0,
+            "stdDev": round(math.sqrt(self.variance), 2),
+            "percentiles": {f"p{q}": self.percentile(q) or 0 for q in percentiles},
+            "bands": {
+                name: {
+                    "ticks": self._band_ticks[name],
+                    "seconds": round(self._band_seconds[name], 1),
+                    "fraction": round(self._band_ticks[name] / self.count, 4) if self.count else 0.0,
+                }
+                for name in BANDS
+            },
+        }
@@ -0,0 +1,387 @@
+"""Durable store-and-forward spool for emitter events.
+
+Events (session start, ticks, rollups, session end) are appended to a local SQLite
+database in WAL mode before anything touches the network. A background
+drainer replays them to the backend strictly in append order, backing off
+exponentially while the network is down, so an outage never kills the
+session loop and a session's start/end stay ordered relative to its ticks.
+
+An event the backend rejects outright (a malformed body, a 4xx-style error)
+is moved to a ``dead_letters`` table instead of blocking everything queued
+behind it.
+"""
+
+import functools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPOOL_PATH = Path(__file__).resolve().parent.parent / "spool" / "emitter.sqlite3"
+DEFAULT_MAX_EVENTS = 200_000
+
+TICK = "tick"
+SESSION_START = "session_start"
+SESSION_END = "session_end"
+ROLLUPS = "rollups"
+
+# Reclaim free pages once this many events have been acknowledged.
+_COMPACT_EVERY = 5_000
+
+# Failures of a single tick with an unrecognized error code before it is
+# dead-lettered.
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Errors raised while turning a spooled body into a backend call; retrying
+# the same body can never succeed.
+_PERMANENT_ERRORS = (KeyError, TypeError, ValueError)
+
+# Status codes (google.api_core exceptions carry one as ``code``) that mean
+# "try again later" rather than "this request is wrong".
+_RETRYABLE_CODES = {408, 409, 429}
+
+
+def is_permanent_error(exc: BaseException) -> bool:
+    """True when retrying the delivery that raised ``exc`` cannot succeed."""
+    if isinstance(exc, _PERMANENT_ERRORS):
+        return True
+    code = getattr(exc, "code", None)
+    return isinstance(code, int) and 400 <= code < 500 and code not in _RETRYABLE_CODES
+
+
+@functools.lru_cache(maxsize=1)
+def _transport_errors() -> tuple[type[BaseException], ...]:
+    """Exception types raised while the network is unreachable."""
+    errors: list[type[BaseException]] = [OSError]
+    try:
+        # Offline token refresh, and a client-side retry deadline running out.
+        from google.api_core.exceptions import RetryError
+        from google.auth.exceptions import TransportError
+
+        errors += [TransportError, RetryError]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+def is_network_error(exc: BaseException) -> bool:
+    """True for connectivity failures, which are retried for as long as they last.
+
+    Besides socket and auth-transport errors this covers any non-permanent
+    error without a status code: while offline the client libraries raise a
+    variety of those, and a backend rejection always carries a code.
+    """
+    if isinstance(exc, _transport_errors()):
+        return True
+    if is_permanent_error(exc):
+        return False
+    code = getattr(exc, "code", None)
+    return code is None or (isinstance(code, int) and (code >= 500 or code in _RETRYABLE_CODES))
+
+
+class Spool:
+    """Append-only, ordered event log backed by SQLite.
+
+    When more than ``max_events`` are pending, the oldest *tick* events are
+    discarded to make room; session start/end events are never dropped.
+    The pending count is read once at open and then maintained in memory.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_SPOOL_PATH, max_events: int = DEFAULT_MAX_EVENTS):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_events = max(1, int(max_events))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " kind TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dead_letters ("
+            " seq INTEGER PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " error TEXT NOT NULL,"
+            " failed_at REAL NOT NULL)"
+        )
+        self._pending = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        self._acked_since_compact = 0
+        self.appended = 0
+        self.acked = 0
+        self.dropped = 0
+        self.dead_lettered = 0
+
+    @property
+    def path(self) -> Path:
+        """Location of the spool database."""
+        return self._path
+
+    def depth(self) -> int:
+        """Number of events waiting to be delivered."""
+        with self._lock:
+            return self._pending
+
+    def append(self, kind: str, body: dict) -> int:
+        """Durably append an event and return its sequence number."""
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO events (kind, body, created_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(body, separators=(",", ":")), time.time()),
+            )
+            self.appended += 1
+            self._pending += 1
+            self._enforce_cap()
+            return cur.lastrowid
+
+    def peek(self, limit: int) -> list[tuple[int, str, dict]]:
+        """Return up to ``limit`` oldest pending events as (seq, kind, body)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, kind, body FROM events ORDER BY seq LIMIT ?", (int(limit),)
+            ).fetchall()
+        return [(seq, kind, json.loads(body)) for seq, kind, body in rows]
+
+    def ack(self, up_to_seq: int) -> None:
+        """Remove every event with sequence number <= ``up_to_seq``."""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM events WHERE seq <= ?", (int(up_to_seq),))
+            self.acked += cur.rowcount
+            self._pending -= cur.rowcount
+            self._acked_since_compact += cur.rowcount
+            if self._acked_since_compact >= _COMPACT_EVERY:
+                self._compact()
+
+    def dead_letter(self, seq: int, error: str) -> None:
+        """Move one pending event to the ``dead_letters`` table."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO dead_letters (seq, kind, body, created_at, error, failed_at)"
+                    " SELECT seq, kind, body, created_at, ?, ? FROM events WHERE seq = ?",
+                    (error, time.time(), int(seq)),
+                )
+                cur = self._conn.execute("DELETE FROM events WHERE seq = ?", (int(seq),))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.dead_lettered += cur.rowcount
+            self._pending -= cur.rowcount
+
+    def dead_letters(self) -> list[tuple[int, str, dict, str]]:
+        """Return dead-lettered events as (seq, kind, body, error), oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, kind, body, error FROM dead_letters ORDER BY seq"
+            ).fetchall()
+        return [(seq, kind, json.loads(body), error) for seq, kind, body, error in rows]
+
+    def compact(self) -> None:
+        """Checkpoint the WAL and return free pages to the filesystem."""
+        with self._lock:
+            self._compact()
+
+    def close(self) -> None:
+        """Compact and close the database."""
+        with self._lock:
+            self._compact()
+            self._conn.close()
+
+    def stats(self) -> dict:
+        """Return a snapshot of spool counters."""
+        return {
+            "queueDepth": self.depth(),
+            "appended": self.appended,
+            "acked": self.acked,
+            "dropped": self.dropped,
+            "deadLettered": self.dead_lettered,
+        }
+
+    def _enforce_cap(self) -> None:
+        excess = self._pending - self._max_events
+        if excess <= 0:
+            return
+        cur = self._conn.execute(
+            "DELETE FROM events WHERE seq IN ("
+            " SELECT seq FROM events WHERE kind = ? ORDER BY seq LIMIT ?)",
+            (TICK, excess),
+        )
+        if cur.rowcount:
+            self.dropped += cur.rowcount
+            self._pending -= cur.rowcount
+            logger.warning("Spool full — dropped %d oldest tick(s)", cur.rowcount)
+
+    def _compact(self) -> None:
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._conn.execute("PRAGMA incremental_vacuum")
+        self._acked_since_compact = 0
+
+
+class SpoolDrainer:
+    """Background thread that replays spooled events in order.
+
+    Consecutive tick events are delivered together (up to ``batch_size``);
+    lifecycle events are delivered one at a time. A failed delivery is retried
+    with exponential backoff and nothing after it is sent until it succeeds,
+    except that an event the backend rejects is dead-lettered: immediately for
+    a permanent error, after ``max_attempts`` for a tick failing with an
+    unrecognized error code. Session start/end events are only ever
+    dead-lettered for a permanent error. A tick batch that fails that way is
+    re-sent one tick at a time so only the offending tick is set aside.
+    """
+
+    def __init__(
+        self,
+        spool: Spool,
+        deliver: Callable[[str, list[dict]], object],
+        batch_size: int = 100,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 60.0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        """
+        Args:
+            spool: Spool to drain.
+            deliver: Callable(kind, bodies) that sends events to the backend
+                and raises on failure. ``bodies`` has one element for
+                lifecycle events.
+            batch_size: Maximum consecutive ticks per delivery.
+            backoff_initial: First retry delay in seconds.
+            backoff_max: Upper bound on the retry delay in seconds.
+            max_attempts: Failures of a single tick with an unrecognized
+                error code before it is moved to the dead-letter table.
+        """
+        self._spool = spool
+        self._deliver = deliver
+        self._batch_size = max(1, int(batch_size))
+        self._backoff_initial = backoff_initial
+        self._backoff_max = backoff_max
+        self._max_attempts = max(1, int(max_attempts))
+        self._attempts: tuple[int, int] | None = None  # (seq, failures) of the head event
+        self._isolate_until = 0  # deliver ticks singly up to this seq
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.delivered = 0
+        self.failures = 0
+        self.dead_lettered = 0
+
+    def start(self) -> None:
+        """Start the drainer thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="spool-drainer", daemon=True)
+        self._thread.start()
+        logger.info("Spool drainer started (%d event(s) pending)", self._spool.depth())
+
+    def notify(self) -> None:
+        """Wake the drainer after new events have been appended."""
+        self._idle.clear()
+        self._wake.set()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until the spool is empty. Returns False on timeout."""
+        self.notify()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._spool.depth():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._idle.wait(0.05 if remaining is None else min(0.05, remaining))
+        return True
+
+    def stop(self, timeout: float | None = 10.0) -> bool:
+        """Try to drain within ``timeout``, then stop the thread.
+
+        Undelivered events stay in the spool and are replayed on next start.
+        """
+        if self._thread is None:
+            return True
+        drained = self.flush(timeout)
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+        if not drained:
+            logger.warning("Spool drainer stopped with %d event(s) pending", self._spool.depth())
+        return drained
+
+    def _next_group(self) -> list[tuple[int, str, dict]]:
+        events = self._spool.peek(self._batch_size)
+        if not events or events[0][1] != TICK or events[0][0] <= self._isolate_until:
+            return events[:1]
+        group = []
+        for event in events:
+            if event[1] != TICK:
+                break
+            group.append(event)
+        return group
+
+    def _run(self) -> None:
+        delay = self._backoff_initial
+        while not self._stop.is_set():
+            group = self._next_group()
+            if not group:
+                self._idle.set()
+                self._wake.wait(timeout=1.0)
+                self._wake.clear()
+                continue
+
+            kind = group[0][1]
+            try:
+                self._deliver(kind, [body for _seq, _kind, body in group])
+            except Exception as exc:
+                self.failures += 1
+                if not is_network_error(exc) and self._set_aside(group, exc):
+                    continue
+                logger.warning(
+                    "Spool delivery of %d %s event(s) failed (%s) — retrying in %.1fs",
+                    len(group),
+                    kind,
+                    exc,
+                    delay,
+                )
+                self._stop.wait(timeout=delay)
+                delay = min(self._backoff_max, delay * 2)
+                continue
+
+            self._spool.ack(group[-1][0])
+            self.delivered += len(group)
+            self._attempts = None
+            delay = self._backoff_initial
+
+    def _set_aside(self, group: list[tuple[int, str, dict]], exc: Exception) -> bool:
+        """Handle a non-network failure; True if the next delivery may go out at once."""
+        if len(group) > 1:
+            # Find the offending tick by re-sending the batch one tick at a time.
+            self._isolate_until = group[-1][0]
+            return True
+        seq, kind, _body = group[0]
+        failures = self._attempts[1] + 1 if self._attempts and self._attempts[0] == seq else 1
+        permanent = is_permanent_error(exc)
+        if not permanent and (kind != TICK or failures < self._max_attempts):
+            self._attempts = (seq, failures)
+            return False
+        self._spool.dead_letter(seq, f"{type(exc).__name__}: {exc}")
+        self._attempts = None
+        self.dead_lettered += 1
+        logger.error(
+            "Spool event %d (%s) failed %d time(s) (%s) — moved to dead letters", seq, kind, failures, exc
+        )
+        return True
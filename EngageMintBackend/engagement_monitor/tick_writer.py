@@ -0,0 +1,265 @@
+"""Background tick writer — keeps emission round-trips out of the tick loop."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 256
+
+# Nudges an idle worker to re-check the flush/stop flags; carries no state itself.
+_WAKE = object()
+
+
+class _Task:
+    """Non-tick work (e.g. a rollup write) run in queue order by the worker."""
+
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn: Callable, args: tuple):
+        self.fn = fn
+        self.args = args
+
+
+class TickWriter:
+    """Bounded in-memory queue drained by a dedicated worker thread.
+
+    ``put`` never blocks the caller: when the queue is full the oldest pending
+    tick is discarded so the freshest data always gets through, and the drop
+    is counted. ``close`` flushes whatever is still queued before stopping.
+    Flush and stop requests are flags beside the queue, so a full queue can
+    neither drop nor delay them.
+
+    When ``write_batch`` is given and ``batch_size > 1``, the worker collects
+    ticks and writes them together once ``batch_size`` ticks are pending or
+    ``flush_interval`` seconds have passed since the first one, whichever
+    comes first.
+    """
+
+    def __init__(
+        self,
+        write_tick: Callable[[str, dict, int], object],
+        max_queue: int = DEFAULT_QUEUE_SIZE,
+        *,
+        write_batch: Callable[[list[tuple[str, dict, int]]], object] | None = None,
+        batch_size: int = 1,
+        flush_interval: float = 0.0,
+    ):
+        """
+        Args:
+            write_tick: Callable(session_id, payload, time_since_start) that
+                performs the actual (blocking) write.
+            max_queue: Maximum number of ticks held in memory.
+            write_batch: Optional callable taking a list of
+                (session_id, payload, time_since_start) tuples.
+            batch_size: Maximum ticks per ``write_batch`` call.
+            flush_interval: Maximum seconds a tick waits for its batch to fill.
+        """
+        self._write_tick = write_tick
+        self._write_batch = write_batch
+        self._batch_size = max(1, int(batch_size)) if write_batch is not None else 1
+        self._flush_interval = max(0.0, float(flush_interval))
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._flushing = 0
+        self._stop = threading.Event()
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of ticks waiting to be written."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the worker thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tick-writer", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Tick writer started (max queue %d, batch size %d, flush interval %.2fs)",
+            self._queue.maxsize,
+            self._batch_size,
+            self._flush_interval,
+        )
+
+    def put(self, session_id: str, payload: dict, time_since_start: int) -> None:
+        """Queue a tick for background writing, dropping the oldest if full."""
+        self._put((session_id, payload, int(time_since_start)))
+        with self._lock:
+            self.enqueued += 1
+
+    def submit(self, fn: Callable, *args) -> None:
+        """Queue ``fn(*args)`` to run on the worker, ordered with the ticks.
+
+        Like ticks, tasks are subject to drop-oldest when the queue is full.
+        """
+        self._put(_Task(fn, args))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every queued tick has been processed.
+
+        A partially filled batch is written immediately rather than waiting
+        for its flush interval.
+
+        Returns:
+            True if the queue drained, False if ``timeout`` elapsed first.
+        """
+        with self._lock:
+            self._flushing += 1
+        try:
+            if self._batch_size > 1:
+                self._wake()
+            deadline = None if timeout is None else time.monotonic() + timeout
+            with self._queue.all_tasks_done:
+                while self._queue.unfinished_tasks:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._queue.all_tasks_done.wait(remaining)
+            return True
+        finally:
+            with self._lock:
+                self._flushing -= 1
+
+    def close(self, timeout: float | None = 10.0) -> bool:
+        """Flush pending ticks and stop the worker thread.
+
+        Returns:
+            True if everything queued was processed before shutdown.
+        """
+        if self._thread is None:
+            return True
+        flushed = self.flush(timeout)
+        self._stop.set()
+        self._wake()
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            logger.warning("Tick writer still busy; it will stop once the queue drains")
+        self._thread = None
+        if not flushed:
+            logger.warning("Tick writer closed with %d tick(s) unwritten", self.queue_depth)
+        logger.info("Tick writer stopped: %s", self.stats())
+        return flushed
+
+    def stats(self) -> dict:
+        """Return a snapshot of queue depth and throughput counters."""
+        return {
+            "queueDepth": self.queue_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+    def _put(self, item) -> None:
+        with self._lock:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    try:
+                        oldest = self._queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    self._queue.task_done()
+                    if oldest is not _WAKE:
+                        self.dropped += 1
+
+    def _wake(self) -> None:
+        """Nudge a worker blocked on an empty queue to re-check its flags.
+
+        If the queue is full the worker is not blocked and checks the flags
+        before its next wait, so the nudge can safely be skipped.
+        """
+        try:
+            self._queue.put_nowait(_WAKE)
+        except queue.Full:
+            pass
+
+    def _collect(self, first) -> tuple[list, int, _Task | None]:
+        """Gather a batch starting with ``first``.
+
+        Stops waiting for the batch to fill once a flush or stop is requested.
+
+        Returns:
+            (ticks, markers_consumed, follow_up) where ``follow_up`` is a
+            _Task that ended the batch and must be handled next.
+        """
+        batch = [first]
+        markers = 0
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size:
+            if self._flushing or self._stop.is_set():
+                remaining = 0.0
+            else:
+                remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _WAKE:
+                markers += 1
+                continue
+            if isinstance(item, _Task):
+                return batch, markers, item
+            batch.append(item)
+        return batch, markers, None
+
+    def _write(self, batch: list) -> None:
+        try:
+            if len(batch) == 1 and self._batch_size == 1:
+                self._write_tick(*batch[0])
+            else:
+                self._write_batch(batch)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Tick write failed (%d tick(s), session %s)", len(batch), batch[0][0])
+
+    def _run_task(self, task: _Task) -> None:
+        try:
+            task.fn(*task.args)
+        except Exception:
+            self.failed += 1
+            logger.exception("Background emit task %s failed", getattr(task.fn, "__name__", task.fn))
+
+    def _run(self) -> None:
+        follow_up = None
+        while True:
+            if follow_up is not None:
+                item, follow_up = follow_up, None
+            elif self._stop.is_set() and self._queue.empty():
+                return
+            else:
+                item = self._queue.get()
+            if item is _WAKE:
+                self._queue.task_done()
+                continue
+            if isinstance(item, _Task):
+                try:
+                    self._run_task(item)
+                finally:
+                    self._queue.task_done()
+                continue
+
+            batch, markers = [item], 0
+            if self._batch_size > 1:
+                batch, markers, follow_up = self._collect(item)
+            try:
+                self._write(batch)
+            finally:
+                for _ in range(len(batch) + markers):
+                    self._queue.task_done()
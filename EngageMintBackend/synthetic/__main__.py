@@ -4,6 +4,7 @@ Usage:
     python -m synthetic --sessions 5
     python -m synthetic --sessions 3 --device-id pi-demo --duration 20
     python -m synthetic --sessions 1 --dry-run
+    python -m synthetic --sessions 20 --backend ndjson
 """
 
 import argparse
@@ -15,6 +16,8 @@ import sys
 from datetime import datetime, timedelta, timezone
 
 from engagement_monitor import emitter
+from engagement_monitor.backends import create_backend
+from engagement_monitor.downsample import downsample_timeline
 from synthetic.generator import generate_session
 
 logging.basicConfig(
@@ -51,12 +54,21 @@ def main() -> None:
         action="store_true",
         help="Print generated payloads as JSON to stdout instead of writing to Firestore",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["firestore", "memory", "ndjson"],
+        default=None,
+        help="Emitter backend to write to (default: EMITTER_BACKEND env var or firestore)",
+    )
     args = parser.parse_args()
 
+    if args.backend and not args.dry_run:
+        emitter.set_backend(create_backend(args.backend))
+
     print(f"Generating {args.sessions} synthetic session(s)...")
     print(f"  Device: {args.device_id}")
     print(f"  Duration: {args.duration} min each")
-    print(f"  Mode: {'DRY RUN (stdout)' if args.dry_run else 'Firestore'}")
+    print(f"  Mode: {'DRY RUN (stdout)' if args.dry_run else emitter.get_backend().name}")
     print()
 
     # Space sessions out over the past N days
@@ -102,21 +114,22 @@ def main() -> None:
                 started_at=summary["startedAt"],
             )
 
-            # Write all tick documents
-            for tick in ticks:
-                time_since_start = int(
-                    (
-                        datetime.fromisoformat(tick["timestamp"])
-                        - datetime.fromisoformat(summary["startedAt"])
-                    ).total_seconds()
-                )
-                emitter.emit_tick(session_id, tick, time_since_start)
-
-            # Complete session with summary
+            # Write all tick documents with batched commits
+            started_at = datetime.fromisoformat(summary["startedAt"])
+            offsets = [
+                int((datetime.fromisoformat(tick["timestamp"]) - started_at).total_seconds())
+                for tick in ticks
+            ]
+            emitter.emit_ticks([
+                (session_id, tick, offset) for tick, offset in zip(ticks, offsets)
+            ])
+
+            # Complete session with summary and downsampled timeline preview
             emitter.complete_session(
                 session_id=session_id,
                 ended_at=summary["endedAt"],
                 summary=summary,
+                timeline=downsample_timeline(offsets, [t["engagementScore"] for t in ticks]),
             )
 
         print(
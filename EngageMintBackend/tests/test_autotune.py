@@ -0,0 +1,117 @@
+import json
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from engagement_monitor import autotune
+from engagement_monitor.autotune import Trial, choose_tick_interval, pick_best
+from engagement_monitor.config import DEFAULT_CONFIG, load_config, load_inference_config
+from engagement_monitor.detector import _interpreter_options
+
+
+class _FakeDetector:
+    """Latency shrinks with threads; the PIL path is slower; 'none' is unsupported."""
+
+    def __init__(self, fast_preprocess: bool, num_threads: int, delegate: str):
+        if delegate == "none":
+            raise RuntimeError("delegate unsupported")
+        self.fast_preprocess = fast_preprocess
+        self.num_threads = num_threads
+        self.frames: list[tuple[int, ...]] = []
+
+    @property
+    def input_size(self):
+        return (4, 4)
+
+    def load(self, source_shape=None):
+        pass
+
+    def prepare_source(self, shape):
+        self.source_shape = shape
+
+    def detect(self, frame):
+        self.frames.append(frame.shape)
+        time.sleep((0.004 if self.fast_preprocess else 0.008) / self.num_threads)
+        return []
+
+
+def test_autotune_picks_fastest_combination_and_shortest_sustainable_tick():
+    trials, best, interval = autotune.autotune(
+        _FakeDetector,
+        threads=[1, 4],
+        delegates=["xnnpack", "none"],
+        input_paths=["fused", "pil"],
+        iterations=5,
+        tick_candidates=(0.001, 0.05, 0.1),
+        ticks=3,
+    )
+
+    assert len(trials) == 4  # the unsupported delegate is skipped
+    assert (best.num_threads, best.delegate, best.input_path) == (4, "xnnpack", "fused")
+    assert interval == 0.05  # 1 ms is below the p99 budget and never paced
+
+
+def test_pick_best_prefers_low_p95_over_low_mean():
+    jittery = Trial(4, "xnnpack", "fused", mean_ms=10.0, p95_ms=40.0, p99_ms=60.0)
+    steady = Trial(2, "xnnpack", "fused", mean_ms=12.0, p95_ms=13.0, p99_ms=14.0)
+
+    assert pick_best([jittery, steady]) is steady
+    with pytest.raises(ValueError):
+        pick_best([])
+
+
+def test_choose_tick_interval_falls_back_to_longest_candidate():
+    assert choose_tick_interval(lambda: time.sleep(0.02), p99_ms=5000, candidates=(0.5, 1.0)) == 1.0
+
+
+def test_written_configs_validate_and_keep_other_keys(tmp_path: Path):
+    inference = tmp_path / "inference.json"
+    inference.write_text(json.dumps({"delegate": "external", "externalDelegatePath": "/x.so"}))
+    weights = tmp_path / "weights.json"
+    weights.write_text(json.dumps({**DEFAULT_CONFIG, "writing_notes": 50}))
+
+    trial = Trial(3, "none", "lores", mean_ms=8.0, p95_ms=9.0, p99_ms=9.5)
+    autotune.write_inference_config(inference, trial)
+    autotune.write_tick_interval(weights, 0.25)
+
+    cfg = load_inference_config(inference)
+    assert cfg["numThreads"] == 3 and cfg["delegate"] == "none"
+    assert cfg["fastPreprocess"] is True and cfg["cameraLores"] is True
+    assert cfg["externalDelegatePath"] == "/x.so"
+    assert cfg["benchmark"]["p95Ms"] == 9.0
+    weights_cfg = load_config(weights)
+    assert weights_cfg["tickIntervalSeconds"] == 0.25
+    assert weights_cfg["writing_notes"] == 50
+    with pytest.raises(ValueError):
+        autotune.write_tick_interval(weights, 0.01)
+
+
+def test_load_inference_config_fills_defaults_and_rejects_invalid(tmp_path: Path):
+    path = tmp_path / "inference.json"
+    path.write_text(json.dumps({"numThreads": 2}))
+    assert load_inference_config(path)["delegate"] == "xnnpack"
+    assert load_inference_config(path)["numThreads"] == 2
+
+    path.write_text(json.dumps({"delegate": "external"}))  # missing the library path
+    assert load_inference_config(path)["delegate"] == "xnnpack"
+
+
+def test_interpreter_options_select_threads_and_delegate():
+    tflite = types.SimpleNamespace(
+        OpResolverType=types.SimpleNamespace(BUILTIN_WITHOUT_DEFAULT_DELEGATES="builtin-only"),
+        load_delegate=lambda path: f"delegate:{path}",
+    )
+
+    assert _interpreter_options(tflite, 4, "xnnpack", None) == {"num_threads": 4}
+    assert _interpreter_options(tflite, 2, "none", None) == {
+        "num_threads": 2,
+        "experimental_op_resolver_type": "builtin-only",
+    }
+    assert _interpreter_options(tflite, 1, "external", "/libedgetpu.so") == {
+        "num_threads": 1,
+        "experimental_delegates": ["delegate:/libedgetpu.so"],
+    }
+    with pytest.raises(ValueError):
+        _interpreter_options(tflite, 1, "external", None)
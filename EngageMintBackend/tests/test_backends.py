@@ -0,0 +1,263 @@
+import itertools
+import json
+import time
+from pathlib import Path
+
+from engagement_monitor.backends import (
+    MAX_BATCH_WRITES,
+    FirestoreBackend,
+    MemoryBackend,
+    NdjsonBackend,
+)
+
+
+class _FakeDocRef:
+    _ids = itertools.count()
+
+    def __init__(self, path: str):
+        self.id = f"doc-{next(self._ids)}"
+        self.path = f"{path}/{self.id}"
+
+
+class _FakeCollection:
+    def __init__(self, path: str, db=None):
+        self._path = path
+        self._db = db
+
+    def document(self, doc_id: str | None = None):
+        if doc_id is None:
+            return _FakeDocRef(self._path)
+        return _FakeDocument(f"{self._path}/{doc_id}", self._db)
+
+
+class _FakeSnapshot:
+    def __init__(self, data: dict | None):
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return self._data
+
+
+class _FakeDocument:
+    def __init__(self, path: str, db=None):
+        self._path = path
+        self._db = db
+
+    def collection(self, name: str):
+        return _FakeCollection(f"{self._path}/{name}", self._db)
+
+    def get(self):
+        self._db.reads.append(self._path)
+        return _FakeSnapshot(self._db.docs.get(self._path))
+
+    def set(self, data, merge=False):
+        self._db.docs.setdefault(self._path, {}).update(data)
+
+    def on_snapshot(self, callback):
+        watch = _FakeWatch(self._path)
+        self._db.watches.append(watch)
+        return watch
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+
+class _FakeWatch:
+    def __init__(self, path: str):
+        self.path = path
+        self.is_active = True
+
+    def unsubscribe(self):
+        self.is_active = False
+
+
+class _FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, ref, data, merge=False):
+        self._writes.append((ref.path, data))
+
+    def commit(self):
+        self._db.commits.append(self._writes)
+
+
+class _FakeDb:
+    def __init__(self, docs: dict | None = None):
+        self.commits: list[list] = []
+        self.docs = docs or {}
+        self.reads: list[str] = []
+        self.watches: list[_FakeWatch] = []
+
+    def batch(self):
+        return _FakeBatch(self)
+
+    def collection(self, name: str):
+        return _FakeCollection(name, self)
+
+
+def test_firestore_emit_ticks_commits_in_chunks_with_client_generated_ids():
+    db = _FakeDb()
+    backend = FirestoreBackend(db=db)
+
+    ticks = [("s-1", {"engagementScore": i % 101}, i) for i in range(MAX_BATCH_WRITES + 3)]
+    doc_ids = backend.emit_ticks(ticks)
+
+    assert len(doc_ids) == len(ticks)
+    assert [len(c) for c in db.commits] == [MAX_BATCH_WRITES, 3]
+    path, data = db.commits[1][-1]
+    assert path == f"sessions/s-1/liveData/{doc_ids[-1]}"
+    assert data == {"timeSinceStart": len(ticks) - 1, "engagementScore": (len(ticks) - 1) % 101}
+
+
+def test_memory_backend_mirrors_session_lifecycle_and_commands():
+    backend = MemoryBackend()
+    backend.devices["dev-1"] = {"ownerUserId": "user-1"}
+
+    backend.create_session("s-1", "dev-1", "2025-01-01T00:00:00+00:00")
+    backend.emit_ticks([("s-1", {"engagementScore": 40}, 0), ("s-1", {"engagementScore": 80}, 1)])
+    # Re-sending a pre-assigned ID overwrites rather than duplicating.
+    backend.emit_ticks([("s-1", {"engagementScore": 90}, 2)], doc_ids=["fixed"])
+    backend.emit_ticks([("s-1", {"engagementScore": 90}, 2)], doc_ids=["fixed"])
+    backend.complete_session("s-1", "2025-01-01T00:01:00+00:00", {"averageEngagement": 70, "deviceId": "dev-1"})
+
+    assert backend.sessions["s-1"]["userId"] == "user-1"
+    assert backend.sessions["s-1"]["overallScore"] == 70.0
+    assert [d["engagementScore"] for d in backend.live_data["s-1"].values()] == [40, 80, 90]
+    assert backend.devices["dev-1"]["currentSessionId"] is None
+
+    pushed = []
+    watch = backend.watch_commands("dev-1", pushed.append)
+    command_id = backend.add_command("dev-1", {"type": "start"})
+    assert backend.fetch_pending_command("dev-1") == (command_id, {"status": "pending", "type": "start"})
+    backend.mark_command("dev-1", command_id, "processed")
+    assert backend.fetch_pending_command("dev-1") is None
+    assert pushed[-1] == []
+    watch.unsubscribe()
+    assert not watch.is_active
+
+
+def test_ndjson_backend_appends_one_line_per_write_and_reads_commands(tmp_path: Path):
+    commands = tmp_path / "commands.ndjson"
+    commands.write_text(
+        json.dumps({"id": "c1", "type": "start"}) + "\n" + json.dumps({"id": "c2", "type": "end"}) + "\n",
+        encoding="utf-8",
+    )
+    backend = NdjsonBackend(tmp_path / "out.ndjson", commands_path=commands)
+
+    backend.create_session("s-1", "dev-1", "2025-01-01T00:00:00+00:00", title="Lecture")
+    backend.emit_ticks([("s-1", {"engagementScore": 55}, 0)], doc_ids=["d1"])
+    assert backend.fetch_pending_command("dev-1") == ("c1", {"id": "c1", "type": "start"})
+    assert [cid for cid, _ in backend.fetch_pending_commands("dev-1", 10)] == ["c1", "c2"]
+    assert [cid for cid, _ in backend.fetch_pending_commands("dev-1", 1)] == ["c1"]
+    backend.mark_command("dev-1", "c1", "processed")
+    backend.mark_command("dev-1", "c2", "processed")
+    assert backend.fetch_pending_command("dev-1") is None
+    backend.close()
+
+    lines = [json.loads(line) for line in (tmp_path / "out.ndjson").read_text().splitlines()]
+    assert [line["op"] for line in lines] == ["create_session", "tick", "mark_command", "mark_command"]
+    assert lines[1]["docId"] == "d1"
+    assert lines[1]["engagementScore"] == 55
+
+
+def test_firestore_bucket_mode_writes_one_array_union_per_bucket():
+    db = _FakeDb()
+    backend = FirestoreBackend(db=db, bucket_seconds=60)
+
+    ticks = [
+        ("s-1", {"engagementScore": 50, "timestamp": f"t{i}"}, i * 20)
+        for i in range(5)  # seconds 0, 20, 40, 60, 80 -> buckets 0 and 1
+    ]
+    assert backend.emit_ticks(ticks) == ["000000", "000000", "000000", "000001", "000001"]
+
+    (writes,) = db.commits
+    assert [path for path, _ in writes] == [
+        "sessions/s-1/liveBuckets/000000",
+        "sessions/s-1/liveBuckets/000001",
+    ]
+    _, data = writes[1]
+    assert data["bucketStart"] == 60
+    assert data["points"].values == [
+        {"timeSinceStart": 60, "engagementScore": 50, "timestamp": "t3"},
+        {"timeSinceStart": 80, "engagementScore": 50, "timestamp": "t4"},
+    ]
+    assert backend.live_data_layout() == {
+        "type": "buckets",
+        "collection": "liveBuckets",
+        "bucketSeconds": 60,
+    }
+
+
+def test_memory_bucket_mode_groups_points_and_ignores_replays():
+    backend = MemoryBackend(bucket_seconds=30)
+    backend.create_session("s-1", "dev-1", "2025-01-01T00:00:00+00:00")
+
+    ticks = [("s-1", {"engagementScore": i, "timestamp": f"t{i}"}, i * 10) for i in range(4)]
+    backend.emit_ticks(ticks)
+    backend.emit_ticks(ticks[-1:])  # retried write
+
+    buckets = backend.live_buckets["s-1"]
+    assert {bid: len(b["points"]) for bid, b in buckets.items()} == {"000000": 3, "000001": 1}
+    assert backend.sessions["s-1"]["liveDataLayout"]["bucketSeconds"] == 30
+
+
+def test_memory_backend_appends_rollup_windows_per_resolution():
+    backend = MemoryBackend()
+    windows = [
+        {"resolutionSeconds": 10, "windowStart": 0, "count": 2, "mean": 50.0, "min": 40, "max": 60},
+        {"resolutionSeconds": 60, "windowStart": 0, "count": 2, "mean": 50.0, "min": 40, "max": 60},
+    ]
+    backend.emit_rollups("s-1", windows)
+    backend.emit_rollups("s-1", windows[:1])  # retried write
+
+    assert {doc_id: len(w) for doc_id, w in backend.rollups["s-1"].items()} == {"10s": 1, "60s": 1}
+
+
+def test_memory_backend_tracks_device_live_state():
+    backend = MemoryBackend()
+    backend.update_device_live("dev-1", {"sessionId": "s-1", "engagementScore": 70})
+    assert backend.devices["dev-1"]["live"]["engagementScore"] == 70
+
+    backend.update_device_live("dev-1", None)
+    assert backend.devices["dev-1"]["live"] is None
+
+
+def test_firestore_create_session_batches_writes_and_caches_device_owner():
+    db = _FakeDb(docs={"devices/dev-1": {"ownerUserId": "user-1"}})
+    backend = FirestoreBackend(db=db, device_listener=False)
+
+    for session_id in ("s-1", "s-2"):
+        backend.create_session(session_id, "dev-1", "2025-01-01T00:00:00+00:00")
+
+    assert len(db.reads) == 1
+    assert [[path for path, _ in commit] for commit in db.commits] == [
+        ["sessions/s-1", "devices/dev-1"],
+        ["sessions/s-2", "devices/dev-1"],
+    ]
+    assert db.commits[0][0][1]["userId"] == "user-1"
+
+
+def test_firestore_live_state_pauses_the_device_listener_during_a_session():
+    db = _FakeDb(docs={"devices/dev-1": {"ownerUserId": "user-1"}})
+    backend = FirestoreBackend(db=db)
+    backend._device_cache.warm("dev-1").join(timeout=1)
+    assert [w.is_active for w in db.watches] == [True]
+
+    for score in (70, 80):
+        backend.update_device_live("dev-1", {"sessionId": "s-1", "engagementScore": score})
+    assert [w.is_active for w in db.watches] == [False]
+    assert db.docs["devices/dev-1"]["live"]["engagementScore"] == 80
+
+    backend.create_session("s-2", "dev-1", "2025-01-01T00:00:00+00:00")
+    assert db.commits[-1][0][1]["userId"] == "user-1"
+    assert len(db.reads) == 1
+
+    backend.update_device_live("dev-1", None)
+    deadline = time.monotonic() + 1
+    while len(db.watches) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [w.is_active for w in db.watches] == [False, True]
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from engagement_monitor import camera as camera_mod
+from engagement_monitor.camera import Camera
+
+
+class _FakePicamera2:
+    def __init__(self):
+        self.calls = 0
+        self.fail_after: int | None = None
+        self.reject_lores = False
+        self.started = threading.Event()
+        self.streams: dict = {}
+
+    def create_preview_configuration(self, main, lores=None):
+        return {"main": main, "lores": lores}
+
+    def configure(self, config):
+        if config["lores"] is not None and self.reject_lores:
+            raise RuntimeError("lores stream must be YUV420")
+        self.streams = {name: cfg for name, cfg in config.items() if cfg is not None}
+
+    def start(self):
+        self.started.set()
+
+    def capture_array(self, stream):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise OSError("sensor timeout")
+        time.sleep(0.002)  # sensor frame period
+        width, height = self.streams[stream]["size"]
+        return np.full((height, width, 3), self.calls % 256, dtype=np.uint8)
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_picam(monkeypatch):
+    instance = _FakePicamera2()
+    monkeypatch.setattr(camera_mod, "_import_picamera2", lambda: lambda camera_num=0: instance)
+    return instance
+
+
+def test_continuous_camera_returns_freshest_frame_with_sequence(fake_picam):
+    cam = Camera(width=8, height=4, continuous=True)
+    cam.start()
+    try:
+        first = cam.capture_latest()
+        time.sleep(0.05)
+        out = np.empty((4, 8, 3), dtype=np.uint8)
+        second = cam.capture_latest(out=out)
+
+        assert second.array is out
+        assert second.sequence > first.sequence
+        assert second.timestamp >= first.timestamp
+        # Frame content is consistent (never torn across two sensor frames).
+        assert np.all(out == out[0, 0, 0])
+        assert cam.capture_frame().shape == (4, 8, 3)
+    finally:
+        cam.stop()
+
+
+def test_continuous_camera_surfaces_capture_failures(fake_picam):
+    fake_picam.fail_after = 2
+    cam = Camera(width=8, height=4, continuous=True)
+    cam.start()
+    time.sleep(0.05)
+    with pytest.raises(RuntimeError, match="Background capture failed"):
+        cam.capture_frame()
+    cam.stop()
+
+
+def test_on_demand_camera_numbers_frames(fake_picam):
+    cam = Camera(width=8, height=4)
+    cam.start()
+    frames = [cam.capture_latest() for _ in range(2)]
+    assert [f.sequence for f in frames] == [1, 2]
+    assert fake_picam.calls == 2
+    cam.stop()
+
+
+def test_lores_mode_captures_at_model_size_and_keeps_main_stream(fake_picam):
+    cam = Camera(width=64, height=48, continuous=True, lores_size=(16, 16))
+    cam.start()
+    try:
+        assert fake_picam.streams["lores"] == {"size": (16, 16), "format": "RGB888"}
+        assert cam.frame_shape == (16, 16)
+        assert cam.capture_frame().shape == (16, 16, 3)
+        assert cam.capture_full_frame().shape == (48, 64, 3)
+    finally:
+        cam.stop()
+
+
+def test_lores_mode_falls_back_to_main_stream_when_unsupported(fake_picam):
+    fake_picam.reject_lores = True
+    cam = Camera(width=64, height=48, lores_size=(16, 16))
+    cam.start()
+    assert cam.frame_shape == (48, 64)
+    assert cam.capture_frame().shape == (48, 64, 3)
+    cam.stop()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from engagement_monitor.cascade import CascadeDetector
+
+
+class _FakeDetector:
+    labels = ["raising_hand", "on_phone"]
+
+    def __init__(self, outputs):
+        self._outputs = iter(outputs)
+        self.calls = 0
+
+    def predict(self, _frame):
+        self.calls += 1
+        return np.array(next(self._outputs), dtype=np.float32)
+
+    def detections(self, probabilities, confidence_threshold):
+        return [
+            (label, float(p)) for label, p in zip(self.labels, probabilities) if p >= confidence_threshold
+        ]
+
+
+def test_full_model_runs_only_when_cheap_model_is_unsure_or_changes_label():
+    cheap = _FakeDetector(
+        [
+            [0.95, 0.05],  # first tick: no previous label -> escalate
+            [0.90, 0.10],  # confident, same label -> cheap result
+            [0.55, 0.45],  # unsure -> escalate
+            [0.05, 0.95],  # confident but label changed -> escalate
+            [0.10, 0.90],  # confident, same label -> cheap result
+        ]
+    )
+    full = _FakeDetector([[0.99, 0.01], [0.7, 0.3], [0.02, 0.98]])
+    cascade = CascadeDetector(cheap, full, escalation_threshold=0.8)
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    results = [cascade.detect(frame, 0.6) for _ in range(5)]
+
+    assert [r[0][0] for r in results] == ["raising_hand", "raising_hand", "raising_hand", "on_phone", "on_phone"]
+    assert results[1] == [("raising_hand", pytest.approx(0.9))]
+    assert results[2] == [("raising_hand", pytest.approx(0.7))]
+    assert (cheap.calls, full.calls) == (5, 3)
+    stats = cascade.stats()
+    assert stats["frames"] == 5 and stats["escalations"] == 3 and stats["escalationRate"] == 0.6
+
+    cascade.reset()
+    assert cascade.stats()["frames"] == 0
+
+
+def test_persistent_disagreement_escalates_only_when_the_cheap_label_changes():
+    # The cheap model is confidently "raising_hand" while the full model says "on_phone".
+    cheap = _FakeDetector([[0.95, 0.05]] * 6)
+    full = _FakeDetector([[0.1, 0.9]] * 6)
+    cascade = CascadeDetector(cheap, full, escalation_threshold=0.8)
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    for _ in range(6):
+        cascade.predict(frame)
+
+    assert (cheap.calls, full.calls) == (6, 1)
+    assert cascade.stats()["escalations"] == 1
+
+
+def test_cascade_rejects_models_with_different_labels():
+    other = _FakeDetector([])
+    other.labels = ["raising_hand"]
+
+    with pytest.raises(ValueError):
+        CascadeDetector(_FakeDetector([]), other)
@@ -0,0 +1,32 @@
+import numpy as np
+
+from engagement_monitor.change_gate import FrameChangeGate
+
+
+def test_static_scene_is_skipped_until_it_changes_or_goes_stale():
+    gate = FrameChangeGate(threshold=4.0, max_stale_seconds=5.0)
+    rng = np.random.default_rng(1)
+    frame = rng.integers(0, 200, size=(48, 64, 3), dtype=np.uint8)
+    noisy = (frame + rng.integers(0, 3, size=frame.shape)).astype(np.uint8)
+
+    assert gate.should_infer(frame, now=0.0)  # no reference yet
+    assert not gate.should_infer(noisy, now=0.5)  # sensor noise only
+    assert not gate.should_infer(frame, now=1.0)
+    assert gate.should_infer(frame, now=5.5)  # too stale
+    assert gate.should_infer(255 - frame, now=6.0)  # scene changed
+
+    assert gate.stats() == {"hits": 2, "misses": 2, "stale": 1, "hitRate": 0.4}
+    gate.reset()
+    assert gate.should_infer(255 - frame, now=7.0)
+    assert gate.stats()["misses"] == 1
+
+
+def test_slow_drift_is_measured_against_the_last_inferred_frame():
+    gate = FrameChangeGate(threshold=4.0, max_stale_seconds=60.0)
+    frame = np.full((24, 32, 3), 100, dtype=np.uint8)
+
+    assert gate.should_infer(frame, now=0.0)
+    results = [gate.should_infer(frame + step, now=float(step)) for step in range(1, 6)]
+
+    # Each step is +1 luma; the fourth step reaches the threshold.
+    assert results == [False, False, False, True, False]
@@ -0,0 +1,99 @@
+import queue
+import time
+
+from engagement_monitor.commands import CommandSubscriber
+
+
+class _FakeWatch:
+    is_active = True
+
+    def unsubscribe(self):
+        self.is_active = False
+
+
+def _drain(q: queue.Queue, count: int, timeout: float = 5.0) -> list:
+    items = []
+    deadline = time.monotonic() + timeout
+    while len(items) < count and time.monotonic() < deadline:
+        try:
+            items.append(q.get(timeout=0.05))
+        except queue.Empty:
+            pass
+    return items
+
+
+def test_listener_pushes_each_pending_command_once(monkeypatch):
+    callbacks = []
+
+    def _fake_watch(_device_id, on_commands):
+        callbacks.append(on_commands)
+        return _FakeWatch()
+
+    def _no_poll(_device_id, _limit):
+        raise AssertionError("should not poll while the listener is healthy")
+
+    monkeypatch.setattr("engagement_monitor.emitter.watch_commands", _fake_watch)
+    monkeypatch.setattr("engagement_monitor.emitter.fetch_pending_commands", _no_poll)
+
+    received: queue.Queue = queue.Queue()
+    sub = CommandSubscriber("dev-1", lambda cid, doc: received.put((cid, doc["type"])))
+    sub.start()
+    deadline = time.monotonic() + 5
+    while not callbacks and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    callbacks[0]([("c1", {"type": "start"})])
+    # Snapshot re-delivers c1 until it is marked processed.
+    callbacks[0]([("c1", {"type": "start"}), ("c2", {"type": "end"})])
+
+    assert _drain(received, 2) == [("c1", "start"), ("c2", "end")]
+    assert sub.mode == "listening"
+    sub.stop()
+    assert received.empty()
+
+
+def test_falls_back_to_polling_when_listener_unavailable(monkeypatch):
+    def _broken_watch(_device_id, _on_commands):
+        raise RuntimeError("listeners not supported")
+
+    pending = [("c1", {"type": "start"}), ("c1", {"type": "start"}), None, ("c2", {"type": "end"})]
+
+    def _fake_poll(_device_id, _limit):
+        command = pending.pop(0) if pending else None
+        return [command] if command else []
+
+    monkeypatch.setattr("engagement_monitor.emitter.watch_commands", _broken_watch)
+    monkeypatch.setattr("engagement_monitor.emitter.fetch_pending_commands", _fake_poll)
+
+    received: queue.Queue = queue.Queue()
+    sub = CommandSubscriber(
+        "dev-1",
+        lambda cid, _doc: received.put(cid),
+        poll_min=0.01,
+        poll_max=0.02,
+    )
+    sub.start()
+
+    assert _drain(received, 2) == ["c1", "c2"]
+    assert sub.mode == "polling"
+    sub.stop()
+
+
+def test_polling_is_not_blocked_by_a_command_that_failed_to_be_marked(monkeypatch):
+    from engagement_monitor import emitter
+    from engagement_monitor.backends import MemoryBackend
+
+    backend = MemoryBackend()
+    monkeypatch.setattr(emitter, "_backend", backend)
+    stuck = backend.add_command("dev-1", {"type": "start"})  # its mark_command never lands
+    newer = backend.add_command("dev-1", {"type": "end"})
+
+    received: queue.Queue = queue.Queue()
+    sub = CommandSubscriber(
+        "dev-1", lambda cid, _doc: received.put(cid), use_listener=False, poll_min=0.01, poll_max=0.02
+    )
+    sub.start()
+
+    assert _drain(received, 2) == [stuck, newer]
+    sub.stop()
+    assert received.empty()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from engagement_monitor.compare_models import compare, load_frames
+from engagement_monitor.preprocess import dequantize, input_lut
+
+
+def test_quantized_input_lut_maps_pixels_through_scale_and_zero_point():
+    # Teachable Machine uint8 export: real = (q - 128) * (1 / 128)
+    lut = input_lut(np.uint8, (1 / 128, 128))
+    assert lut.dtype == np.uint8
+    assert lut[0] == 0 and lut[255] == 255
+    assert abs(int(lut[128]) - 128) <= 1
+
+    int8 = input_lut(np.int8, (1 / 128, 0))
+    assert int8[0] == -128 and int8[255] == 127
+    # Integer inputs without quantization parameters keep the raw pixel value.
+    assert input_lut(np.uint8)[200] == 200
+    assert input_lut(np.float16)[255] == 1.0
+
+
+def test_dequantize_recovers_probabilities():
+    q = np.array([0, 128, 255], dtype=np.uint8)
+    np.testing.assert_allclose(dequantize(q, (1 / 256, 0)), [0.0, 0.5, 255 / 256])
+    assert dequantize(np.array([0.25], dtype=np.float16)).dtype == np.float32
+
+
+class _FakeDetector:
+    labels = ["raising_hand", "on_phone"]
+
+    def __init__(self, outputs):
+        self._outputs = outputs
+        self.calls = 0
+
+    def predict(self, frame):
+        self.calls += 1
+        return np.array(self._outputs[int(frame[0, 0, 0])], dtype=np.float32)
+
+
+def test_compare_reports_latency_and_label_agreement():
+    frames = [np.full((2, 2, 3), i, dtype=np.uint8) for i in range(4)]
+    float_model = _FakeDetector([[0.9, 0.1], [0.2, 0.8], [0.6, 0.4], [0.3, 0.7]])
+    quant_model = _FakeDetector([[0.8, 0.2], [0.3, 0.7], [0.4, 0.6], [0.3, 0.7]])
+
+    report = compare(float_model, quant_model, frames, warmup=1)
+
+    assert [row["agree"] for row in report["frames"]] == [True, True, False, True]
+    assert report["frames"][2]["maxAbsDiff"] == pytest.approx(0.2)
+    assert report["summary"]["frames"] == 4
+    assert report["summary"]["labelAgreement"] == 0.75
+    assert float_model.calls == quant_model.calls == 5
+
+
+def test_load_frames_reads_images_or_synthesizes(tmp_path):
+    from PIL import Image
+
+    Image.fromarray(np.zeros((6, 8, 3), dtype=np.uint8)).save(tmp_path / "a.png")
+
+    assert [f.shape for f in load_frames(tmp_path)] == [(6, 8, 3)]
+    assert len(load_frames(None, 3)) == 3
+    with pytest.raises(ValueError):
+        load_frames(tmp_path / "missing")
@@ -1,7 +1,17 @@
 import json
 from pathlib import Path
 
-from engagement_monitor.config import DEFAULT_CONFIG, load_config, reload_config
+from engagement_monitor.config import (
+    DEFAULT_CONFIG,
+    DEFAULT_INFERENCE_CONFIG,
+    DEFAULT_ZONES_CONFIG,
+    load_config,
+    load_zones_config,
+    reload_config,
+    validate_inference,
+    validate_weights,
+    zone_rects,
+)
 
 
 def test_load_config_returns_defaults_when_missing_file(tmp_path: Path):
@@ -43,3 +53,25 @@ def test_load_config_accepts_legacy_config_without_confidence_scoring_keys(tmp_p
     assert cfg["raising_hand"] == DEFAULT_CONFIG["raising_hand"]
     assert "useConfidenceInScoring" not in cfg
     assert "confidenceImpactStrength" not in cfg
+
+
+def test_zones_config_grid_explicit_zones_and_invalid_fallback(tmp_path: Path):
+    zones = tmp_path / "zones.json"
+    zones.write_text(json.dumps({"enabled": True, "rows": 1, "cols": 2}), encoding="utf-8")
+
+    cfg = load_zones_config(zones)
+    assert cfg["enabled"] is True
+    assert zone_rects(cfg) == [(0.0, 0.0, 0.5, 1.0), (0.5, 0.0, 0.5, 1.0)]
+
+    explicit = {"zones": [{"x": 0.5, "y": 0.5, "width": 0.8, "height": 0.25}], "includeFullFrame": True}
+    assert zone_rects({**cfg, **explicit}) == [(0.0, 0.0, 1.0, 1.0), (0.5, 0.5, 0.5, 0.25)]
+
+    zones.write_text(json.dumps({"enabled": True, "rows": 0}), encoding="utf-8")
+    assert load_zones_config(zones) == DEFAULT_ZONES_CONFIG
+
+
+def test_validate_helpers_report_schema_errors():
+    assert validate_weights(DEFAULT_CONFIG) == []
+    assert validate_inference(DEFAULT_INFERENCE_CONFIG) == []
+    assert validate_weights({**DEFAULT_CONFIG, "writing_notes": "high"})
+    assert validate_inference({**DEFAULT_INFERENCE_CONFIG, "delegate": "gpu"})
@@ -0,0 +1,73 @@
+import time
+
+from engagement_monitor.device_cache import DeviceCache
+
+
+class _Watch:
+    is_active = True
+
+    def __init__(self, on_doc):
+        self.on_doc = on_doc
+        self.closed = False
+
+    def unsubscribe(self):
+        self.closed = True
+
+
+def test_device_cache_expires_fetched_entries_after_ttl():
+    fetches: list[str] = []
+
+    def _fetch(device_id):
+        fetches.append(device_id)
+        return {"ownerUserId": f"owner-{len(fetches)}"}
+
+    cache = DeviceCache(_fetch, ttl=0.05)
+
+    assert cache.get("dev-1") == {"ownerUserId": "owner-1"}
+    assert cache.get("dev-1") == {"ownerUserId": "owner-1"}
+    time.sleep(0.06)
+    assert cache.get("dev-1") == {"ownerUserId": "owner-2"}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_device_cache_listener_keeps_entry_fresh_past_ttl():
+    watches: list[_Watch] = []
+
+    def _watch(device_id, on_doc):
+        watches.append(_Watch(on_doc))
+        return watches[-1]
+
+    cache = DeviceCache(lambda _id: {"ownerUserId": "owner-1"}, ttl=0.0, watch=_watch)
+    cache.warm("dev-1").join(timeout=1)
+
+    watches[0].on_doc({"ownerUserId": "owner-2"})
+    assert cache.get("dev-1") == {"ownerUserId": "owner-2"}
+    assert cache.misses == 0
+
+    cache.close()
+    assert watches[0].closed
+
+
+def test_unwatch_closes_the_listener_and_falls_back_to_the_ttl():
+    watches: list[_Watch] = []
+    fetches: list[str] = []
+
+    def _watch(device_id, on_doc):
+        watches.append(_Watch(on_doc))
+        return watches[-1]
+
+    def _fetch(device_id):
+        fetches.append(device_id)
+        return {"ownerUserId": "owner-1"}
+
+    cache = DeviceCache(_fetch, ttl=0.05, watch=_watch)
+    cache.warm("dev-1").join(timeout=1)
+
+    assert cache.unwatch("dev-1")
+    assert watches[0].closed
+    assert not cache.unwatch("dev-1")
+    assert cache.get("dev-1") == {"ownerUserId": "owner-1"}
+    assert len(fetches) == 1
+    time.sleep(0.06)
+    cache.get("dev-1")
+    assert len(fetches) == 2
@@ -0,0 +1,53 @@
+import numpy as np
+
+from engagement_monitor.downsample import StreamingTimeline, downsample_timeline, lttb
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000)
+    y = np.full(1000, 50)
+    y[137] = 100  # a single spike must survive downsampling
+    y[612] = 0
+
+    idx = lttb(x, y, 50)
+
+    assert len(idx) == 50
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+    assert 137 in idx and 612 in idx
+
+
+def test_downsample_timeline_returns_live_data_points():
+    times = list(range(0, 30, 3))
+    scores = [10 * i for i in range(10)]
+
+    assert downsample_timeline(times, scores, 20) == [
+        {"timeSinceStart": t, "engagementScore": s} for t, s in zip(times, scores)
+    ]
+    assert len(downsample_timeline(times, scores, 4)) == 4
+    assert downsample_timeline(times, scores, 0) == []
+    assert downsample_timeline([], [], 200) == []
+
+
+def test_streaming_timeline_stays_bounded_and_keeps_spikes():
+    timeline = StreamingTimeline(n_out=20, capacity=64)
+    for t in range(10_000):
+        timeline.add(t, 100 if t == 4321 else 50)
+
+    preview = timeline.preview()
+
+    assert len(timeline._times) == 64
+    assert len(preview) == 20
+    assert preview[0]["timeSinceStart"] == 0 and preview[-1]["timeSinceStart"] == 9999
+    assert {"timeSinceStart": 4321, "engagementScore": 100} in preview
+
+
+def test_streaming_timeline_matches_batch_preview_below_capacity():
+    times = list(range(0, 300, 3))
+    scores = [(7 * i) % 101 for i in range(100)]
+    timeline = StreamingTimeline(n_out=25)
+    for t, s in zip(times, scores):
+        timeline.add(t, s)
+
+    assert timeline.preview() == downsample_timeline(times, scores, 25)
+    assert StreamingTimeline(n_out=0).preview() == []
@@ -0,0 +1,145 @@
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from engagement_monitor import emitter
+from engagement_monitor.backends import MemoryBackend
+from engagement_monitor.camera import CapturedFrame
+from engagement_monitor.config import DEFAULT_CONFIG
+from engagement_monitor.hub import Hub, SharedDetector, benchmark, parse_devices
+
+
+class _FakeCamera:
+    def __init__(self):
+        self._sequence = itertools.count()
+
+    def capture_latest(self):
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        return CapturedFrame(frame, datetime.now(timezone.utc), next(self._sequence))
+
+
+class _FakeDetector:
+    """Stands in for a loaded Detector; flags overlapping (unserialized) invokes."""
+
+    labels = ["raising_hand", "on_phone"]
+    input_size = (224, 224)
+
+    def __init__(self):
+        self._busy = threading.Lock()
+        self.overlapped = False
+        self.calls = 0
+
+    def prepare_source(self, _source_shape):
+        pass
+
+    def predict(self, _frame):
+        if not self._busy.acquire(blocking=False):
+            self.overlapped = True
+            self._busy.acquire()
+        try:
+            self.calls += 1
+            time.sleep(0.001)
+            return np.array([0.9, 0.1], dtype=np.float32)
+        finally:
+            self._busy.release()
+
+    def detections(self, probabilities, threshold):
+        return [(l, float(p)) for l, p in zip(self.labels, probabilities) if p >= threshold]
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_hub_runs_concurrent_sessions_on_one_shared_model(monkeypatch):
+    backend = MemoryBackend()
+    monkeypatch.setattr(emitter, "_backend", backend)
+    detector = _FakeDetector()
+    hub = Hub(SharedDetector(detector), session_options={"show_indicator": False})
+    for device_id in ("room-a", "room-b"):
+        hub.add_camera(device_id, _FakeCamera())
+    config = dict(DEFAULT_CONFIG)
+    config["tickIntervalSeconds"] = 0.01
+
+    sessions = {d: hub.start_session(d, config) for d in hub.device_ids}
+    with pytest.raises(RuntimeError):
+        hub.start_session("room-a", config)
+    _wait_for(lambda: all(backend.live_data.get(s) for s in sessions.values()))
+    assert hub.active_sessions() == sessions
+    stats = hub.stats()
+
+    assert sorted(hub.end_all()) == ["room-a", "room-b"]
+    assert hub.active_sessions() == {}
+    assert not detector.overlapped
+    assert stats["activeSessions"] == 2
+    assert set(stats["perCamera"]) == {"room-a", "room-b"}
+    assert all(c["frames"] > 0 for c in stats["perCamera"].values())
+    for device_id, session_id in sessions.items():
+        assert backend.sessions[session_id]["overallScore"] == 100.0
+        assert backend.devices[device_id]["currentSessionId"] is None
+    assert sessions["room-a"] != sessions["room-b"]
+
+
+def test_hub_registry_rejects_duplicate_devices():
+    hub = Hub(SharedDetector(_FakeDetector()))
+    hub.add_camera("room-a", _FakeCamera())
+
+    with pytest.raises(ValueError):
+        hub.add_camera("room-a", _FakeCamera())
+    assert "room-a" in hub and len(hub) == 1
+    assert hub.end_session("room-a") is False
+
+
+def test_end_session_keeps_a_loop_that_outlives_the_timeout(monkeypatch):
+    monkeypatch.setattr(emitter, "_backend", MemoryBackend())
+    release = threading.Event()
+    capturing = threading.Event()
+
+    class _StuckCamera(_FakeCamera):
+        def capture_latest(self):
+            capturing.set()
+            release.wait(timeout=5)
+            return super().capture_latest()
+
+    hub = Hub(SharedDetector(_FakeDetector()), session_options={"show_indicator": False})
+    hub.add_camera("room-a", _StuckCamera())
+    config = dict(DEFAULT_CONFIG)
+    config["tickIntervalSeconds"] = 0.01
+    hub.start_session("room-a", config)
+    assert capturing.wait(timeout=2)
+
+    assert hub.end_session("room-a", timeout=0.05) is False
+    assert hub.get("room-a").is_running
+    with pytest.raises(RuntimeError):
+        hub.start_session("room-a", config)
+
+    release.set()
+    _wait_for(lambda: not hub.get("room-a").is_running)
+    assert not hub.get("room-a").is_running
+
+
+def test_benchmark_reports_throughput_per_camera_count():
+    rows = benchmark(_FakeDetector(), camera_counts=(1, 3), seconds=0.05, frame_shape=(4, 4))
+
+    assert [r["cameras"] for r in rows] == [1, 3]
+    for r in rows:
+        assert r["inferencesPerSecond"] > 0
+        assert r["perCameraFps"] == pytest.approx(r["inferencesPerSecond"] / r["cameras"], abs=0.01)
+        assert r["worstP95Ms"] >= r["waitMeanMs"] >= 0
+
+
+def test_parse_devices():
+    assert parse_devices("room-a:2, room-b") == {"room-a": 2, "room-b": 1}
+    assert parse_devices("a,b") == {"a": 0, "b": 1}
+    with pytest.raises(ValueError):
+        parse_devices("a,a")
+    with pytest.raises(ValueError):
+        parse_devices("a:1,b")
+    with pytest.raises(ValueError):
+        parse_devices("")
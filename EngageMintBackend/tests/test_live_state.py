@@ -0,0 +1,38 @@
+import threading
+import time
+
+from engagement_monitor.live_state import LivePublisher
+
+
+def _tick(score: int, second: int) -> dict:
+    return {"deviceId": "dev-1", "engagementScore": score, "timestamp": f"t{second}"}
+
+
+def test_live_publisher_coalesces_to_newest_state_and_clears():
+    writes: list[tuple[str, dict | None]] = []
+    written = threading.Event()
+
+    def _write(device_id, live):
+        writes.append((device_id, live))
+        written.set()
+
+    publisher = LivePublisher(_write, min_interval=0.3, window_seconds=3)
+    publisher.start()
+
+    publisher.update("s-1", _tick(10, 0), 0)
+    assert written.wait(1.0)
+    for second, score in enumerate([20, 30, 40, 50], start=1):
+        publisher.update("s-1", _tick(score, second), second)
+    time.sleep(0.5)
+
+    # One immediate write, then only the newest of the four burst updates.
+    assert len(writes) == 2
+    latest = writes[-1][1]
+    assert latest["engagementScore"] == 50
+    assert latest["timeSinceStart"] == 4
+    assert latest["rollingAverage"] == 40.0  # seconds 2..4
+    assert publisher.coalesced == 3
+
+    publisher.clear("dev-1")
+    publisher.close()
+    assert writes[-1] == ("dev-1", None)
@@ -1,11 +1,17 @@
+import itertools
 import json
 import threading
+from datetime import datetime, timezone
 from pathlib import Path
 
 import jsonschema
 
+from engagement_monitor import emitter
+from engagement_monitor.backends import MemoryBackend
+from engagement_monitor.camera import CapturedFrame
 from engagement_monitor.config import DEFAULT_CONFIG
 from engagement_monitor.main import run_session
+from engagement_monitor.pipeline import BLOCK, PipelineConfig
 from engagement_monitor.session import SessionManager
 
 
@@ -15,8 +21,11 @@ def _load_schema(path: str) -> dict:
 
 
 class _FakeCamera:
-    def capture_frame(self):
-        return b"fake-frame"
+    def __init__(self):
+        self._sequence = itertools.count()
+
+    def capture_latest(self):
+        return CapturedFrame(b"fake-frame", datetime.now(timezone.utc), next(self._sequence))
 
 
 class _FakeDetector:
@@ -47,6 +56,7 @@ def test_run_session_with_simulated_model_output(monkeypatch):
     emitted_ticks: list[dict] = []
     created_sessions: list[dict] = []
     completed_sessions: list[dict] = []
+    emitted_rollups: list[dict] = []
     shown_scores: list[int] = []
 
     def _fake_create_session(
@@ -68,14 +78,18 @@ def test_run_session_with_simulated_model_output(monkeypatch):
         emitted_ticks.append(payload)
         return f"tick-{len(emitted_ticks)}"
 
-    def _fake_complete_session(session_id: str, ended_at: str, summary: dict):
+    def _fake_complete_session(session_id: str, ended_at: str, summary: dict, timeline=None):
         completed_sessions.append(
-            {"session_id": session_id, "ended_at": ended_at, "summary": summary}
+            {"session_id": session_id, "ended_at": ended_at, "summary": summary, "timeline": timeline}
         )
 
     monkeypatch.setattr("engagement_monitor.emitter.create_session", _fake_create_session)
     monkeypatch.setattr("engagement_monitor.emitter.emit_tick", _fake_emit_tick)
     monkeypatch.setattr("engagement_monitor.emitter.complete_session", _fake_complete_session)
+    monkeypatch.setattr(
+        "engagement_monitor.emitter.emit_rollups",
+        lambda _session_id, rollups: emitted_rollups.extend(rollups),
+    )
     monkeypatch.setattr("engagement_monitor.indicator.show", lambda score: shown_scores.append(score))
 
     config = dict(DEFAULT_CONFIG)
@@ -104,6 +118,9 @@ def test_run_session_with_simulated_model_output(monkeypatch):
 
     for tick in emitted_ticks:
         jsonschema.validate(tick, metric_schema)
+    # Each tick carries rolling metrics that already include it.
+    assert [t["rolling"]["30s"]["count"] for t in emitted_ticks] == [1, 2, 3]
+    assert emitted_ticks[-1]["rolling"]["300s"]["sma"] == 46.67
 
     assert len(completed_sessions) == 1
     assert completed_sessions[0]["session_id"] == session.session_id
@@ -115,3 +132,267 @@ def test_run_session_with_simulated_model_output(monkeypatch):
     assert summary_payload["averageEngagement"] == 46.67
     assert summary_payload["timelineRef"].endswith("/liveData")
     jsonschema.validate(summary_payload, summary_schema)
+
+    # Three ticks fit in the preview unchanged.
+    assert [p["engagementScore"] for p in completed_sessions[0]["timeline"]] == [100, 40, 0]
+
+    # All ticks fall in the first window, flushed as partial rollups at session end.
+    assert [r["resolutionSeconds"] for r in emitted_rollups] == [10, 60, 300]
+    assert all(r["count"] == 3 and r["mean"] == 46.67 for r in emitted_rollups)
+
+
+def test_run_session_writes_through_memory_backend(monkeypatch):
+    backend = MemoryBackend()
+    monkeypatch.setattr(emitter, "_backend", backend)
+    monkeypatch.setattr("engagement_monitor.indicator.show", lambda score: None)
+
+    stop_event = threading.Event()
+    config = dict(DEFAULT_CONFIG)
+    config["tickIntervalSeconds"] = 0
+
+    mgr = SessionManager()
+    session = mgr.start_session("dev-test", session_name="Algebra")
+    summary_payload = run_session(
+        session_mgr=mgr,
+        device_id="dev-test",
+        config=config,
+        camera=_FakeCamera(),
+        detector=_FakeDetector([[("raising_hand", 0.9)], [("on_phone", 0.9)]], stop_event),
+        stop_event=stop_event,
+    )
+
+    doc = backend.sessions[session.session_id]
+    assert doc["title"] == "Algebra"
+    assert doc["overallScore"] == summary_payload["averageEngagement"] == 50.0
+    scores = [d["engagementScore"] for d in backend.live_data[session.session_id].values()]
+    assert scores == [100, 0]
+    assert backend.devices["dev-test"]["currentSessionId"] is None
+
+
+def test_run_session_pipelined_scores_every_inferred_frame(monkeypatch):
+    backend = MemoryBackend()
+    monkeypatch.setattr(emitter, "_backend", backend)
+    monkeypatch.setattr("engagement_monitor.indicator.show", lambda score: None)
+
+    stop_event = threading.Event()
+    config = dict(DEFAULT_CONFIG)
+    config["tickIntervalSeconds"] = 0
+
+    mgr = SessionManager()
+    session = mgr.start_session("dev-test")
+    summary_payload = run_session(
+        session_mgr=mgr,
+        device_id="dev-test",
+        config=config,
+        camera=_FakeCamera(),
+        detector=_FakeDetector(
+            [[("raising_hand", 0.9)], [("writing_notes", 0.9)], [("on_phone", 0.9)]], stop_event
+        ),
+        stop_event=stop_event,
+        pipeline=PipelineConfig(queue_size=2, backpressure=BLOCK),
+    )
+
+    live = sorted(backend.live_data[session.session_id].values(), key=lambda d: d["timeSinceStart"])
+    assert [d["engagementScore"] for d in live] == [100, 80, 0]
+    assert summary_payload["tickCount"] == 3
+
+
+class _FakeZoneDetector:
+    def __init__(self, zones_per_tick, stop_event: threading.Event):
+        self._zones_per_tick = zones_per_tick
+        self._stop_event = stop_event
+        self._idx = 0
+
+    def detect_zones(self, _frame, _confidence_threshold):
+        zones = self._zones_per_tick[self._idx]
+        self._idx += 1
+        if self._idx >= len(self._zones_per_tick):
+            self._stop_event.set()
+        return zones
+
+
+def test_run_session_scores_detections_from_every_zone(monkeypatch):
+    backend = MemoryBackend()
+    monkeypatch.setattr(emitter, "_backend", backend)
+    monkeypatch.setattr("engagement_monitor.indicator.show", lambda score: None)
+
+    stop_event = threading.Event()
+    config = dict(DEFAULT_CONFIG)
+    config["tickIntervalSeconds"] = 0
+
+    mgr = SessionManager()
+    session = mgr.start_session("dev-test")
+    run_session(
+        session_mgr=mgr,
+        device_id="dev-test",
+        config=config,
+        camera=_FakeCamera(),
+        detector=_FakeZoneDetector(
+            [
+                [[("raising_hand", 0.9)], [], [("on_phone", 0.9)]],  # (100 + 0) / 2
+                [[("writing_notes", 0.9)], [("writing_notes", 0.8)], []],  # 80
+            ],
+            stop_event,
+        ),
+        stop_event=stop_event,
+        zones=True,
+    )
+
+    live = sorted(backend.live_data[session.session_id].values(), key=lambda d: d["timeSinceStart"])
+    assert [d["engagementScore"] for d in live] == [50, 80]
+
+
+def test_run_session_reuses_detections_while_the_scene_is_static(monkeypatch):
+    import numpy as np
+
+    from engagement_monitor.change_gate import FrameChangeGate
+
+    backend = MemoryBackend()
+    monkeypatch.setattr(emitter, "_backend", backend)
+    monkeypatch.setattr("engagement_monitor.indicator.show", lambda score: None)
+
+    frames = iter([np.zeros((8, 8, 3), np.uint8)] * 3 + [np.full((8, 8, 3), 255, np.uint8)])
+
+    class _Camera(_FakeCamera):
+        def capture_latest(self):
+            return CapturedFrame(next(frames), datetime.now(timezone.utc), next(self._sequence))
+
+    stop_event = threading.Event()
+    inferred: list[int] = []
+
+    class _Detector:
+        def detect(self, _frame, _confidence_threshold):
+            inferred.append(1)
+            return [("raising_hand", 0.9)] if len(inferred) == 1 else [("on_phone", 0.9)]
+
+    config = dict(DEFAULT_CONFIG)
+    config["tickIntervalSeconds"] = 0
+    gate = FrameChangeGate(max_stale_seconds=60)
+    original = gate.should_infer
+
+    def _should_infer(frame, now=None):
+        if gate.hits + gate.misses + gate.stale == 3:
+            stop_event.set()
+        return original(frame, now)
+
+    monkeypatch.setattr(gate, "should_infer", _should_infer)
+
+    mgr = SessionManager()
+    session = mgr.start_session("dev-test")
+    run_session(
+        session_mgr=mgr,
+        device_id="dev-test",
+        config=config,
+        camera=_Camera(),
+        detector=_Detector(),
+        stop_event=stop_event,
+        change_gate=gate,
+    )
+
+    live = sorted(backend.live_data[session.session_id].values(), key=lambda d: d["timeSinceStart"])
+    assert [d["engagementScore"] for d in live] == [100, 100, 100, 0]
+    assert len(inferred) == 2
+    assert gate.stats()["hits"] == 2
+
+
+def test_run_session_compiled_scoring_scores_raw_probabilities(monkeypatch, tmp_path, caplog):
+    import logging
+
+    import numpy as np
+
+    from engagement_monitor.recording import ProbabilityRecorder, load_recording
+
+    backend = MemoryBackend()
+    monkeypatch.setattr(emitter, "_backend", backend)
+    monkeypatch.setattr("engagement_monitor.indicator.show", lambda score: None)
+
+    stop_event = threading.Event()
+    outputs = iter([[0.9, 0.05, 0.05], [0.4, 0.1, 0.5], [0.05, 0.9, 0.05]])
+
+    class _Detector:
+        labels = ["raising_hand", "on_phone", "writing_notes"]
+
+        def predict(self, _frame):
+            probabilities = np.array(next(outputs), dtype=np.float32)
+            if probabilities[1] == np.float32(0.9):
+                stop_event.set()
+            return probabilities
+
+    config = dict(DEFAULT_CONFIG)
+    config["tickIntervalSeconds"] = 0
+
+    mgr = SessionManager()
+    session = mgr.start_session("dev-test")
+    caplog.set_level(logging.INFO, logger="engagement_monitor.detector")
+    run_session(
+        session_mgr=mgr,
+        device_id="dev-test",
+        config=config,
+        camera=_FakeCamera(),
+        detector=_Detector(),
+        stop_event=stop_event,
+        compiled_scoring=True,
+        recorder=ProbabilityRecorder(tmp_path),
+    )
+
+    live = sorted(backend.live_data[session.session_id].values(), key=lambda d: d["timeSinceStart"])
+    # Nothing reaches 0.6 on the second tick.
+    assert [d["engagementScore"] for d in live] == [100, 0, 0]
+    recording = load_recording(tmp_path / f"{session.session_id}.npz")
+    assert recording["scores"].tolist() == [100, 0, 0]
+    assert recording["probabilities"].shape == (3, 3)
+    states = [r.getMessage() for r in caplog.records if r.getMessage().startswith("state=")]
+    assert states == ["state=raising_hand conf=0.90", "state=none", "state=on_phone conf=0.90"]
+
+
+def test_seat_zones_read_the_main_stream_instead_of_lores(monkeypatch):
+    from engagement_monitor.main import _camera_lores
+
+    monkeypatch.delenv("CAMERA_LORES", raising=False)
+    assert _camera_lores({"cameraLores": True}, zones_enabled=False) is True
+    assert _camera_lores({"cameraLores": True}, zones_enabled=True) is False
+    monkeypatch.setenv("CAMERA_LORES", "1")
+    assert _camera_lores({"cameraLores": False}, zones_enabled=True) is False
+
+
+def test_ticks_are_stamped_with_capture_time_and_repeated_frames_are_not_rescored(monkeypatch):
+    from datetime import timedelta
+
+    emitted: list[dict] = []
+    monkeypatch.setattr(emitter, "_backend", MemoryBackend())
+    monkeypatch.setattr(
+        "engagement_monitor.emitter.emit_tick",
+        lambda _session_id, payload, _time_since_start: emitted.append(payload),
+    )
+    monkeypatch.setattr("engagement_monitor.indicator.show", lambda score: None)
+
+    mgr = SessionManager()
+    session = mgr.start_session("dev-test")
+    captured_at = session.started_at + timedelta(seconds=1)
+    stop_event = threading.Event()
+
+    class _Camera:
+        def __init__(self):
+            self._sequences = iter([0, 0, 1])
+
+        def capture_latest(self):
+            sequence = next(self._sequences)
+            if sequence == 1:
+                stop_event.set()
+            return CapturedFrame(b"fake-frame", captured_at + timedelta(seconds=sequence), sequence)
+
+    config = dict(DEFAULT_CONFIG)
+    config["tickIntervalSeconds"] = 0
+    run_session(
+        session_mgr=mgr,
+        device_id="dev-test",
+        config=config,
+        camera=_Camera(),
+        detector=_FakeDetector([[("raising_hand", 0.9)]] * 3, threading.Event()),
+        stop_event=stop_event,
+    )
+
+    assert [t["timestamp"] for t in emitted] == [
+        captured_at.isoformat(),
+        (captured_at + timedelta(seconds=1)).isoformat(),
+    ]
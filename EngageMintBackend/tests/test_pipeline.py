@@ -0,0 +1,104 @@
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from engagement_monitor.camera import CapturedFrame
+from engagement_monitor.pipeline import BLOCK, DROP_OLDEST, Handoff, PipelineConfig, run_pipeline
+
+
+def test_handoff_drop_oldest_keeps_the_freshest_items():
+    handoff = Handoff(maxsize=2, backpressure=DROP_OLDEST)
+    stop = threading.Event()
+    for item in range(5):
+        assert handoff.put(item, stop)
+
+    assert [handoff.get(), handoff.get(), handoff.get(timeout=0)] == [3, 4, None]
+    assert handoff.dropped == 3
+
+
+def _captured(sequence: int) -> CapturedFrame:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return CapturedFrame(sequence, start + timedelta(seconds=sequence), sequence)
+
+
+def test_handoff_block_gives_up_once_stopped():
+    handoff = Handoff(maxsize=1, backpressure=BLOCK)
+    stop = threading.Event()
+    assert handoff.put("a", stop)
+    stop.set()
+    assert handoff.put("b", stop) is False
+
+
+def test_run_pipeline_overlaps_stages_and_delivers_in_order():
+    stop = threading.Event()
+    frames = iter(range(1000))
+    delivered: list[int] = []
+    stamps: list[datetime] = []
+
+    def _detect(frame):
+        time.sleep(0.01)
+        if frame == 5:
+            stop.set()
+        return [("frame", frame)]
+
+    def _on_detections(timestamp, detections):
+        time.sleep(0.01)
+        delivered.append(detections[0][1])
+        stamps.append(timestamp)
+
+    stats = run_pipeline(
+        lambda: _captured(next(frames)),
+        _detect,
+        _on_detections,
+        tick_interval=0,
+        stop_event=stop,
+        config=PipelineConfig(queue_size=1, backpressure=BLOCK),
+    )
+
+    # Every inferred frame is delivered, including the one in flight at stop.
+    assert delivered == list(range(6))
+    # Each tick carries its frame's capture time, not the time it was delivered.
+    assert stamps == [_captured(n).timestamp for n in range(6)]
+    assert stats["inferred"] == stats["processed"] == 6
+    assert stats["dropped"] == 0
+
+
+def test_run_pipeline_skips_frames_it_already_captured():
+    stop = threading.Event()
+    sequences = itertools.chain([0, 0, 1, 1, 1], itertools.repeat(2))
+    inferred: list[int] = []
+
+    def _detect(frame):
+        inferred.append(frame)
+        if frame == 2:
+            stop.set()
+        return []
+
+    stats = run_pipeline(
+        lambda: _captured(next(sequences)),
+        _detect,
+        lambda *_: None,
+        tick_interval=0,
+        stop_event=stop,
+        config=PipelineConfig(queue_size=4, backpressure=BLOCK),
+    )
+
+    assert inferred == [0, 1, 2]
+    assert stats["captured"] == 3
+    assert stats["repeated"] >= 3
+
+
+def test_run_pipeline_surfaces_stage_errors():
+    def _capture():
+        raise OSError("camera unplugged")
+
+    with pytest.raises(OSError, match="camera unplugged"):
+        run_pipeline(_capture, lambda f: [], lambda *_: None, 0, threading.Event())
+
+
+def test_pipeline_config_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        PipelineConfig(backpressure="latest")
@@ -0,0 +1,278 @@
+import numpy as np
+
+from engagement_monitor.detector import _apply_frame_preprocessing, _preprocess_pil
+from engagement_monitor.preprocess import FramePreprocessor, ZonePreprocessor, input_lut
+
+
+def _box_reference(frame: np.ndarray, out_h: int, out_w: int, row_taps=None, col_taps=None) -> np.ndarray:
+    """Mean of evenly spaced samples over each output pixel's footprint."""
+    row_taps = row_taps or -(-frame.shape[0] // out_h)
+    col_taps = col_taps or -(-frame.shape[1] // out_w)
+    rows = ((np.arange(out_h)[:, None] + (np.arange(row_taps) + 0.5) / row_taps) * frame.shape[0] / out_h)
+    cols = ((np.arange(out_w)[:, None] + (np.arange(col_taps) + 0.5) / col_taps) * frame.shape[1] / out_w)
+    samples = frame[rows.astype(int)][:, :, cols.astype(int)]  # (out_h, row_taps, out_w, col_taps, 3)
+    return samples.astype(np.float64).mean(axis=(1, 3))
+
+
+def test_fused_preprocessing_matches_transform_then_resize_then_normalize():
+    rng = np.random.default_rng(3)
+    frame = rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+    pre = FramePreprocessor((14, 14), flip180=True, swap_red_blue=True, source_shape=(48, 64))
+    out = np.empty((14, 14, 3), dtype=np.float32)
+
+    result = pre.run(frame, out)
+
+    transformed = _apply_frame_preprocessing(frame, flip180=True, swap_red_blue=True)
+    expected = _box_reference(transformed, 14, 14) / 127.5 - 1.0
+    assert result is out
+    np.testing.assert_allclose(out, expected, atol=1e-5)
+
+
+def test_fused_preprocessing_tracks_pil_path_closely():
+    # Smooth gradients: box vs. bicubic resampling differ only slightly.
+    y, x = np.mgrid[0:480, 0:640]
+    frame = np.stack([x * 255 // 639, y * 255 // 479, (x + y) * 255 // 1118], axis=-1).astype(np.uint8)
+    out = np.empty((224, 224, 3), dtype=np.float32)
+
+    FramePreprocessor((224, 224), flip180=True, swap_red_blue=True).run(frame, out)
+    reference = _preprocess_pil(frame, (224, 224), flip180=True, swap_red_blue=True)[0]
+
+    assert np.abs(out - reference).max() < 0.03
+
+
+def test_fused_downscale_averages_high_frequency_detail_like_pil():
+    # One-pixel stripes alternating black/white: nearest-neighbour sampling at
+    # a ~2.9x downscale aliases them into coarse bands of pure black or white.
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame[:, ::2] = 255
+    frame[::2] = 255 - frame[::2]
+    out = np.empty((224, 224, 3), dtype=np.float32)
+
+    FramePreprocessor((224, 224)).run(frame, out)
+    reference = _preprocess_pil(frame, (224, 224), flip180=False, swap_red_blue=False)[0]
+
+    assert np.abs(out - reference).max() < 0.25
+    assert np.abs(out).max() < 0.15  # mid-gray, never a full black or white pixel
+
+
+def test_fused_preprocessing_handles_uint8_models_and_non_contiguous_frames():
+    frame = np.arange(8 * 8 * 3, dtype=np.uint8).reshape(8, 8, 3)
+    view = frame[:, ::-1]  # non-contiguous
+    out = np.empty((4, 4, 3), dtype=np.uint8)
+
+    FramePreprocessor((4, 4), dtype=np.uint8).run(view, out)
+
+    assert np.array_equal(out, np.round(_box_reference(view, 4, 4)))
+    assert input_lut(np.uint8)[200] == 200
+    assert input_lut(np.float32)[0] == -1.0
+
+
+class _FakeInterpreter:
+    def __init__(self, model_path: str, **options):
+        self.options = options
+        self.input = np.zeros((1, 4, 4, 3), dtype=np.float32)
+        self.invoked_with: list[np.ndarray] = []
+
+    def allocate_tensors(self):
+        pass
+
+    def get_input_details(self):
+        return [{"index": 0, "shape": np.array([1, 4, 4, 3]), "dtype": np.float32}]
+
+    def get_output_details(self):
+        return [{"index": 1}]
+
+    def tensor(self, index):
+        return lambda: self.input
+
+    def set_tensor(self, index, value):
+        self.input[...] = value
+
+    def invoke(self):
+        self.invoked_with.append(self.input.copy())
+
+    def get_tensor(self, index):
+        return np.array([[0.9, 0.1]], dtype=np.float32)
+
+
+def test_detector_writes_preprocessed_frame_into_input_tensor(monkeypatch, tmp_path):
+    import sys
+    import types
+
+    from engagement_monitor.detector import Detector
+
+    module = types.ModuleType("tflite_runtime.interpreter")
+    module.Interpreter = _FakeInterpreter
+    monkeypatch.setitem(sys.modules, "tflite_runtime", types.ModuleType("tflite_runtime"))
+    monkeypatch.setitem(sys.modules, "tflite_runtime.interpreter", module)
+    labels = tmp_path / "labels.txt"
+    labels.write_text("0 Raising Hand\n1 On phone\n", encoding="utf-8")
+
+    frame = np.random.default_rng(5).integers(0, 256, size=(8, 8, 3), dtype=np.uint8)
+    inputs = []
+    for fast in (True, False):
+        detector = Detector(model_path=tmp_path / "m.tflite", labels_path=labels, fast_preprocess=fast)
+        detector.load(source_shape=(8, 8))
+        assert detector.detect(frame) == [("raising_hand", np.float32(0.9))]
+        inputs.append(detector._interpreter.invoked_with[-1])
+
+    # The fused path wrote into the interpreter's own buffer; both are in [-1, 1].
+    assert inputs[0].shape == inputs[1].shape == (1, 4, 4, 3)
+    assert np.any(inputs[0] != 0)
+    assert inputs[0].min() >= -1.0 and inputs[0].max() <= 1.0
+
+
+def test_model_sized_frames_skip_resampling():
+    frame = np.random.default_rng(7).integers(0, 256, size=(6, 6, 3), dtype=np.uint8)
+    out = np.empty((6, 6, 3), dtype=np.uint8)
+
+    FramePreprocessor((6, 6), dtype=np.uint8, source_shape=(6, 6)).run(frame, out)
+    reference = _preprocess_pil(frame, (6, 6), flip180=False, swap_red_blue=False, dtype=np.uint8)
+
+    assert np.array_equal(out, frame)
+    assert np.array_equal(reference[0], frame)
+
+
+def test_run_batch_matches_per_frame_runs():
+    frames = np.random.default_rng(9).integers(0, 256, size=(3, 12, 16, 3), dtype=np.uint8)
+    pre = FramePreprocessor((6, 6), flip180=True, swap_red_blue=True)
+    batch = np.empty((3, 6, 6, 3), dtype=np.float32)
+    single = np.empty((6, 6, 3), dtype=np.float32)
+
+    pre.run_batch(frames, batch)
+
+    for frame, row in zip(frames, batch):
+        assert np.array_equal(pre.run(frame, single), row)
+
+
+class _BatchInterpreter(_FakeInterpreter):
+    """Resizable input; each item's output is derived from its mean input value."""
+
+    def __init__(self, model_path: str, **options):
+        super().__init__(model_path, **options)
+        self.resizes: list[list[int]] = []
+        self.invocations = 0
+
+    def resize_tensor_input(self, index, shape):
+        self.resizes.append(list(shape))
+        self.input = np.zeros(shape, dtype=np.float32)
+
+    def invoke(self):
+        self.invocations += 1
+
+    def get_tensor(self, index):
+        p = (self.input.reshape(len(self.input), -1).mean(axis=1) + 1) / 2
+        return np.stack([p, 1 - p], axis=1).astype(np.float32)
+
+
+def test_detect_batch_runs_one_invoke_and_matches_single_frame_detect(monkeypatch, tmp_path):
+    import sys
+    import types
+
+    from engagement_monitor.detector import Detector
+
+    module = types.ModuleType("tflite_runtime.interpreter")
+    module.Interpreter = _BatchInterpreter
+    monkeypatch.setitem(sys.modules, "tflite_runtime", types.ModuleType("tflite_runtime"))
+    monkeypatch.setitem(sys.modules, "tflite_runtime.interpreter", module)
+    labels = tmp_path / "labels.txt"
+    labels.write_text("0 Raising Hand\n1 On phone\n", encoding="utf-8")
+    frames = np.stack([np.full((8, 8, 3), v, dtype=np.uint8) for v in (255, 0, 128)])
+
+    for fast in (True, False):
+        detector = Detector(model_path=tmp_path / "m.tflite", labels_path=labels, fast_preprocess=fast)
+        detector.load(source_shape=(8, 8))
+        interpreter = detector._interpreter
+
+        probabilities, detections = detector.detect_batch(frames, confidence_threshold=0.6)
+
+        assert interpreter.invocations == 1
+        assert interpreter.resizes == [[3, 4, 4, 3]]
+        assert probabilities.shape == (3, 2)
+        assert [d[0][0] if d else None for d in detections] == ["raising_hand", "on_phone", None]
+        # Same batch size again: no resize; single-frame detect resizes back to 1.
+        detector.detect_batch(frames)
+        single = detector.detect(frames[0])
+        assert interpreter.resizes == [[3, 4, 4, 3], [1, 4, 4, 3]]
+        assert single == detections[0]
+
+
+def test_zone_preprocessor_matches_cropping_the_corrected_frame():
+    frame = np.random.default_rng(11).integers(0, 256, size=(40, 60, 3), dtype=np.uint8)
+    zones = [(0.0, 0.0, 1.0, 1.0), (0.5, 0.5, 0.5, 0.5), (0.25, 0.0, 0.25, 0.5)]
+    pre = ZonePreprocessor((5, 5), zones, flip180=True, swap_red_blue=True, source_shape=(40, 60))
+    out = np.empty((3, 5, 5, 3), dtype=np.float32)
+
+    pre.run(frame, out)
+
+    corrected = _apply_frame_preprocessing(frame, flip180=True, swap_red_blue=True)
+    crops = [corrected, corrected[20:, 30:], corrected[:20, 15:30]]
+    for crop, row in zip(crops, out):
+        # Every zone uses the tap count of the largest one (8 rows x 12 columns).
+        expected = _box_reference(crop, 5, 5, row_taps=8, col_taps=12) / 127.5 - 1.0
+        np.testing.assert_allclose(row, expected, atol=1e-5)
+    assert pre.zone_count == 3
+
+
+def test_detect_zones_classifies_every_zone_in_one_invoke(monkeypatch, tmp_path):
+    import sys
+    import types
+
+    from engagement_monitor.detector import Detector
+
+    module = types.ModuleType("tflite_runtime.interpreter")
+    module.Interpreter = _BatchInterpreter
+    monkeypatch.setitem(sys.modules, "tflite_runtime", types.ModuleType("tflite_runtime"))
+    monkeypatch.setitem(sys.modules, "tflite_runtime.interpreter", module)
+    monkeypatch.setattr(
+        "engagement_monitor.detector._load_preprocessing_from_training_capture_config",
+        lambda: (False, False),
+    )
+    labels = tmp_path / "labels.txt"
+    labels.write_text("0 Raising Hand\n1 On phone\n", encoding="utf-8")
+    # Left half white, right half black.
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    frame[:, :4] = 255
+
+    for fast in (True, False):
+        detector = Detector(model_path=tmp_path / "m.tflite", labels_path=labels, fast_preprocess=fast)
+        detector.set_zones([(0.0, 0.0, 0.5, 1.0), (0.5, 0.0, 0.5, 1.0), (0.0, 0.0, 1.0, 1.0)])
+        detector.load(source_shape=(8, 8))
+        interpreter = detector._interpreter
+
+        zones = detector.detect_zones(frame, confidence_threshold=0.6)
+        detector.detect_zones(frame, confidence_threshold=0.6)
+
+        assert detector.zone_count == 3
+        assert interpreter.invocations == 2
+        assert interpreter.resizes == [[3, 4, 4, 3]]
+        assert [[label for label, _ in zone] for zone in zones] == [["raising_hand"], ["on_phone"], []]
+
+
+def test_detect_batch_classifies_whole_frames_with_zones_configured(monkeypatch, tmp_path):
+    import sys
+    import types
+
+    from engagement_monitor.detector import Detector
+
+    module = types.ModuleType("tflite_runtime.interpreter")
+    module.Interpreter = _BatchInterpreter
+    monkeypatch.setitem(sys.modules, "tflite_runtime", types.ModuleType("tflite_runtime"))
+    monkeypatch.setitem(sys.modules, "tflite_runtime.interpreter", module)
+    labels = tmp_path / "labels.txt"
+    labels.write_text("0 Raising Hand\n1 On phone\n", encoding="utf-8")
+    frames = np.stack([np.full((8, 8, 3), v, dtype=np.uint8) for v in (255, 0, 128)])
+
+    for fast in (True, False):
+        detector = Detector(model_path=tmp_path / "m.tflite", labels_path=labels, fast_preprocess=fast)
+        detector.set_zones([(0.0, 0.0, 0.5, 1.0), (0.5, 0.0, 0.5, 1.0)])
+        detector.load(source_shape=(8, 8))
+        interpreter = detector._interpreter
+
+        probabilities, detections = detector.detect_batch(frames, confidence_threshold=0.6)
+        zones = detector.predict_zones(frames[0])
+
+        assert probabilities.shape == (3, 2)
+        assert [d[0][0] if d else None for d in detections] == ["raising_hand", "on_phone", None]
+        assert zones.shape == (2, 2)
+        assert interpreter.resizes == [[3, 4, 4, 3], [2, 4, 4, 3]]
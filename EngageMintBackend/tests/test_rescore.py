@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+
+from engagement_monitor.config import DEFAULT_CONFIG
+from engagement_monitor.recording import ProbabilityRecorder, load_recording
+from engagement_monitor.rescore import load_sessions, main, rescore, score_ticks
+from engagement_monitor.scorer import ScoringPlan
+
+LABELS = ["raising_hand", "on_phone", "writing_notes", "unlisted"]
+
+
+def _record(directory, session_id, ticks, weights, zones=1, seed=0):
+    rng = np.random.default_rng(seed)
+    plan = ScoringPlan.compile(weights, LABELS)
+    recorder = ProbabilityRecorder(directory)
+    recorder.start(session_id, "dev-1", LABELS, weights, "2026-01-01T00:00:00+00:00")
+    for t in range(ticks):
+        p = rng.dirichlet(np.full(len(LABELS), 0.4), size=zones).astype(np.float16)
+        p = p[0] if zones == 1 else p
+        recorder.add(t, p, plan.score(p))
+    return recorder.finish("2026-01-01T01:00:00+00:00")
+
+
+def test_recorder_round_trips_float16_rows(tmp_path):
+    path = _record(tmp_path, "s1", 5, DEFAULT_CONFIG, zones=3)
+
+    recording = load_recording(path)
+
+    assert recording["probabilities"].dtype == np.float16
+    assert recording["probabilities"].shape == (15, 4)
+    assert recording["rows_per_tick"].tolist() == [3] * 5
+    assert recording["labels"] == LABELS
+    assert recording["meta"]["sessionId"] == "s1"
+    assert ProbabilityRecorder(tmp_path).finish("x") is None
+
+
+def test_score_ticks_matches_scoring_plan_for_every_config():
+    rng = np.random.default_rng(4)
+    rows_per_tick = np.array([1, 2, 1, 3] * 50)
+    p = rng.dirichlet(np.full(len(LABELS), 0.4), size=int(rows_per_tick.sum()))
+    configs = [
+        DEFAULT_CONFIG,
+        {**DEFAULT_CONFIG, "useConfidenceInScoring": True, "confidenceThreshold": 0.3},
+        {**DEFAULT_CONFIG, "writing_notes": 10, "scoringMode": "expectation"},
+        {**DEFAULT_CONFIG, "useConfidenceInScoring": True, "scoringMode": "expectation"},
+    ]
+
+    scores = score_ticks(p, rows_per_tick, LABELS, configs)
+
+    starts = np.concatenate(([0], np.cumsum(rows_per_tick)[:-1]))
+    for c, config in enumerate(configs):
+        plan = ScoringPlan.compile(config, LABELS)
+        expected = [plan.score(p[s : s + n]) for s, n in zip(starts, rows_per_tick)]
+        assert scores[:, c].tolist() == expected
+
+
+def test_rescore_reports_deltas_against_recorded_weights(tmp_path, capsys):
+    _record(tmp_path, "a", 40, DEFAULT_CONFIG, seed=1)
+    _record(tmp_path, "b", 60, {**DEFAULT_CONFIG, "on_phone": 50}, seed=2)
+    sessions = load_sessions([tmp_path])
+
+    report = rescore(sessions, {"same": DEFAULT_CONFIG, "generous": {**DEFAULT_CONFIG, "on_phone": 100}})
+
+    assert report["sessions"] == 2 and report["ticks"] == 100
+    assert report["recordedScoresReproduced"] == 1.0
+    per_session = {row["sessionId"]: row for row in report["perSession"]}
+    assert per_session["a"]["same"] == per_session["a"]["recordedAverage"]
+    assert report["configs"]["generous"]["meanDelta"] > 0
+    assert report["configs"]["generous"]["minDelta"] > 0
+
+    candidate = tmp_path / "generous.json"
+    candidate.write_text(json.dumps({**DEFAULT_CONFIG, "on_phone": 100}), encoding="utf-8")
+    assert main([str(tmp_path), "--config", str(candidate), "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["configs"]["generous"]["meanDelta"] > 0
@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+import pytest
+
+from engagement_monitor.rolling import RollingMetrics, RollingWindow
+
+
+def test_rolling_window_sma_and_slope_cover_only_the_window():
+    window = RollingWindow(30)
+    for t in range(0, 120, 2):
+        window.add(t, 20 + t // 2)  # +30 points per minute
+
+    assert window.count == 15  # ticks at 90..118
+    assert window.sma == pytest.approx(sum(20 + t // 2 for t in range(90, 120, 2)) / 15)
+    assert window.slope == pytest.approx(30.0)
+
+
+def test_rolling_window_ema_is_time_aware():
+    window = RollingWindow(30)
+    window.add(0, 0)
+    window.add(30, 100)
+
+    assert window.ema == pytest.approx(100 * (1 - math.exp(-1)))
+    assert window.slope == 0.0  # the first tick has left the 30 s window
+
+
+def test_rolling_window_stays_exact_far_into_a_long_session():
+    window = RollingWindow(300)
+    for t in range(0, 86_400, 1):
+        window.add(t, 50 + (t % 2))
+
+    t = np.arange(86_100, 86_400)
+    assert window.count == 300
+    assert window.sma == pytest.approx(50.5)
+    assert window.slope == pytest.approx(60 * np.polyfit(t, 50 + t % 2, 1)[0], abs=1e-6)
+
+
+def test_rolling_metrics_key_windows_by_width():
+    metrics = RollingMetrics((300, 30, 0))
+    metrics.add(0, 80)
+
+    assert metrics.windows == (30, 300)
+    assert metrics.to_dict() == {
+        "30s": {"sma": 80.0, "ema": 80.0, "slopePerMinute": 0.0, "count": 1},
+        "300s": {"sma": 80.0, "ema": 80.0, "slopePerMinute": 0.0, "count": 1},
+    }
+    assert RollingMetrics(()).to_dict() == {}
@@ -0,0 +1,31 @@
+from engagement_monitor.rollups import RollupAccumulator, parse_resolutions
+
+
+def test_rollup_accumulator_emits_windows_as_they_close():
+    acc = RollupAccumulator((10, 60))
+
+    assert acc.add(0, 40) == []
+    assert acc.add(5, 80) == []
+    closed = acc.add(12, 10)  # crosses the first 10 s boundary only
+
+    assert closed == [
+        {"resolutionSeconds": 10, "windowStart": 0, "count": 2, "mean": 60.0, "min": 40, "max": 80},
+    ]
+
+    # A gap skips empty windows entirely.
+    closed = acc.add(65, 100)
+    assert [(w["resolutionSeconds"], w["windowStart"]) for w in closed] == [(10, 10), (60, 0)]
+    assert closed[1]["count"] == 3 and closed[1]["min"] == 10
+
+    tail = acc.close()
+    assert [(w["resolutionSeconds"], w["windowStart"], w["count"]) for w in tail] == [
+        (10, 60, 1),
+        (60, 60, 1),
+    ]
+    assert acc.close() == []
+
+
+def test_parse_resolutions():
+    assert parse_resolutions(None) == (10, 60, 300)
+    assert parse_resolutions("") == ()
+    assert parse_resolutions("5, 30") == (5, 30)
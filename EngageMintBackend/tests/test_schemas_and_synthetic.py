@@ -5,6 +5,7 @@ from pathlib import Path
 import jsonschema
 
 from engagement_monitor.schemas import build_summary_payload, build_tick_payload
+from engagement_monitor.session_stats import SessionStats
 from synthetic.generator import generate_session
 
 
@@ -33,6 +34,14 @@ def test_tick_and_summary_payloads_conform_to_schema():
 
     jsonschema.validate(tick, metric_schema)
     jsonschema.validate(summary, summary_schema)
+    assert "statistics" not in summary
+
+    stats = SessionStats()
+    stats.add(85, time_since_start=0)
+    with_stats = build_summary_payload(
+        "dev-1", sid, now, now, 1, 85.0, 1, f"sessions/{sid}/liveData", statistics=stats.to_dict()
+    )
+    jsonschema.validate(with_stats, summary_schema)
 
 
 def test_synthetic_generator_outputs_schema_valid_payloads():
@@ -1,5 +1,5 @@
 from engagement_monitor.config import DEFAULT_CONFIG
-from engagement_monitor.scorer import compute_score
+from engagement_monitor.scorer import compute_score, confidence_impact_strength
 
 
 def test_compute_score_empty_detections_returns_zeroes():
@@ -87,3 +87,64 @@ def test_compute_score_confidence_strength_partial_blend():
     # modifier = (1 - 0.5) + (0.5 * 0.7) = 0.85
     # final = 76.5 -> 76 (banker's rounding)
     assert score == 76
+
+
+def test_confidence_impact_strength_is_clamped_and_none_when_disabled():
+    assert confidence_impact_strength(DEFAULT_CONFIG) is None
+    enabled = {**DEFAULT_CONFIG, "useConfidenceInScoring": True}
+    assert confidence_impact_strength(enabled) == 0.35
+    assert confidence_impact_strength({**enabled, "confidenceImpactStrength": 1.5}) == 1.0
+
+
+def test_scoring_plan_matches_compute_score_on_thresholded_detections():
+    import numpy as np
+
+    from engagement_monitor.scorer import ScoringPlan
+
+    labels = [
+        "hands_on_head",
+        "head_down",
+        "looking_at_board",
+        "looking_away_long",
+        "on_phone",
+        "raising_hand",
+        "talking_to_group",
+        "writing_notes",
+        "unlisted",
+    ]
+    rng = np.random.default_rng(21)
+    for use_confidence, threshold in ((False, 0.6), (True, 0.6), (True, 0.1), (False, 0.05)):
+        weights = dict(DEFAULT_CONFIG)
+        weights["useConfidenceInScoring"] = use_confidence
+        weights["confidenceThreshold"] = threshold
+        plan = ScoringPlan.compile(weights, labels)
+        for _ in range(200):
+            p = rng.dirichlet(np.full(len(labels), 0.3)).astype(np.float32)
+            detections = [(l, float(c)) for l, c in zip(labels, p) if float(c) >= threshold]
+            assert plan.score(p) == compute_score(detections, weights)
+
+        # A zones x labels matrix scores like the concatenated zone detections.
+        zones = rng.dirichlet(np.full(len(labels), 0.3), size=4).astype(np.float32)
+        detections = [
+            (l, float(c)) for row in zones for l, c in zip(labels, row) if float(c) >= threshold
+        ]
+        assert plan.score(zones) == compute_score(detections, weights)
+
+
+def test_scoring_plan_expectation_mode_weights_labels_by_probability():
+    import numpy as np
+    import pytest
+
+    from engagement_monitor.scorer import ScoringPlan
+
+    weights = dict(DEFAULT_CONFIG)
+    weights["scoringMode"] = "expectation"
+    plan = ScoringPlan.compile(weights, ["raising_hand", "on_phone", "unlisted"])
+
+    # Unknown labels are ignored: (0.3 * 100 + 0.3 * 0) / 0.6
+    assert plan.score(np.array([0.3, 0.3, 0.4])) == 50
+    assert plan.score(np.array([0.0, 0.0, 1.0])) == 0
+
+    weights["scoringMode"] = "bogus"
+    with pytest.raises(ValueError):
+        ScoringPlan.compile(weights, ["raising_hand"])
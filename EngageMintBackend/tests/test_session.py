@@ -28,3 +28,37 @@ def test_session_manager_prevents_overlapping_sessions():
         assert False, "Expected RuntimeError for overlapping session"
     except RuntimeError:
         pass
+
+
+def test_session_manager_returns_closed_rollups_and_flushes_tail_on_end():
+    mgr = SessionManager(rollup_resolutions=(10,))
+    mgr.start_session("dev-1")
+
+    assert mgr.record_tick(50, time_since_start=0) == []
+    closed = mgr.record_tick(70, time_since_start=10)
+    assert [(w["windowStart"], w["mean"]) for w in closed] == [(0, 50.0)]
+
+    summary = mgr.end_session()
+    assert [(w["windowStart"], w["mean"]) for w in summary.final_rollups] == [(10, 70.0)]
+    assert summary.timeline_preview == [
+        {"timeSinceStart": 0, "engagementScore": 50},
+        {"timeSinceStart": 10, "engagementScore": 70},
+    ]
+
+
+def test_session_summary_carries_streaming_statistics():
+    mgr = SessionManager()
+    mgr.start_session("dev-1")
+    for t, score in enumerate([20, 45, 90, 75]):
+        mgr.record_tick(score, time_since_start=t)
+
+    summary = mgr.end_session()
+
+    assert summary.average_engagement == 57.5
+    assert summary.statistics["min"] == 20 and summary.statistics["max"] == 90
+    assert summary.statistics["percentiles"]["p50"] == 45
+    assert {k: v["ticks"] for k, v in summary.statistics["bands"].items()} == {
+        "red": 1,
+        "yellow": 1,
+        "green": 2,
+    }
@@ -0,0 +1,52 @@
+import random
+import statistics
+
+import pytest
+
+from engagement_monitor.indicator import band
+from engagement_monitor.session_stats import SessionStats
+
+
+def test_session_stats_match_batch_statistics():
+    rng = random.Random(7)
+    scores = [rng.randint(0, 100) for _ in range(5000)]
+    stats = SessionStats()
+    for i, score in enumerate(scores):
+        stats.add(score, time_since_start=i)
+
+    assert stats.count == len(scores)
+    assert stats.mean == sum(scores) / len(scores)
+    assert stats.variance == pytest.approx(statistics.pvariance(scores))
+    ordered = sorted(scores)
+    for q in (10, 50, 90):
+        assert stats.percentile(q) == ordered[max(0, -(-q * len(scores) // 100) - 1)]
+
+    result = stats.to_dict()
+    assert (result["min"], result["max"]) == (min(scores), max(scores))
+    for name in ("red", "yellow", "green"):
+        ticks = sum(1 for s in scores if band(s) == name)
+        assert result["bands"][name]["ticks"] == ticks
+        assert result["bands"][name]["fraction"] == round(ticks / len(scores), 4)
+    assert sum(b["seconds"] for b in result["bands"].values()) == pytest.approx(len(scores) - 1)
+
+
+def test_session_stats_credit_interval_to_current_band():
+    stats = SessionStats()
+    stats.add(90, time_since_start=0)
+    stats.add(10, time_since_start=5)
+    stats.add(50, time_since_start=6)
+
+    bands = stats.to_dict()["bands"]
+    assert (bands["green"]["seconds"], bands["red"]["seconds"], bands["yellow"]["seconds"]) == (
+        0.0,
+        5.0,
+        1.0,
+    )
+
+
+def test_empty_session_stats_serialize_to_zeros():
+    result = SessionStats().to_dict()
+
+    assert result["stdDev"] == 0.0
+    assert result["percentiles"]["p50"] == 0
+    assert result["bands"]["green"] == {"ticks": 0, "seconds": 0.0, "fraction": 0.0}
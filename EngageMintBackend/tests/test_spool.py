@@ -0,0 +1,214 @@
+from pathlib import Path
+
+from engagement_monitor.spool import SESSION_END, SESSION_START, TICK, Spool, SpoolDrainer
+
+
+def test_spool_preserves_order_and_survives_reopen(tmp_path: Path):
+    path = tmp_path / "spool.sqlite3"
+    spool = Spool(path)
+    spool.append(SESSION_START, {"sessionId": "s-1"})
+    spool.append(TICK, {"sessionId": "s-1", "timeSinceStart": 0})
+    spool.close()
+
+    reopened = Spool(path)
+    events = reopened.peek(10)
+    assert [(kind, body) for _seq, kind, body in events] == [
+        (SESSION_START, {"sessionId": "s-1"}),
+        (TICK, {"sessionId": "s-1", "timeSinceStart": 0}),
+    ]
+
+    reopened.ack(events[0][0])
+    assert reopened.depth() == 1
+    reopened.close()
+
+
+def test_spool_cap_drops_oldest_ticks_but_keeps_lifecycle_events(tmp_path: Path):
+    spool = Spool(tmp_path / "spool.sqlite3", max_events=3)
+    spool.append(SESSION_START, {"sessionId": "s-1"})
+    for tss in range(4):
+        spool.append(TICK, {"timeSinceStart": tss})
+    spool.append(SESSION_END, {"sessionId": "s-1"})
+
+    kinds = [(kind, body.get("timeSinceStart")) for _seq, kind, body in spool.peek(10)]
+    assert kinds == [(SESSION_START, None), (TICK, 3), (SESSION_END, None)]
+    assert spool.dropped == 3
+    spool.close()
+
+
+def test_drainer_replays_in_order_grouping_ticks_and_retries_failures(tmp_path: Path):
+    spool = Spool(tmp_path / "spool.sqlite3")
+    spool.append(SESSION_START, {"sessionId": "s-1"})
+    for tss in range(3):
+        spool.append(TICK, {"timeSinceStart": tss})
+    spool.append(SESSION_END, {"sessionId": "s-1"})
+
+    delivered: list[tuple[str, list]] = []
+    attempts = {"n": 0}
+
+    def _deliver(kind, bodies):
+        attempts["n"] += 1
+        if attempts["n"] == 2:
+            raise ConnectionError("wifi down")
+        delivered.append((kind, [b.get("timeSinceStart") for b in bodies]))
+
+    drainer = SpoolDrainer(spool, _deliver, batch_size=2, backoff_initial=0.01)
+    drainer.start()
+    assert drainer.stop(timeout=5)
+
+    assert delivered == [
+        (SESSION_START, [None]),
+        (TICK, [0, 1]),
+        (TICK, [2]),
+        (SESSION_END, [None]),
+    ]
+    assert drainer.failures == 1
+    assert spool.depth() == 0
+    spool.close()
+
+
+def test_poison_event_is_dead_lettered_without_blocking_later_events(tmp_path: Path):
+    spool = Spool(tmp_path / "spool.sqlite3")
+    spool.append(SESSION_START, {"sessionId": "s-1"})
+    for tss in range(4):
+        spool.append(TICK, {"timeSinceStart": tss})
+    spool.append(SESSION_END, {"sessionId": "s-1"})
+
+    delivered: list[tuple[str, list]] = []
+
+    def _deliver(kind, bodies):
+        if any(b.get("timeSinceStart") == 1 for b in bodies):
+            raise KeyError("payload")
+        delivered.append((kind, [b.get("timeSinceStart") for b in bodies]))
+
+    drainer = SpoolDrainer(spool, _deliver, batch_size=3, backoff_initial=0.01)
+    drainer.start()
+    assert drainer.stop(timeout=5)
+
+    assert delivered == [
+        (SESSION_START, [None]),
+        (TICK, [0]),
+        (TICK, [2]),
+        (TICK, [3]),
+        (SESSION_END, [None]),
+    ]
+    assert [(kind, body, error) for _seq, kind, body, error in spool.dead_letters()] == [
+        (TICK, {"timeSinceStart": 1}, "KeyError: 'payload'"),
+    ]
+    assert drainer.dead_lettered == 1
+    assert spool.stats()["deadLettered"] == 1
+    assert spool.depth() == 0
+    spool.close()
+
+
+class _CodedError(Exception):
+    def __init__(self, code):
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+def test_ticks_with_unrecognized_error_codes_are_dead_lettered_after_max_attempts(tmp_path: Path):
+    spool = Spool(tmp_path / "spool.sqlite3")
+    spool.append(TICK, {"timeSinceStart": 0})
+    spool.append(SESSION_END, {"sessionId": "s-1"})
+    attempts: list[str] = []
+
+    def _deliver(kind, bodies):
+        attempts.append(kind)
+        if kind == TICK:
+            raise _CodedError("UNKNOWN")
+
+    drainer = SpoolDrainer(spool, _deliver, backoff_initial=0.001, max_attempts=3)
+    drainer.start()
+    assert drainer.stop(timeout=5)
+
+    assert attempts == [TICK, TICK, TICK, SESSION_END]
+    assert [kind for _seq, kind, _body, _error in spool.dead_letters()] == [TICK]
+    spool.close()
+
+
+def test_lifecycle_events_are_only_dead_lettered_for_permanent_errors(tmp_path: Path):
+    spool = Spool(tmp_path / "spool.sqlite3")
+    spool.append(SESSION_START, {"sessionId": "s-1"})
+    spool.append(SESSION_END, {"sessionId": "bad"})
+    failures = {"n": 0}
+
+    def _deliver(kind, bodies):
+        if kind == SESSION_START and failures["n"] < 6:
+            failures["n"] += 1
+            raise _CodedError("UNKNOWN")
+        if bodies[0]["sessionId"] == "bad":
+            raise _CodedError(400)
+
+    drainer = SpoolDrainer(spool, _deliver, backoff_initial=0.001, backoff_max=0.001, max_attempts=2)
+    drainer.start()
+    assert drainer.stop(timeout=5)
+
+    assert [(kind, body) for _seq, kind, body, _error in spool.dead_letters()] == [
+        (SESSION_END, {"sessionId": "bad"}),
+    ]
+    spool.close()
+
+
+def test_offline_transport_errors_never_dead_letter_anything(tmp_path: Path):
+    from google.api_core.exceptions import RetryError
+    from google.auth.exceptions import TransportError
+
+    spool = Spool(tmp_path / "spool.sqlite3")
+    spool.append(SESSION_START, {"sessionId": "s-1"})
+    for tss in range(3):
+        spool.append(TICK, {"timeSinceStart": tss})
+    spool.append(SESSION_END, {"sessionId": "s-1"})
+    outage = iter(
+        [TransportError("token refresh: no route to host"), RetryError("deadline exceeded", None)] * 5
+        + [RuntimeError("unavailable")] * 5
+    )
+    delivered: list[str] = []
+
+    def _deliver(kind, bodies):
+        error = next(outage, None)
+        if error is not None:
+            raise error
+        delivered.append(kind)
+
+    drainer = SpoolDrainer(spool, _deliver, backoff_initial=0.001, backoff_max=0.001, max_attempts=2)
+    drainer.start()
+    assert drainer.stop(timeout=5)
+
+    assert delivered == [SESSION_START, TICK, SESSION_END]
+    assert spool.dead_letters() == []
+    assert drainer.failures == 15
+    spool.close()
+
+
+def test_network_errors_are_retried_rather_than_dead_lettered(tmp_path: Path):
+    spool = Spool(tmp_path / "spool.sqlite3")
+    spool.append(SESSION_START, {"sessionId": "s-1"})
+    attempts = {"n": 0}
+
+    def _deliver(kind, bodies):
+        attempts["n"] += 1
+        if attempts["n"] <= 4:
+            raise ConnectionError("wifi down")
+
+    drainer = SpoolDrainer(spool, _deliver, backoff_initial=0.001, backoff_max=0.001, max_attempts=2)
+    drainer.start()
+    assert drainer.stop(timeout=5)
+
+    assert attempts["n"] == 5
+    assert spool.dead_letters() == []
+    spool.close()
+
+
+def test_depth_is_tracked_without_recounting(tmp_path: Path):
+    path = tmp_path / "spool.sqlite3"
+    spool = Spool(path, max_events=2)
+    for tss in range(3):
+        spool.append(TICK, {"timeSinceStart": tss})
+    assert spool.depth() == 2
+    spool.ack(spool.peek(1)[0][0])
+    assert spool.depth() == 1
+    spool.close()
+
+    reopened = Spool(path)
+    assert reopened.depth() == 1
+    reopened.close()
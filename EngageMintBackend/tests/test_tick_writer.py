@@ -0,0 +1,167 @@
+import threading
+import time
+
+from engagement_monitor.tick_writer import TickWriter
+
+
+def test_tick_writer_drains_all_ticks_in_order_and_close_flushes():
+    written: list[tuple[str, int]] = []
+    writer = TickWriter(lambda sid, payload, tss: written.append((sid, tss)), max_queue=16)
+    writer.start()
+
+    for i in range(10):
+        writer.put("s-1", {"engagementScore": i}, i)
+
+    assert writer.close(timeout=5)
+    assert written == [("s-1", i) for i in range(10)]
+    assert writer.stats() == {
+        "queueDepth": 0,
+        "enqueued": 10,
+        "written": 10,
+        "batches": 10,
+        "dropped": 0,
+        "failed": 0,
+    }
+
+
+def test_tick_writer_drops_oldest_when_full_without_blocking():
+    release = threading.Event()
+    started = threading.Event()
+    written: list[int] = []
+
+    def _slow_write(_sid, _payload, tss):
+        started.set()
+        release.wait(timeout=5)
+        written.append(tss)
+
+    writer = TickWriter(_slow_write, max_queue=2)
+    writer.start()
+
+    writer.put("s-1", {}, 0)
+    assert started.wait(timeout=5)  # worker is now blocked on tick 0
+    for tss in range(1, 5):
+        writer.put("s-1", {}, tss)
+
+    assert writer.queue_depth == 2
+    assert writer.dropped == 2
+
+    release.set()
+    assert writer.close(timeout=5)
+    assert written == [0, 3, 4]
+
+
+def test_tick_writer_counts_failures_and_keeps_draining():
+    calls: list[int] = []
+
+    def _flaky_write(_sid, _payload, tss):
+        calls.append(tss)
+        if tss == 1:
+            raise ConnectionError("offline")
+
+    writer = TickWriter(_flaky_write)
+    writer.start()
+    for tss in range(3):
+        writer.put("s-1", {}, tss)
+
+    assert writer.flush(timeout=5)
+    assert calls == [0, 1, 2]
+    assert writer.failed == 1
+    assert writer.written == 2
+    writer.close()
+
+
+def test_tick_writer_batches_by_size():
+    batches: list[list[int]] = []
+    release = threading.Event()
+
+    def _write_batch(ticks):
+        release.wait(timeout=5)
+        batches.append([tss for _sid, _payload, tss in ticks])
+
+    writer = TickWriter(
+        lambda *_: None,
+        write_batch=_write_batch,
+        batch_size=3,
+        flush_interval=60,
+    )
+    for tss in range(7):
+        writer.put("s-1", {}, tss)
+    writer.start()
+    release.set()
+
+    assert writer.close(timeout=5)
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert writer.batches == 3
+    assert writer.written == 7
+
+
+def test_tick_writer_flushes_partial_batch_after_interval():
+    batches: list[list[int]] = []
+    writer = TickWriter(
+        lambda *_: None,
+        write_batch=lambda ticks: batches.append([t[2] for t in ticks]),
+        batch_size=100,
+        flush_interval=0.05,
+    )
+    writer.start()
+    writer.put("s-1", {}, 0)
+    writer.put("s-1", {}, 1)
+
+    deadline = time.monotonic() + 5
+    while not batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert batches == [[0, 1]]
+    writer.close()
+
+
+def test_tick_writer_flush_writes_a_partial_batch_when_the_queue_is_full():
+    batches: list[list[int]] = []
+    writer = TickWriter(
+        lambda *_: None,
+        write_batch=lambda ticks: batches.append([t[2] for t in ticks]),
+        max_queue=2,
+        batch_size=100,
+        flush_interval=60,
+    )
+    writer.put("s-1", {}, 0)
+    writer.put("s-1", {}, 1)  # queue is now full
+
+    flushed: list[bool] = []
+    flusher = threading.Thread(target=lambda: flushed.append(writer.flush(timeout=5)))
+    flusher.start()
+    time.sleep(0.05)
+    writer.start()
+    flusher.join(timeout=10)
+
+    assert flushed == [True]
+    assert batches == [[0, 1]]
+    writer.close()
+
+
+def test_tick_writer_stops_once_drained_even_if_close_times_out_on_a_full_queue():
+    release = threading.Event()
+    started = threading.Event()
+    written: list[int] = []
+
+    def _slow_write(_sid, _payload, tss):
+        started.set()
+        release.wait(timeout=5)
+        written.append(tss)
+
+    writer = TickWriter(_slow_write, max_queue=1)
+    before = set(threading.enumerate())
+    writer.start()
+    (worker,) = [t for t in set(threading.enumerate()) - before if t.name == "tick-writer"]
+
+    writer.put("s-1", {}, 0)
+    assert started.wait(timeout=5)  # worker is now blocked on tick 0
+    writer.put("s-1", {}, 1)  # queue is now full
+
+    assert writer.close(timeout=0.05) is False
+    release.set()
+    worker.join(timeout=5)
+
+    assert not worker.is_alive()
+    assert written == [0, 1]
+    assert writer.dropped == 0
@@ -1,7 +1,7 @@
 /* Utils + Libs */
 import { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
-import { getLiveData } from "../utils/fetchResponseData.js";
+import { getLiveState } from "../utils/fetchResponseData.js";
 import { startMachine, endMachine } from "../utils/postRequests.js";
 
 /* Layout Components */
@@ -66,32 +66,18 @@ export default function Home() {
 
     const interval = setInterval(async () => {
       try {
-        const { data } = await getLiveData();
-        const liveDataArray = data.liveData;
+        // The device maintains devices/{deviceId}.live, including a 3-second
+        // moving average, so this is a single-document read per poll.
+        const { data } = await getLiveState();
+        const live = data.live;
 
-        if (!liveDataArray?.length) {
+        if (!live || typeof live.rollingAverage !== "number") {
           setScore(0);
           return;
         }
 
-        const latestTime =
-          liveDataArray[liveDataArray.length - 1]?.timeSinceStart ?? 0;
-
-        // True 3-second moving average over the current session timeline.
-        // Keep only ticks whose timeSinceStart falls within [latestTime - 2, latestTime].
-        const threeSecondWindow = liveDataArray.filter(
-          item =>
-            typeof item.timeSinceStart === "number" &&
-            typeof item.engagementScore === "number" &&
-            latestTime - item.timeSinceStart <= 2 &&
-            latestTime - item.timeSinceStart >= 0
-        );
-
-        const movingAverage =
-          threeSecondWindow.reduce((sum, item) => sum + item.engagementScore, 0) /
-          (threeSecondWindow.length || 1);
-
-        const roundedValue = Math.round(movingAverage);
+        const latestTime = live.timeSinceStart ?? 0;
+        const roundedValue = Math.round(live.rollingAverage);
         setScore(roundedValue);
 
         setEngagementArray(prev => [...prev.slice(-3600), roundedValue]);
@@ -42,6 +42,26 @@ export async function getLiveData(deviceId = "handwashpi") {
 
 
 
+export async function getLiveState(deviceId = "handwashpi") {
+
+  const response = await fetch(`${API_BASE}/live/state?deviceId=${encodeURIComponent(deviceId)}`, {
+
+    headers: {
+
+      "Content-Type": "application/json",
+
+    },
+
+  });
+
+
+
+  return parseApiResponse(response);
+
+}
+
+
+
 export async function getAllSessionInfo(userId) {
 
   if (!userId) {
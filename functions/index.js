@@ -303,6 +303,51 @@ function validateComparisonInsight(value) {
   };
 }
 
+// Devices can store ticks either as one liveData doc per tick or appended into
+// time-bucketed liveBuckets docs (session.liveDataLayout.type === "buckets").
+// Both are returned to clients as the same flat liveData array.
+async function readBucketedLiveData(db, sessionId, limit) {
+  const snap = await db
+    .collection("sessions")
+    .doc(String(sessionId))
+    .collection("liveBuckets")
+    .orderBy("bucketStart", "asc")
+    .get();
+
+  const liveData = [];
+  snap.docs.forEach((doc) => {
+    const points = Array.isArray(doc.data()?.points) ? doc.data().points : [];
+    points
+      .slice()
+      .sort((a, b) => Number(a.timeSinceStart) - Number(b.timeSinceStart))
+      .forEach((point, index) => liveData.push({ id: `${doc.id}-${index}`, ...point }));
+  });
+  return Number.isFinite(limit) ? liveData.slice(0, limit) : liveData;
+}
+
+async function readLiveData(db, sessionId, session = null, limit = undefined) {
+  let layout = session?.liveDataLayout;
+  if (session === null) {
+    const sessionDoc = await db.collection("sessions").doc(String(sessionId)).get();
+    layout = sessionDoc.exists ? sessionDoc.data()?.liveDataLayout : null;
+  }
+  if (layout?.type === "buckets") {
+    return readBucketedLiveData(db, sessionId, limit);
+  }
+
+  const liveData = db.collection("sessions").doc(String(sessionId)).collection("liveData");
+  let query = liveData.orderBy("timeSinceStart", "asc");
+  if (Number.isFinite(limit)) query = query.limit(limit);
+
+  let snap;
+  try {
+    snap = await query.get();
+  } catch (_e) {
+    snap = await (Number.isFinite(limit) ? liveData.limit(limit) : liveData).get();
+  }
+  return snap.docs.map((doc) => ({ id: doc.id, ...doc.data() }));
+}
+
 async function getSessionWithLiveData(sessionId, liveLimit = 1000) {
   const db = getDb();
   const sessionDoc = await db.collection("sessions").doc(String(sessionId)).get();
@@ -312,26 +357,14 @@ async function getSessionWithLiveData(sessionId, liveLimit = 1000) {
   }
 
   const session = mapSessionDoc(sessionDoc);
-
-  let liveQuery = db
-    .collection("sessions")
-    .doc(String(sessionId))
-    .collection("liveData")
-    .orderBy("timeSinceStart", "asc")
-    .limit(Math.min(Math.max(Number(liveLimit) || 500, 1), 2000));
-
-  let liveSnap;
-  try {
-    liveSnap = await liveQuery.get();
-  } catch (_e) {
-    liveQuery = db.collection("sessions").doc(String(sessionId)).collection("liveData").limit(500);
-    liveSnap = await liveQuery.get();
-  }
-
-  return {
+  const liveData = await readLiveData(
+    db,
+    sessionId,
     session,
-    liveData: liveSnap.docs.map((doc) => ({ id: doc.id, ...doc.data() })),
-  };
+    Math.min(Math.max(Number(liveLimit) || 500, 1), 2000)
+  );
+
+  return { session, liveData };
 }
 
 function hashPayload(value) {
@@ -651,16 +684,7 @@ app.get("/live", async (req, res) => {
       return fail(res, "sessionId query param is required", 400);
     }
 
-    let query = db.collection("sessions").doc(String(sessionId)).collection("liveData").orderBy("timeSinceStart", "asc").limit(safeLimit);
-    let snap;
-    try {
-      snap = await query.get();
-    } catch (_e) {
-      query = db.collection("sessions").doc(String(sessionId)).collection("liveData").limit(safeLimit);
-      snap = await query.get();
-    }
-
-    const liveData = snap.docs.map((doc) => ({ id: doc.id, ...doc.data() }));
+    const liveData = await readLiveData(db, sessionId, null, safeLimit);
     return ok(res, { sessionId, count: liveData.length, liveData });
   } catch (error) {
     return fail(res, "Failed to fetch live data", 500, safeError(error));
@@ -683,22 +707,35 @@ app.get("/live/current", async (req, res) => {
       return ok(res, { deviceId: String(deviceId), sessionId: null, count: 0, liveData: [] });
     }
 
-    let query = db.collection("sessions").doc(String(currentSessionId)).collection("liveData").orderBy("timeSinceStart", "asc");
-    let snap;
-    try {
-      snap = await query.get();
-    } catch (_e) {
-      query = db.collection("sessions").doc(String(currentSessionId)).collection("liveData");
-      snap = await query.get();
-    }
-
-    const liveData = snap.docs.map((doc) => ({ id: doc.id, ...doc.data() }));
+    const liveData = await readLiveData(db, currentSessionId);
     return ok(res, { deviceId: String(deviceId), sessionId: String(currentSessionId), count: liveData.length, liveData });
   } catch (error) {
     return fail(res, "Failed to fetch current session live data", 500, safeError(error));
   }
 });
 
+app.get("/live/state", async (req, res) => {
+  try {
+    const db = getDb();
+    const { deviceId } = req.query;
+
+    if (!deviceId) {
+      return fail(res, "deviceId query param is required", 400);
+    }
+
+    const deviceDoc = await db.collection("devices").doc(String(deviceId)).get();
+    const data = deviceDoc.exists ? deviceDoc.data() || {} : {};
+    return ok(res, {
+      deviceId: String(deviceId),
+      sessionId: data.currentSessionId || null,
+      live: data.live || null,
+      liveUpdatedAt: normalizeTimestamp(data.liveUpdatedAt),
+    });
+  } catch (error) {
+    return fail(res, "Failed to fetch live state", 500, safeError(error));
+  }
+});
+
 app.patch("/sessionInfo/:sessionId", async (req, res) => {
   try {
     const db = getDb();